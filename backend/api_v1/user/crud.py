@@ -4,6 +4,8 @@ Read
 Update
 Delete
 """
+import logging
+
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.engine import Result
@@ -14,6 +16,8 @@ from .schemas import CreateUser
 from .User import User #, Auth
 from api_v1.auth.utils import hash_password
 
+logger = logging.getLogger(__name__)
+
 async def get_users(session: AsyncSession) -> list[User]:
     query = select(User).group_by(User.login)
     result: Result = await session.execute(query)
@@ -21,7 +25,6 @@ async def get_users(session: AsyncSession) -> list[User]:
     return list(users)
 
 async def get_user_by_id(session: AsyncSession, uid: int):
-    print(uid)
     query = select(User).where(User.id == uid)
     result = await session.execute(query)
     user = result.scalar_one_or_none()
@@ -37,13 +40,12 @@ async def get_user_by_login(session: AsyncSession, login:str):
 
 async def delete_user(session: AsyncSession, user: User):
     if user is not None:
-        print(user.id)
+        logger.info("Deleting user", extra={'user_id': user.id})
         await session.delete(user)
         await session.commit()
 
 async def delete_user_by_id(session:AsyncSession, uid: int) -> None:
     user = await get_user_by_id(session=session, uid=uid)
-    print(user.id)
     await delete_user(session=session, user=user)
 
 
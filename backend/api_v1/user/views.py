@@ -1,3 +1,5 @@
+import logging
+
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from . import crud
@@ -12,6 +14,8 @@ from jose.exceptions import ExpiredSignatureError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(tags=['Users'])
 
 
@@ -91,28 +95,25 @@ async def get_current_user(token: str = Depends(oauth2_scheme), session: AsyncSe
         
         return user
     except ExpiredSignatureError:
-        print(f"Token expired: {token}")
+        logger.info("Token expired")
         raise HTTPException(status_code=401, detail="Токен истек")
     except JWTError as e:
-        print(f"JWTError: {str(e)}")
-        print(f"Token received: {token}")
+        logger.info("Invalid token: %s", e)
         raise HTTPException(status_code=401, detail="Не удалось подтвердить учетные данные")
 
 async def get_current_user_id(token: str = Depends(oauth2_scheme)):
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        print(payload)
         user_id: int = int(payload.get("sub"))
         if user_id is None:
             raise HTTPException(status_code=401, detail="Не удалось подтвердить учетные данные")
         
         return user_id
     except ExpiredSignatureError:
-        print(f"Token expired: {token}")
+        logger.info("Token expired")
         raise HTTPException(status_code=401, detail="Токен истек")
     except JWTError as e:
-        print(f"JWTError: {str(e)}")
-        print(f"Token received: {token}")
+        logger.info("Invalid token: %s", e)
         raise HTTPException(status_code=401, detail="Не удалось подтвердить учетные данные")
 
 
@@ -125,9 +126,8 @@ async def me(token: str = Depends(oauth2_scheme)):
         
         return payload
     except ExpiredSignatureError:
-        print(f"Token expired: {token}")
+        logger.info("Token expired")
         raise HTTPException(status_code=401, detail="Токен истек")
     except JWTError as e:
-        print(f"JWTError: {str(e)}")
-        print(f"Token received: {token}")
+        logger.info("Invalid token: %s", e)
         raise HTTPException(status_code=401, detail="Не удалось подтвердить учетные данные")
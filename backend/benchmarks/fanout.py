@@ -0,0 +1,131 @@
+"""
+Замер рассылки состояния партии зрителям.
+
+Партия из --moves ходов рассылается --spectators подписчикам двумя способами:
+    per-subscriber — полное состояние строится и сериализуется для каждого подписчика
+                     (так работал бы наивный обработчик);
+    frame          — один Frame с обновлением на версию позиции через GameHub.
+Сокеты поддельные: отправка только уступает управление циклу событий, поэтому замер
+показывает стоимость самой рассылки без сети. --slow подписчиков не читают вовсе,
+и хаб должен отключить их, не замедляя остальных.
+
+Запуск из каталога backend:
+    python -m benchmarks.fanout
+    python -m benchmarks.fanout --spectators 5000 --moves 80 --slow 100
+"""
+import argparse
+import asyncio
+import json
+import time
+from typing import List, Optional
+
+from game.chess_game import ChessGame
+from game.hub import GameHub
+from game.move_handler import game_state, update_frame
+
+UUID = 'benchmark'
+
+# Ходы по кругу: кони уходят и возвращаются, позиция меняется на каждом ходу
+MOVES = (('g1', 'f3'), ('g8', 'f6'), ('f3', 'g1'), ('f6', 'g8'))
+
+
+class NullSocket:
+    def __init__(self, stall: bool = False) -> None:
+        self.stall = stall
+        self.received = 0
+        self.closed = False
+
+    async def send_text(self, text: str) -> None:
+        if self.stall:
+            await asyncio.Event().wait()
+        await asyncio.sleep(0)
+        self.received += 1
+
+    async def close(self, code: int = 1000, reason: Optional[str] = None) -> None:
+        self.closed = True
+
+
+def new_game() -> ChessGame:
+    game = ChessGame(60, 0)
+    game.start_game()
+    return game
+
+
+def play(game: ChessGame, ply: int) -> None:
+    if ply % len(MOVES) == 0:
+        # Круг коней возвращает начальную позицию: без сброса счётчиков партия
+        # закончилась бы повторением или правилом 50 ходов, и ходы перестали бы проходить
+        game.repetitions.clear()
+        game.halfmove_clock = 0
+    if not game.move(*MOVES[ply % len(MOVES)]):
+        raise RuntimeError(f"Move {ply} was rejected: {game.result}")
+
+
+def check_played(game: ChessGame, start: int, moves: int) -> None:
+    if game.version != start + moves:
+        raise RuntimeError(f"Expected {moves} moves, the position changed {game.version - start} times")
+
+
+async def per_subscriber(spectators: int, moves: int) -> float:
+    game = new_game()
+    sockets = [NullSocket() for _ in range(spectators)]
+    start = game.version
+    started = time.perf_counter()
+    for ply in range(moves):
+        play(game, ply)
+        await asyncio.gather(*(socket.send_text(json.dumps(game_state(UUID, game), ensure_ascii=False))
+                               for socket in sockets))
+    elapsed = time.perf_counter() - started
+    check_played(game, start, moves)
+    return elapsed
+
+
+async def shared_frame(spectators: int, moves: int, slow: int) -> tuple:
+    game = new_game()
+    hub = GameHub()
+    sockets = [NullSocket() for _ in range(spectators)]
+    stalled = [NullSocket(stall=True) for _ in range(slow)]
+    subscribers = [hub.subscribe(UUID, socket) for socket in sockets + stalled]
+    start = game.version
+    started = time.perf_counter()
+    for ply in range(moves):
+        before = game.version
+        play(game, ply)
+        hub.publish(UUID, update_frame(UUID, game, before))
+        # Отдаём управление задачам отправки, как между ходами в работающем сервере
+        await asyncio.sleep(0)
+    while any(socket.received < moves for socket in sockets):
+        await asyncio.sleep(0)
+    elapsed = time.perf_counter() - started
+    check_played(game, start, moves)
+    dropped = sum(socket.closed for socket in stalled)
+    for subscriber in subscribers:
+        hub.unsubscribe(UUID, subscriber)
+    await asyncio.sleep(0)
+    return elapsed, dropped
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Замер рассылки состояния партии зрителям")
+    parser.add_argument('--spectators', type=int, default=1000, help="Подписчиков на партию")
+    parser.add_argument('--moves', type=int, default=40, help="Ходов в партии")
+    parser.add_argument('--slow', type=int, default=10, help="Подписчиков, которые не читают")
+    args = parser.parse_args(argv)
+
+    naive = asyncio.run(per_subscriber(args.spectators, args.moves))
+    shared, dropped = asyncio.run(shared_frame(args.spectators, args.moves, args.slow))
+    messages = args.spectators * args.moves
+    for name, elapsed in (('per-subscriber', naive), ('frame', shared)):
+        print(f"{name:>15}: {elapsed * 1000 / args.moves:8.2f} ms/move, "
+              f"{messages / elapsed:12,.0f} messages/s")
+    print(f"{'speedup':>15}: {naive / shared:.1f}x; slow subscribers dropped: {dropped} of {args.slow}")
+    game = new_game()
+    before = game.version
+    play(game, 0)
+    full = len(json.dumps(game_state(UUID, game), ensure_ascii=False).encode())
+    print(f"{'message size':>15}: {full} bytes full state, {len(update_frame(UUID, game, before).body)} bytes delta")
+    return 0 if dropped == args.slow else 1
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,114 @@
+"""
+Замер того, насколько ходы и поиск движка останавливают цикл событий.
+
+--games партий с движком за черных играются одновременно двумя способами:
+    inline   — ход и ответ движка выполняются прямо в корутине (так работал
+               обработчик до game/executor.py);
+    executor — через move_handler.play_turn: в потоках executor, под блокировкой
+               своей партии.
+За белых делается первый легальный ход. Всё это время задача-метроном просыпается
+каждую --tick мс; опоздание метронома — время, на которое цикл событий был занят
+и не мог отвечать на другие запросы. Печатаются наибольшее и суммарное опоздание.
+
+Потоки executor делят GIL с циклом событий: чем больше --workers заняты поиском,
+тем дольше цикл ждёт своей очереди, поэтому наибольшее опоздание растёт с их числом.
+
+Запуск из каталога backend:
+    python -m benchmarks.loop_blocking
+    python -m benchmarks.loop_blocking --games 8 --moves 4 --engine-time 0.1 --workers 4
+"""
+import argparse
+import asyncio
+import time
+from typing import Awaitable, Callable, List, Optional
+
+from game import move_handler
+from game.chess_game import ChessGame
+from game.engine import Engine
+from game.executor import BoundedExecutor
+from game.index_notation import index_to_notation
+from game.move_handler import Move, game_locks, play_turn, state_frames, update_frames
+from pkgs.config import settings_engine
+
+
+def new_game(engine_time: float) -> ChessGame:
+    game = ChessGame(60, 0)
+    game.white = 1
+    game.set_engine('black', Engine(time_limit=engine_time, node_limit=10 ** 7))
+    game.start_game()
+    return game
+
+
+def first_legal(game: ChessGame) -> Move:
+    start, targets = next(iter(game.legal_moves().items()))
+    return Move(start=index_to_notation(*start), end=index_to_notation(*targets[0]))
+
+
+async def inline(uuid: str, game: ChessGame, moves: int) -> None:
+    for _ in range(moves):
+        if game.result is not None:
+            return
+        move = first_legal(game)
+        game.move(move.start, move.end)
+        game.engine_move()
+        await asyncio.sleep(0)
+
+
+async def offloaded(uuid: str, game: ChessGame, moves: int) -> None:
+    for _ in range(moves):
+        if game.result is not None:
+            return
+        await play_turn(uuid, game, first_legal(game), game.white)
+
+
+async def measure(play: Callable[[str, ChessGame, int], Awaitable[None]], games: int, moves: int,
+                  engine_time: float, tick: float) -> tuple:
+    stalls: List[float] = []
+
+    async def metronome() -> None:
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(tick)
+            stalls.append(max(0.0, time.perf_counter() - started - tick))
+
+    uuids = [f'benchmark-{index}' for index in range(games)]
+    # Партии (и таблицы транспозиций их движков) создаются до запуска метронома
+    playing = [new_game(engine_time) for _ in uuids]
+    ticker = asyncio.create_task(metronome())
+    await asyncio.sleep(0)
+    started = time.perf_counter()
+    await asyncio.gather(*(play(uuid, game, moves) for uuid, game in zip(uuids, playing)))
+    elapsed = time.perf_counter() - started
+    ticker.cancel()
+    for uuid in uuids:
+        for cache in (state_frames, update_frames, game_locks):
+            cache.pop(uuid, None)
+    return elapsed, max(stalls, default=elapsed), sum(stalls) if stalls else elapsed
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Замер остановок цикла событий ходами и поиском движка")
+    parser.add_argument('--games', type=int, default=4, help="Партий одновременно")
+    parser.add_argument('--moves', type=int, default=3, help="Ходов белых в каждой партии")
+    parser.add_argument('--engine-time', type=float, default=0.2, help="Время на ход движка в секундах")
+    parser.add_argument('--tick', type=float, default=1.0, help="Период метронома в миллисекундах")
+    parser.add_argument('--workers', type=int, default=settings_engine.WORKERS, help="Потоков executor")
+    args = parser.parse_args(argv)
+
+    tick = args.tick / 1000
+    move_handler.executor = BoundedExecutor(args.workers)
+    results = {}
+    for name, play in (('inline', inline), ('executor', offloaded)):
+        results[name] = asyncio.run(measure(play, args.games, args.moves, args.engine_time, tick))
+    move_handler.executor.shutdown()
+    for name, (elapsed, worst, total) in results.items():
+        print(f"{name:>9}: {elapsed:6.2f} s wall, loop blocked {total * 1000:8.1f} ms in total, "
+              f"longest stall {worst * 1000:7.1f} ms")
+    inline_worst, executor_worst = results['inline'][1], results['executor'][1]
+    print(f"{'longest':>9}: {inline_worst / max(executor_worst, 1e-6):.0f}x shorter with executor "
+          f"({args.workers} workers)")
+    return 0 if executor_worst < inline_worst else 1
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
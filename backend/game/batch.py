@@ -0,0 +1,204 @@
+"""
+Пакетная обработка позиций с помощью NumPy.
+
+N позиций кодируются массивом (N, 12) из uint64 — те же двенадцать масок, что
+и Board.bitboards. Атакованные клетки, шах и подвижность считаются сразу для
+всех позиций операциями над множествами: сдвигами масок целиком, без перебора
+отдельных фигур. Для дальнобойных фигур используется заполнение Когге-Стоуна.
+
+Подвижность — число псевдолегальных ходов, как в Board.pseudo_legal_moves
+(превращение считается одним ходом), без рокировок и взятия на проходе:
+эти права в (N, 12) не кодируются.
+"""
+from typing import Iterable, List, Sequence, Tuple, Union
+
+import numpy as np
+
+from .bitboard import (
+    BISHOP, BISHOP_DIRECTIONS, COLOR_INDEX, FULL, KING, KING_OFFSETS, KNIGHT, KNIGHT_OFFSETS,
+    PAWN, PAWN_CAPTURE_OFFSETS, QUEEN, ROOK, ROOK_DIRECTIONS,
+)
+from .board import Board
+
+Color = Union[int, np.ndarray]
+
+_FILES = [sum(1 << (row * 8 + col) for row in range(8)) for col in range(8)]
+_ROWS = [0xFF << (row * 8) for row in range(8)]
+
+
+def _shift_mask(dc: int) -> np.uint64:
+    """
+    Клетки, куда можно попасть сдвигом на dc вертикалей без перехода через край доски.
+    """
+    mask = FULL
+    for col in range(dc) if dc > 0 else range(8 + dc, 8):
+        mask &= ~_FILES[col]
+    return np.uint64(mask)
+
+
+def _step(direction: Tuple[int, int]) -> Tuple[int, np.uint64]:
+    dr, dc = direction
+    return dr * 8 + dc, _shift_mask(dc)
+
+
+_KNIGHT_STEPS = [_step(offset) for offset in KNIGHT_OFFSETS]
+_KING_STEPS = [_step(offset) for offset in KING_OFFSETS]
+_PAWN_CAPTURE_STEPS = [[_step(offset) for offset in offsets] for offsets in PAWN_CAPTURE_OFFSETS]
+_ROOK_STEPS = [_step(direction) for direction in ROOK_DIRECTIONS]
+_BISHOP_STEPS = [_step(direction) for direction in BISHOP_DIRECTIONS]
+_PAWN_PUSH = (-8, 8)
+# Горизонталь, на которой оказывается пешка после первого шага с начальной позиции
+_PAWN_DOUBLE_ROW = (np.uint64(_ROWS[5]), np.uint64(_ROWS[2]))
+
+
+def _shift(masks: np.ndarray, shift: int) -> np.ndarray:
+    if shift > 0:
+        return np.left_shift(masks, np.uint64(shift))
+    return np.right_shift(masks, np.uint64(-shift))
+
+
+def _slide(sliders: np.ndarray, empty: np.ndarray, shift: int, mask: np.uint64) -> np.ndarray:
+    """
+    Атаки всех дальнобойных фигур из sliders в одном направлении (заполнение Когге-Стоуна).
+
+    Лучи разных фигур одного направления не пересекаются: луч задней фигуры
+    обрывается на передней, поэтому число клеток в результате равно сумме
+    по фигурам.
+    """
+    propagate = empty & mask
+    sliders = sliders | (propagate & _shift(sliders, shift))
+    propagate = propagate & _shift(propagate, shift)
+    sliders = sliders | (propagate & _shift(sliders, 2 * shift))
+    propagate = propagate & _shift(propagate, 2 * shift)
+    sliders = sliders | (propagate & _shift(sliders, 4 * shift))
+    return _shift(sliders, shift) & mask
+
+
+def _popcount(masks: np.ndarray) -> np.ndarray:
+    return np.bitwise_count(masks).astype(np.int64)
+
+
+def _for_color(function, bitboards: np.ndarray, color: Color) -> np.ndarray:
+    """
+    Вызывает function для одного цвета или, если color — массив, выбирает результат по позициям.
+    """
+    if np.ndim(color) == 0:
+        return function(bitboards, int(color))
+    color = np.asarray(color)
+    return np.where(color == 0, function(bitboards, 0), function(bitboards, 1))
+
+
+def encode_boards(boards: Iterable[Board]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Кодирует позиции в массивы.
+
+    :param boards: Доски с актуальными битовыми масками.
+    :return: (маски формы (N, 12) uint64, очередь хода формы (N,) uint8: 0 — белые, 1 — чёрные)
+    """
+    masks: List[List[int]] = []
+    sides: List[int] = []
+    for board in boards:
+        masks.append(board.bitboards)
+        sides.append(COLOR_INDEX[board.side_to_move])
+    return (np.array(masks, dtype=np.uint64).reshape(-1, 12),
+            np.array(sides, dtype=np.uint8))
+
+
+def encode_fens(fens: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Кодирует позиции, заданные строками FEN (см. encode_boards).
+    """
+    def boards() -> Iterable[Board]:
+        board = Board()
+        for fen in fens:
+            board.load_fen(fen)
+            yield board
+    return encode_boards(boards())
+
+
+def _occupancy(bitboards: np.ndarray, color: int) -> np.ndarray:
+    return np.bitwise_or.reduce(bitboards[:, color * 6:color * 6 + 6], axis=1)
+
+
+def _attacks(bitboards: np.ndarray, color: int) -> np.ndarray:
+    base = color * 6
+    empty = ~(_occupancy(bitboards, 0) | _occupancy(bitboards, 1))
+    attacks = np.zeros(len(bitboards), dtype=np.uint64)
+
+    pawns = bitboards[:, base + PAWN]
+    for shift, mask in _PAWN_CAPTURE_STEPS[color]:
+        attacks |= _shift(pawns, shift) & mask
+    for kind, steps in ((KNIGHT, _KNIGHT_STEPS), (KING, _KING_STEPS)):
+        pieces = bitboards[:, base + kind]
+        for shift, mask in steps:
+            attacks |= _shift(pieces, shift) & mask
+    queens = bitboards[:, base + QUEEN]
+    for kind, steps in ((ROOK, _ROOK_STEPS), (BISHOP, _BISHOP_STEPS)):
+        sliders = bitboards[:, base + kind] | queens
+        for shift, mask in steps:
+            attacks |= _slide(sliders, empty, shift, mask)
+    return attacks
+
+
+def attacked_squares(bitboards: np.ndarray, color: Color) -> np.ndarray:
+    """
+    Маски клеток, которые бьют фигуры цвета color (как Board.attacked_squares).
+
+    :param bitboards: Массив (N, 12) uint64.
+    :param color: 0 — белые, 1 — чёрные; либо массив (N,) с цветом для каждой позиции.
+    :return: Массив (N,) uint64.
+    """
+    return _for_color(_attacks, bitboards, color)
+
+
+def _in_check(bitboards: np.ndarray, color: int) -> np.ndarray:
+    return (bitboards[:, color * 6 + KING] & _attacks(bitboards, color ^ 1)) != 0
+
+
+def in_check(bitboards: np.ndarray, color: Color) -> np.ndarray:
+    """
+    Стоит ли король цвета color под шахом (как Board.is_in_check).
+
+    :return: Массив (N,) bool.
+    """
+    return _for_color(_in_check, bitboards, color)
+
+
+def _mobility(bitboards: np.ndarray, color: int) -> np.ndarray:
+    base = color * 6
+    own = _occupancy(bitboards, color)
+    enemy = _occupancy(bitboards, color ^ 1)
+    empty = ~(own | enemy)
+    targets = ~own
+    # Сдвиг множества фигур на одно смещение — взаимно однозначный, поэтому
+    # число клеток после каждого отдельного сдвига равно сумме по фигурам
+    count = np.zeros(len(bitboards), dtype=np.int64)
+
+    pawns = bitboards[:, base + PAWN]
+    single = _shift(pawns, _PAWN_PUSH[color]) & empty
+    double = _shift(single & _PAWN_DOUBLE_ROW[color], _PAWN_PUSH[color]) & empty
+    count += _popcount(single) + _popcount(double)
+    for shift, mask in _PAWN_CAPTURE_STEPS[color]:
+        count += _popcount(_shift(pawns, shift) & mask & enemy)
+
+    for kind, steps in ((KNIGHT, _KNIGHT_STEPS), (KING, _KING_STEPS)):
+        pieces = bitboards[:, base + kind]
+        for shift, mask in steps:
+            count += _popcount(_shift(pieces, shift) & mask & targets)
+
+    queens = bitboards[:, base + QUEEN]
+    for kind, steps in ((ROOK, _ROOK_STEPS), (BISHOP, _BISHOP_STEPS)):
+        # Ферзь ходит и по вертикалям, и по диагоналям, поэтому попадает в обе группы
+        sliders = bitboards[:, base + kind] | queens
+        for shift, mask in steps:
+            count += _popcount(_slide(sliders, empty, shift, mask) & targets)
+    return count
+
+
+def mobility(bitboards: np.ndarray, color: Color) -> np.ndarray:
+    """
+    Число псевдолегальных ходов стороны color в каждой позиции.
+
+    :return: Массив (N,) int64.
+    """
+    return _for_color(_mobility, bitboards, color)
@@ -0,0 +1,119 @@
+"""
+Битовые маски для представления позиции.
+
+Клетка (row, column) кодируется индексом row * 8 + column, то есть a8 = 0, h8 = 7,
+a1 = 56, h1 = 63 — так же, как клетки индексируются в Board.board.
+"""
+from typing import Iterator, List, Tuple
+
+WHITE, BLACK = 0, 1
+COLOR_INDEX = {'white': WHITE, 'black': BLACK}
+
+PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING = range(6)
+
+FULL = (1 << 64) - 1
+# Светлые поля: a8 (row 0, col 0) светлое, цвет чередуется по row + col
+LIGHT_SQUARES = sum(1 << (row * 8 + col) for row in range(8) for col in range(8) if (row + col) % 2 == 0)
+
+# Направления лучей: (dr, dc). Первые четыре увеличивают индекс клетки, остальные уменьшают.
+ROOK_DIRECTIONS = [(1, 0), (0, 1), (-1, 0), (0, -1)]
+BISHOP_DIRECTIONS = [(1, 1), (1, -1), (-1, -1), (-1, 1)]
+DIRECTIONS = [(1, 0), (0, 1), (1, 1), (1, -1), (-1, 0), (0, -1), (-1, -1), (-1, 1)]
+
+
+def square_index(row: int, col: int) -> int:
+    """
+    Преобразует (row, column) в индекс клетки 0..63.
+    """
+    return row * 8 + col
+
+
+def square_coords(square: int) -> Tuple[int, int]:
+    """
+    Преобразует индекс клетки 0..63 в кортеж (row, column).
+    """
+    return square >> 3, square & 7
+
+
+def iter_squares(mask: int) -> Iterator[int]:
+    """
+    Перебирает индексы установленных битов маски по возрастанию.
+    """
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+def _leaper_table(offsets: List[Tuple[int, int]]) -> List[int]:
+    table = []
+    for square in range(64):
+        row, col = square_coords(square)
+        mask = 0
+        for dr, dc in offsets:
+            r, c = row + dr, col + dc
+            if 0 <= r < 8 and 0 <= c < 8:
+                mask |= 1 << square_index(r, c)
+        table.append(mask)
+    return table
+
+
+def _ray_table(dr: int, dc: int) -> List[int]:
+    table = []
+    for square in range(64):
+        row, col = square_coords(square)
+        mask = 0
+        r, c = row + dr, col + dc
+        while 0 <= r < 8 and 0 <= c < 8:
+            mask |= 1 << square_index(r, c)
+            r, c = r + dr, c + dc
+        table.append(mask)
+    return table
+
+
+KNIGHT_OFFSETS = [(2, 1), (1, 2), (-1, 2), (-2, 1), (-2, -1), (-1, -2), (1, -2), (2, -1)]
+KING_OFFSETS = [(-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1)]
+# Белые пешки бьют в сторону уменьшения row, чёрные — в сторону увеличения
+PAWN_CAPTURE_OFFSETS = [[(-1, -1), (-1, 1)], [(1, -1), (1, 1)]]
+
+KNIGHT_ATTACKS = _leaper_table(KNIGHT_OFFSETS)
+KING_ATTACKS = _leaper_table(KING_OFFSETS)
+PAWN_ATTACKS = [_leaper_table(offsets) for offsets in PAWN_CAPTURE_OFFSETS]
+RAYS = {direction: _ray_table(*direction) for direction in DIRECTIONS}
+
+
+def _positive(direction: Tuple[int, int]) -> bool:
+    return direction[0] * 8 + direction[1] > 0
+
+
+def ray_attacks(square: int, occupied: int, direction: Tuple[int, int]) -> int:
+    """
+    Клетки, атакуемые вдоль луча до первой занятой клетки включительно.
+    """
+    ray = RAYS[direction][square]
+    blockers = ray & occupied
+    if not blockers:
+        return ray
+    if _positive(direction):
+        first = (blockers & -blockers).bit_length() - 1
+    else:
+        first = blockers.bit_length() - 1
+    return ray ^ RAYS[direction][first]
+
+
+def rook_attacks(square: int, occupied: int) -> int:
+    mask = 0
+    for direction in ROOK_DIRECTIONS:
+        mask |= ray_attacks(square, occupied, direction)
+    return mask
+
+
+def bishop_attacks(square: int, occupied: int) -> int:
+    mask = 0
+    for direction in BISHOP_DIRECTIONS:
+        mask |= ray_attacks(square, occupied, direction)
+    return mask
+
+
+def queen_attacks(square: int, occupied: int) -> int:
+    return rook_attacks(square, occupied) | bishop_attacks(square, occupied)
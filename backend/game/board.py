@@ -1,43 +1,595 @@
-from typing import List
+from typing import List, NamedTuple, Optional, Tuple
+from .bitboard import (
+    COLOR_INDEX, BISHOP, KING, KNIGHT, PAWN, QUEEN, ROOK,
+    KING_ATTACKS, KNIGHT_ATTACKS, PAWN_ATTACKS,
+    bishop_attacks, iter_squares, queen_attacks, rook_attacks, square_coords, square_index,
+)
+from .evaluation import EG_TABLE, MG_TABLE, PHASE_TABLE
+from .zobrist import CASTLING_KEYS, EN_PASSANT_KEYS, PIECE_KEYS, SIDE_KEY
+from .index_notation import index_to_notation, notation_to_index
 from .pieces.bishop import Bishop
 from .pieces.king import King
 from .pieces.knight import Knight
-from .pieces.pawn import Pawn
+from .pieces.pawn import PROMOTION_PIECES, Pawn
 from .pieces.piece import Piece
 from .pieces.queen import Queen
 from .pieces.rook import Rook
 
+PIECE_KINDS = {
+    Pawn: PAWN,
+    Knight: KNIGHT,
+    Bishop: BISHOP,
+    Rook: ROOK,
+    Queen: QUEEN,
+    King: KING,
+}
+
+FEN_PIECES = {
+    'p': Pawn,
+    'n': Knight,
+    'b': Bishop,
+    'r': Rook,
+    'q': Queen,
+    'k': King,
+}
+
+FEN_SYMBOLS = {piece_class: symbol for symbol, piece_class in FEN_PIECES.items()}
+
+# Биты прав на рокировку: (бит, символ FEN, строка, столбец ладьи)
+CASTLING_SQUARES = ((1, 'K', 7, 7), (2, 'Q', 7, 0), (4, 'k', 0, 7), (8, 'q', 0, 0))
+
+# Вид фигуры превращения (kind из bitboard.py: 1 — конь ... 4 — ферзь); он же код превращения
+# в трёх битах хода книги и таблицы транспозиций, где 0 — без превращения
+PROMOTION_KINDS = {symbol: PIECE_KINDS[piece_class] for symbol, piece_class in PROMOTION_PIECES.items()}
+PROMOTION_SYMBOLS = (None, 'N', 'B', 'R', 'Q')
+
+START_FEN = 'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1'
+
+
+class MoveUndo(NamedTuple):
+    """
+    Запись, необходимая для точной отмены хода через Board.unmake_move.
+    """
+    piece: Piece
+    from_square: Tuple[int, int]
+    to_square: Tuple[int, int]
+    captured: Optional[Piece]
+    captured_square: Optional[Tuple[int, int]]
+    had_moved: bool
+    rook: Optional[Rook]
+    rook_from: Optional[Tuple[int, int]]
+    rook_to: Optional[Tuple[int, int]]
+    promoted: Optional[Piece]
+    en_passant: Optional[Tuple[int, int]]
+    castling_rights: int
+    zobrist: int
+
 
 class Board:
     def __init__(self) -> None:
         self.board: list[list[Piece | None]] = [[None for _ in range(8)] for _ in range(8)]
+        # Двенадцать масок: индекс color * 6 + kind (см. bitboard.py)
+        self.bitboards: list[int] = [0] * 12
+        # Объединённые маски белых и чёрных фигур
+        self.occupancy: list[int] = [0, 0]
+        self.side_to_move = 'white'
+        # Права на рокировку: 1 — белые в короткую, 2 — белые в длинную, 4 и 8 — то же для чёрных
+        self.castling_rights = 0
+        # Клетка, через которую только что прошла пешка двойным ходом (цель взятия на проходе), или None.
+        # В хеш она входит, только если её может взять пешка стороны, которая ходит (см. _en_passant_hashed)
+        self.en_passant: Optional[Tuple[int, int]] = None
+        # 64-битный хеш Zobrist, обновляется при каждом изменении позиции
+        self.zobrist = 0
+        # Суммы для оценки (evaluation.py) с точки зрения белых и фаза партии; обновляются в _put
+        self.mg_score = 0
+        self.eg_score = 0
+        self.phase = 0
 
     def __getitem__(self, item: tuple[int, int]) -> Piece | None:
         return self.board[item[0]][item[1]]
 
     def __setitem__(self, key: tuple[int, int], value: Piece | None) -> None:
-        self.board[key[0]][key[1]] = value
+        self._put(key[0], key[1], value)
+        self._update_castling_rights()
+
+    def copy(self) -> 'Board':
+        """
+        Возвращает независимую копию доски (фигуры копируются, маски и хеш переносятся без пересчёта).
+        """
+        clone = Board()
+        clone.board = [[piece.copy() if piece is not None else None for piece in row] for row in self.board]
+        clone.bitboards = self.bitboards[:]
+        clone.occupancy = self.occupancy[:]
+        clone.side_to_move = self.side_to_move
+        clone.castling_rights = self.castling_rights
+        clone.en_passant = self.en_passant
+        clone.zobrist = self.zobrist
+        clone.mg_score = self.mg_score
+        clone.eg_score = self.eg_score
+        clone.phase = self.phase
+        return clone
+
+    @property
+    def occupied(self) -> int:
+        return self.occupancy[0] | self.occupancy[1]
+
+    def _put(self, row: int, col: int, piece: Optional[Piece]) -> None:
+        """
+        Ставит фигуру (или None) на клетку, обновляя матрицу, битовые маски, хеш и суммы оценки.
+        """
+        square = row * 8 + col
+        bit = 1 << square
+        old = self.board[row][col]
+        if old is not None:
+            color = COLOR_INDEX[old.color]
+            index = color * 6 + PIECE_KINDS[type(old)]
+            self.bitboards[index] &= ~bit
+            self.occupancy[color] &= ~bit
+            self.zobrist ^= PIECE_KEYS[index][square]
+            self.mg_score -= MG_TABLE[index][square]
+            self.eg_score -= EG_TABLE[index][square]
+            self.phase -= PHASE_TABLE[index]
+        self.board[row][col] = piece
+        if piece is not None:
+            color = COLOR_INDEX[piece.color]
+            index = color * 6 + PIECE_KINDS[type(piece)]
+            self.bitboards[index] |= bit
+            self.occupancy[color] |= bit
+            self.zobrist ^= PIECE_KEYS[index][square]
+            self.mg_score += MG_TABLE[index][square]
+            self.eg_score += EG_TABLE[index][square]
+            self.phase += PHASE_TABLE[index]
+
+    def sync_bitboards(self) -> None:
+        """
+        Пересчитывает битовые маски, суммы оценки, права на рокировку и хеш по матрице self.board.
+
+        Нужен после того, как матрицу или флаги фигур меняли напрямую (например, через Piece.move).
+        """
+        self.bitboards = [0] * 12
+        self.occupancy = [0, 0]
+        self.mg_score = self.eg_score = self.phase = 0
+        for row in range(8):
+            for col in range(8):
+                piece = self.board[row][col]
+                if piece is not None:
+                    self.board[row][col] = None
+                    self._put(row, col, piece)
+        self.castling_rights = self._compute_castling_rights()
+        self.zobrist = self.compute_zobrist()
+
+    def compute_zobrist(self) -> int:
+        """
+        Считает хеш позиции с нуля: фигуры, очередь хода, права на рокировку и взятие на проходе.
+        """
+        key = 0
+        for index, mask in enumerate(self.bitboards):
+            for square in iter_squares(mask):
+                key ^= PIECE_KEYS[index][square]
+        if self.side_to_move == 'black':
+            key ^= SIDE_KEY
+        key ^= CASTLING_KEYS[self._compute_castling_rights()]
+        if self.en_passant is not None and self._en_passant_hashed(self.en_passant, COLOR_INDEX[self.side_to_move]):
+            key ^= EN_PASSANT_KEYS[self.en_passant[1]]
+        return key
+
+    def _en_passant_hashed(self, square: Tuple[int, int], capturer: int) -> bool:
+        """
+        Проверяет, стоит ли рядом с пешкой, прошедшей через square, пешка цвета capturer.
+
+        Как в Polyglot, только тогда вертикаль взятия на проходе входит в хеш: иначе
+        позиции после двойного и двух одинарных ходов пешкой совпадают и должны
+        считаться одним повторением.
+        """
+        return bool(PAWN_ATTACKS[capturer ^ 1][square_index(*square)] & self.bitboards[capturer * 6 + PAWN])
+
+    def _compute_castling_rights(self) -> int:
+        rights = 0
+        for bit, row, rook_col, color in ((1, 7, 7, 'white'), (2, 7, 0, 'white'),
+                                          (4, 0, 7, 'black'), (8, 0, 0, 'black')):
+            king = self.board[row][4]
+            rook = self.board[row][rook_col]
+            if (isinstance(king, King) and king.color == color and not king.has_moved
+                    and isinstance(rook, Rook) and rook.color == color and not rook.has_moved):
+                rights |= bit
+        return rights
+
+    def _update_castling_rights(self) -> None:
+        rights = self._compute_castling_rights()
+        if rights != self.castling_rights:
+            self.zobrist ^= CASTLING_KEYS[self.castling_rights] ^ CASTLING_KEYS[rights]
+            self.castling_rights = rights
+
+    def king_square(self, color: str) -> Optional[Tuple[int, int]]:
+        """
+        Возвращает клетку короля заданного цвета или None, если короля нет.
+        """
+        mask = self.bitboards[COLOR_INDEX[color] * 6 + KING]
+        if not mask:
+            return None
+        return square_coords(mask.bit_length() - 1)
+
+    def attacks_from(self, row: int, col: int) -> int:
+        """
+        Маска клеток, которые бьёт фигура на клетке (row, col).
+        """
+        piece = self.board[row][col]
+        if piece is None:
+            return 0
+        square = square_index(row, col)
+        kind = PIECE_KINDS[type(piece)]
+        if kind == PAWN:
+            return PAWN_ATTACKS[COLOR_INDEX[piece.color]][square]
+        if kind == KNIGHT:
+            return KNIGHT_ATTACKS[square]
+        if kind == KING:
+            return KING_ATTACKS[square]
+        if kind == BISHOP:
+            return bishop_attacks(square, self.occupied)
+        if kind == ROOK:
+            return rook_attacks(square, self.occupied)
+        return queen_attacks(square, self.occupied)
+
+    def attacked_squares(self, color: str) -> int:
+        """
+        Маска всех клеток, которые бьют фигуры заданного цвета.
+        """
+        mask = 0
+        for square in iter_squares(self.occupancy[COLOR_INDEX[color]]):
+            mask |= self.attacks_from(*square_coords(square))
+        return mask
+
+    def is_square_attacked(self, row: int, col: int, by_color: str) -> bool:
+        """
+        Проверяет, бьёт ли хотя бы одна фигура цвета by_color клетку (row, col).
+
+        Поиск идёт от целевой клетки: таблицы атак коня, короля и пешки
+        и лучи дальнобойных фигур сравниваются с масками противника.
+        """
+        return self.square_attacked(square_index(row, col), COLOR_INDEX[by_color], self.occupied)
+
+    def square_attacked(self, square: int, attacker: int, occupied: int) -> bool:
+        """
+        То же, что is_square_attacked, но по индексу клетки, индексу цвета
+        и произвольной маске занятости (нужно генератору ходов).
+        """
+        base = attacker * 6
+        bitboards = self.bitboards
+        if PAWN_ATTACKS[attacker ^ 1][square] & bitboards[base + PAWN]:
+            return True
+        if KNIGHT_ATTACKS[square] & bitboards[base + KNIGHT]:
+            return True
+        if KING_ATTACKS[square] & bitboards[base + KING]:
+            return True
+        queens = bitboards[base + QUEEN]
+        if bishop_attacks(square, occupied) & (bitboards[base + BISHOP] | queens):
+            return True
+        return bool(rook_attacks(square, occupied) & (bitboards[base + ROOK] | queens))
+
+    def attackers_mask(self, square: int, attacker: int, occupied: int) -> int:
+        """
+        Маска всех фигур цвета attacker, которые бьют клетку square.
+        """
+        base = attacker * 6
+        bitboards = self.bitboards
+        queens = bitboards[base + QUEEN]
+        return ((PAWN_ATTACKS[attacker ^ 1][square] & bitboards[base + PAWN])
+                | (KNIGHT_ATTACKS[square] & bitboards[base + KNIGHT])
+                | (KING_ATTACKS[square] & bitboards[base + KING])
+                | (bishop_attacks(square, occupied) & (bitboards[base + BISHOP] | queens))
+                | (rook_attacks(square, occupied) & (bitboards[base + ROOK] | queens)))
+
+    def is_in_check(self, color: str) -> bool:
+        """
+        Проверяет, находится ли король заданного цвета под шахом.
+        """
+        king_square = self.king_square(color)
+        if king_square is None:
+            return False
+        enemy = 'black' if color == 'white' else 'white'
+        return self.is_square_attacked(king_square[0], king_square[1], enemy)
+
+    def pseudo_legal_moves(self, row: int, col: int) -> List[Tuple[int, int]]:
+        """
+        Возвращает ходы фигуры на клетке (row, col) без учёта шаха своему королю.
+
+        Ходы строятся операциями над масками; результат совпадает
+        с Piece.show_possible_moves, включая рокировки. Взятие на проходе берётся из self.en_passant.
+        """
+        piece = self.board[row][col]
+        if piece is None:
+            return []
+        color = COLOR_INDEX[piece.color]
+        own = self.occupancy[color]
+        enemy = self.occupancy[color ^ 1]
+        empty = ~(own | enemy)
+        square = square_index(row, col)
+        kind = PIECE_KINDS[type(piece)]
+
+        if kind == PAWN:
+            targets = PAWN_ATTACKS[color][square] & enemy
+            if self.en_passant is not None:
+                ep_row, ep_col = self.en_passant
+                # Белые бьют на проходе на строку 2, чёрные — на строку 5
+                if ep_row == (2 if color == 0 else 5) == row + (-1 if color == 0 else 1) and abs(ep_col - col) == 1:
+                    targets |= 1 << square_index(ep_row, ep_col)
+            step = -8 if color == 0 else 8
+            one = 1 << (square + step) if 0 <= square + step < 64 else 0
+            if one & empty:
+                targets |= one
+                start_row = 6 if color == 0 else 1
+                if row == start_row and 1 << (square + 2 * step) & empty:
+                    targets |= 1 << (square + 2 * step)
+        else:
+            targets = self.attacks_from(row, col) & ~own
+
+        moves = [square_coords(target) for target in iter_squares(targets)]
+        if kind == KING and not getattr(piece, 'has_moved', True) and not self.is_in_check(piece.color):
+            # movegen.py импортирует этот модуль, поэтому импорт здесь
+            from .movegen import castling_moves
+            moves.extend(target for _, target, _ in castling_moves(self, piece.color, (row, col), self.occupied))
+        return moves
+
+    def make_move(
+            self,
+            from_square: Tuple[int, int],
+            to_square: Tuple[int, int],
+            promotion: Optional[str] = None
+    ) -> MoveUndo:
+        """
+        Выполняет ход без проверки допустимости и возвращает запись для его отмены.
+
+        Обрабатывает взятие, взятие на проходе, рокировку и превращение пешки,
+        а также флаги has_moved / already_moved и поле взятия на проходе self.en_passant.
+
+        :param from_square: Кортеж (row, column) исходной клетки.
+        :param to_square: Кортеж (row, column) целевой клетки.
+        :param promotion: 'Q', 'R', 'B' или 'N' для превращения пешки (по умолчанию ферзь).
+        :return: Объект MoveUndo для Board.unmake_move.
+        """
+        from_row, from_col = from_square
+        to_row, to_col = to_square
+        piece = self.board[from_row][from_col]
+        # Вид фигуры по точному типу: isinstance с абстрактным Piece заметно медленнее
+        kind = PIECE_KINDS[type(piece)]
+        castling_rights = self.castling_rights
+        zobrist = self.zobrist
+
+        en_passant = self.en_passant
+        if en_passant is not None:
+            self.en_passant = None
+            if self._en_passant_hashed(en_passant, COLOR_INDEX[piece.color]):
+                self.zobrist ^= EN_PASSANT_KEYS[en_passant[1]]
+
+        captured = self.board[to_row][to_col]
+        captured_square = to_square if captured is not None else None
+        if kind == PAWN and to_square == en_passant:
+            # Взятие на проходе: сбитая пешка стоит рядом, а не на целевой клетке
+            captured_square = (from_row, to_col)
+            captured = self.board[from_row][to_col]
+            self._put(from_row, to_col, None)
+
+        if kind == PAWN:
+            had_moved = piece.already_moved
+        else:
+            had_moved = getattr(piece, 'has_moved', False)
+
+        rook = rook_from = rook_to = None
+        if kind == KING and abs(to_col - from_col) == 2:
+            rook_from = (from_row, 7 if to_col > from_col else 0)
+            rook_to = (from_row, (from_col + to_col) // 2)
+            rook = self.board[rook_from[0]][rook_from[1]]
+            self._put(rook_from[0], rook_from[1], None)
+            self._put(rook_to[0], rook_to[1], rook)
+            rook.current_square = rook_to
+            rook.has_moved = True
+
+        self._put(from_row, from_col, None)
+        self._put(to_row, to_col, piece)
+        piece.current_square = to_square
+
+        promoted = None
+        if kind == PAWN:
+            piece.already_moved = True
+            if abs(to_row - from_row) == 2:
+                self.en_passant = ((from_row + to_row) // 2, to_col)
+                if self._en_passant_hashed(self.en_passant, COLOR_INDEX[piece.color] ^ 1):
+                    self.zobrist ^= EN_PASSANT_KEYS[to_col]
+            if piece._is_promotion(to_row):
+                promoted = PROMOTION_PIECES[promotion or 'Q'](piece.color, to_square)
+                self._put(to_row, to_col, promoted)
+        elif kind == KING or kind == ROOK:
+            piece.has_moved = True
+
+        if castling_rights and (kind == KING or kind == ROOK or type(captured) is Rook):
+            self._update_castling_rights()
+
+        self.side_to_move = 'black' if self.side_to_move == 'white' else 'white'
+        self.zobrist ^= SIDE_KEY
+
+        return MoveUndo(piece, from_square, to_square, captured, captured_square,
+                        had_moved, rook, rook_from, rook_to, promoted, en_passant,
+                        castling_rights, zobrist)
+
+    def unmake_move(self, undo: MoveUndo) -> None:
+        """
+        Отменяет ход, выполненный Board.make_move, восстанавливая позицию и флаги фигур.
+
+        :param undo: Запись, возвращённая make_move.
+        """
+        piece = undo.piece
+        kind = PIECE_KINDS[type(piece)]
+        to_row, to_col = undo.to_square
+        from_row, from_col = undo.from_square
+
+        self._put(to_row, to_col, None)
+        self._put(from_row, from_col, piece)
+        piece.current_square = undo.from_square
+
+        if kind == PAWN:
+            piece.already_moved = undo.had_moved
+        elif kind == KING or kind == ROOK:
+            piece.has_moved = undo.had_moved
+
+        if undo.captured is not None:
+            self._put(undo.captured_square[0], undo.captured_square[1], undo.captured)
+
+        if undo.rook is not None:
+            self._put(undo.rook_to[0], undo.rook_to[1], None)
+            self._put(undo.rook_from[0], undo.rook_from[1], undo.rook)
+            undo.rook.current_square = undo.rook_from
+            undo.rook.has_moved = False
+
+        self.side_to_move = 'black' if self.side_to_move == 'white' else 'white'
+        self.castling_rights = undo.castling_rights
+        self.en_passant = undo.en_passant
+        self.zobrist = undo.zobrist
+
+    def fen(self, halfmove_clock: int = 0, fullmove_number: int = 1) -> str:
+        """
+        Возвращает позицию в нотации FEN.
+
+        :param halfmove_clock: Число полуходов без взятий и ходов пешкой.
+        :param fullmove_number: Номер хода.
+        :return: Строка вида 'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1'
+        """
+        ranks = []
+        for row in self.board:
+            rank = ''
+            empty = 0
+            for piece in row:
+                if piece is None:
+                    empty += 1
+                    continue
+                if empty:
+                    rank += str(empty)
+                    empty = 0
+                symbol = FEN_SYMBOLS[type(piece)]
+                rank += symbol.upper() if piece.color == 'white' else symbol
+            if empty:
+                rank += str(empty)
+            ranks.append(rank)
+        castling = ''.join(symbol for bit, symbol, _, _ in CASTLING_SQUARES if self.castling_rights & bit) or '-'
+        en_passant = index_to_notation(*self.en_passant) if self.en_passant is not None else '-'
+        side = 'w' if self.side_to_move == 'white' else 'b'
+        return f"{'/'.join(ranks)} {side} {castling} {en_passant} {halfmove_clock} {fullmove_number}"
+
+    def load_fen(self, fen: str) -> Tuple[int, int]:
+        """
+        Расставляет позицию по FEN: фигуры, очередь хода, права на рокировку и поле взятия на проходе.
+
+        :param fen: Строка FEN, например 'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1'
+        :return: Счётчик полуходов и номер хода (0 и 1, если в строке их нет).
+        :raises ValueError: Если строка FEN некорректна
+        """
+        fields = fen.split()
+        if len(fields) < 4:
+            raise ValueError("FEN должен содержать расстановку, очередь хода, рокировки и взятие на проходе.")
+        placement, side, castling, en_passant = fields[:4]
+        ranks = placement.split('/')
+        if len(ranks) != 8:
+            raise ValueError("В FEN должно быть 8 горизонталей.")
+        if side not in ('w', 'b'):
+            raise ValueError("Очередь хода в FEN должна быть 'w' или 'b'.")
+        try:
+            halfmove_clock = int(fields[4]) if len(fields) > 4 else 0
+            fullmove_number = int(fields[5]) if len(fields) > 5 else 1
+        except ValueError:
+            raise ValueError("Счётчики ходов в FEN должны быть числами.")
+        if halfmove_clock < 0 or fullmove_number < 1:
+            raise ValueError("Счётчик полуходов в FEN не может быть отрицательным, а номер хода — меньше 1.")
+
+        self.board = [[None for _ in range(8)] for _ in range(8)]
+        for row, rank in enumerate(ranks):
+            col = 0
+            for symbol in rank:
+                if symbol.isdigit():
+                    col += int(symbol)
+                    continue
+                if symbol.lower() not in FEN_PIECES or col > 7:
+                    raise ValueError(f"Неверная горизонталь в FEN: {rank}")
+                color = 'white' if symbol.isupper() else 'black'
+                self.board[row][col] = FEN_PIECES[symbol.lower()](color, (row, col))
+                col += 1
+            if col != 8:
+                raise ValueError(f"Неверная горизонталь в FEN: {rank}")
+
+        rights = 0
+        for bit, symbol, _, _ in CASTLING_SQUARES:
+            if symbol in castling:
+                rights |= bit
+        en_passant_square = notation_to_index(en_passant) if en_passant != '-' else None
+        self._setup_state('white' if side == 'w' else 'black', rights, en_passant_square)
+        return halfmove_clock, fullmove_number
+
+    def _setup_state(self, side_to_move: str, castling_rights: int,
+                     en_passant: Optional[Tuple[int, int]]) -> None:
+        """
+        Доводит только что расставленную матрицу до полной позиции: выставляет флаги
+        фигур по правам на рокировку, поле взятия на проходе и очередь хода, затем
+        пересчитывает маски и хеш.
+
+        :raises ValueError: Если у стороны не ровно один король, пешка стоит на первой
+                            или последней горизонтали или для поля взятия на проходе нет пешки
+        """
+        self._check_placement()
+        for row in self.board:
+            for piece in row:
+                if isinstance(piece, Pawn):
+                    piece.already_moved = piece.current_square[0] != (6 if piece.color == 'white' else 1)
+                elif isinstance(piece, (King, Rook)):
+                    piece.has_moved = True
+
+        for bit, _, row, rook_col in CASTLING_SQUARES:
+            if castling_rights & bit:
+                king = self.board[row][4]
+                rook = self.board[row][rook_col]
+                if isinstance(king, King) and isinstance(rook, Rook):
+                    king.has_moved = False
+                    rook.has_moved = False
+        # Ладья без права рокировки считается сходившей, даже если король ещё не ходил
+        for bit, _, row, rook_col in CASTLING_SQUARES:
+            rook = self.board[row][rook_col]
+            if not castling_rights & bit and isinstance(rook, Rook):
+                rook.has_moved = True
+
+        self.en_passant = None
+        if en_passant is not None:
+            row, col = en_passant
+            pawn_row = row + 1 if side_to_move == 'white' else row - 1
+            pawn = self.board[pawn_row][col] if 0 <= pawn_row < 8 else None
+            if not isinstance(pawn, Pawn):
+                raise ValueError(f"Нет пешки для взятия на проходе: {index_to_notation(row, col)}")
+            self.en_passant = en_passant
+
+        self.side_to_move = side_to_move
+        self.sync_bitboards()
+
+    def _check_placement(self) -> None:
+        """
+        Отсекает расстановки, в которых партию нельзя продолжить: без короля
+        (или с двумя) у одной из сторон и с пешками на крайних горизонталях.
+
+        :raises ValueError: Если расстановка невозможна
+        """
+        for color in ('white', 'black'):
+            kings = sum(isinstance(piece, King) and piece.color == color for row in self.board for piece in row)
+            if kings != 1:
+                raise ValueError(f"У {'белых' if color == 'white' else 'черных'} должен быть ровно один король.")
+        if any(isinstance(piece, Pawn) for row in (self.board[0], self.board[7]) for piece in row):
+            raise ValueError("Пешки не могут стоять на первой и последней горизонталях.")
+
+    def render(self) -> str:
+        """
+        Текстовое изображение доски: ряды с номерами и подписи вертикалей.
+        """
+        rows = [f"{8 - i}|" + ' '.join(piece.name() if piece is not None else '\uA900' for piece in row)
+                for i, row in enumerate(self.board)]
+        rows.append('  ' + ' '.join('abcdefgh') + ' \n')
+        return '\n'.join(rows)
 
     def print_board(self):
-        for i in range(8):
-            print(8 - i, end='|')
-            for j in range(8):
-                if j != 7:
-                    if self.board[i][j] is None:
-                        print('\uA900', end=' ')
-                    else:
-                        print(self.board[i][j].name(), end=' ')
-                else:
-                    if self.board[i][j] is None:
-                        print('\uA900')
-                    else:
-                        print(self.board[i][j].name())
-            if i == 7:
-                letters = ['a', 'b', 'c', 'd', 'e', 'f', 'g', 'h']
-                print(' ', end=' ')
-                for k in range(8):
-                    print(letters[k], end=' ')
-                print("\n")
+        print(self.render())
 
     def pretty_board(self) -> List[List[str]]:
         board_state: List[List[str]] = [
@@ -48,8 +600,14 @@ class Board:
         return board_state
 
     def start_board(self):
+        """
+        Расставляет начальную позицию; остальные клетки очищаются, ход переходит к белым.
+        """
+        self.side_to_move = 'white'
+        self.en_passant = None
         for i in range(8):
             for j in range(8):
+                self.board[i][j] = None
                 if i == 1:
                     self.board[i][j] = Pawn('black', (i, j))
                 elif i == 6:
@@ -76,3 +634,4 @@ class Board:
                         self.board[i][j] = Queen('black', (i, j))
                     if j == 4:
                         self.board[i][j] = King('black', (i, j))
+        self.sync_bitboards()
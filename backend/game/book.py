@@ -0,0 +1,232 @@
+"""
+Дебютная книга: отсортированный по ключу файл записей, открываемый через mmap.
+
+Запись (ENTRY_SIZE = 16 байт, big-endian) повторяет формат Polyglot:
+    8 байт — ключ позиции (Board.zobrist);
+    2 байта — ход: биты 0-2 — вертикаль куда, 3-5 — горизонталь куда (0 — первая),
+              6-8 и 9-11 — то же для откуда, 12-14 — превращение (1 — конь ... 4 — ферзь);
+              рокировка записывается как ход короля на клетку своей ладьи;
+    2 байта — вес хода;
+    4 байта — не используется (learn), всегда 0.
+
+Ключи — собственные ключи Zobrist (zobrist.py), а не таблица Polyglot, поэтому
+книги Polyglot этим модулем не читаются. Состав ключа тот же, что в Polyglot:
+вертикаль взятия на проходе учитывается, только если рядом стоит пешка, которая может бить.
+
+Поиск позиции — двоичный поиск прямо по отображённому файлу: книга не
+загружается в память процесса, сколько бы она ни весила.
+
+Сборка книги из партий в PGN (из каталога backend):
+    python -m game.book build databases/book.bin games.pgn --plies 20
+    python -m game.book probe databases/book.bin --fen "rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b KQkq e3 0 1"
+"""
+import argparse
+import mmap
+import random
+import struct
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from .bitboard import KING
+from .board import PIECE_KINDS, PROMOTION_KINDS, PROMOTION_SYMBOLS, START_FEN, Board
+from .index_notation import move_to_notation
+from .movegen import Move, generate_legal_moves
+
+_ENTRY = struct.Struct('>QHHI')
+ENTRY_SIZE = _ENTRY.size
+_KEY = struct.Struct('>Q')
+
+_MAX_WEIGHT = 0xFFFF
+
+
+def encode_move(board: Board, move: Move) -> int:
+    """
+    Кодирует ход позиции board в 16-битный ход книги.
+    """
+    (from_row, from_col), (to_row, to_col), promotion = move
+    if PIECE_KINDS[type(board.board[from_row][from_col])] == KING and abs(to_col - from_col) == 2:
+        to_col = 7 if to_col > from_col else 0
+    return ((7 - to_row) << 3 | to_col | (7 - from_row) << 9 | from_col << 6
+            | (PROMOTION_KINDS[promotion] if promotion else 0) << 12)
+
+
+def decode_move(board: Board, code: int) -> Move:
+    """
+    Обратное преобразование к encode_move для позиции board.
+    """
+    from_row, from_col = 7 - (code >> 9 & 7), code >> 6 & 7
+    to_row, to_col = 7 - (code >> 3 & 7), code & 7
+    piece = board.board[from_row][from_col]
+    if (piece is not None and PIECE_KINDS[type(piece)] == KING and from_row == to_row
+            and abs(to_col - from_col) > 1):
+        to_col = 6 if to_col > from_col else 2
+    return (from_row, from_col), (to_row, to_col), PROMOTION_SYMBOLS[code >> 12 & 7]
+
+
+class OpeningBook:
+    """
+    Книга, открытая только для чтения. Пустой или отсутствующий файл — пустая книга.
+    """
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        """
+        :raises ValueError: Если размер файла не кратен ENTRY_SIZE
+        """
+        self.path = Path(path)
+        self._file = None
+        self._map: Optional[mmap.mmap] = None
+        self._size = 0
+        if not self.path.exists() or self.path.stat().st_size == 0:
+            return
+        self._file = open(self.path, 'rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._map) % ENTRY_SIZE:
+            self.close()
+            raise ValueError("Book size is not a multiple of the entry size")
+        self._size = len(self._map) // ENTRY_SIZE
+
+    def __enter__(self) -> 'OpeningBook':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def close(self) -> None:
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._size = 0
+
+    def entries(self, key: int) -> List[Tuple[int, int]]:
+        """
+        Возвращает записи позиции с ключом key: список (ход книги, вес).
+        """
+        data = self._map
+        low, high = 0, self._size
+        while low < high:
+            middle = (low + high) // 2
+            if _KEY.unpack_from(data, middle * ENTRY_SIZE)[0] < key:
+                low = middle + 1
+            else:
+                high = middle
+        found = []
+        while low < self._size:
+            entry_key, code, weight, _ = _ENTRY.unpack_from(data, low * ENTRY_SIZE)
+            if entry_key != key:
+                break
+            found.append((code, weight))
+            low += 1
+        return found
+
+    def moves(self, board: Board) -> List[Tuple[Move, int]]:
+        """
+        Возвращает легальные ходы книги для позиции board: список (ход, вес).
+
+        Ходы, нелегальные в позиции (коллизия ключей), отбрасываются.
+        """
+        if not self._size:
+            return []
+        entries = self.entries(board.zobrist)
+        if not entries:
+            return []
+        legal = set(generate_legal_moves(board, board.side_to_move))
+        found = []
+        for code, weight in entries:
+            move = decode_move(board, code)
+            if move in legal:
+                found.append((move, weight))
+        return found
+
+    def choose(self, board: Board, rng: Optional[random.Random] = None) -> Optional[Move]:
+        """
+        Выбирает ход книги для позиции board.
+
+        :param rng: Генератор для выбора хода пропорционально весу; без него берётся ход с наибольшим весом.
+        :return: Ход или None, если позиции нет в книге.
+        """
+        found = self.moves(board)
+        if not found:
+            return None
+        if rng is None:
+            return max(found, key=lambda item: item[1])[0]
+        moves, weights = zip(*found)
+        return rng.choices(moves, weights)[0]
+
+
+def build_book(pgn_paths: Iterable[Union[str, Path]], output: Union[str, Path], plies: int = 20) -> int:
+    """
+    Собирает книгу из партий PGN.
+
+    Вес хода — 2 за каждую партию, выигранную сделавшей его стороной, и 1 за ничью
+    или партию без результата; ходы только из проигранных партий в книгу не попадают.
+    Партии с заданной начальной позицией (тег FEN) пропускаются.
+
+    :param plies: Сколько первых полуходов каждой партии учитывать.
+    :return: Число записей в книге.
+    """
+    # pgn.py зависит от chess_game.py, а тот через engine.py — от этого модуля
+    from .pgn import open_games, san_to_move
+
+    weights: Dict[Tuple[int, int], int] = {}
+    for path in pgn_paths:
+        for pgn_game in open_games(path):
+            if 'FEN' in pgn_game.headers:
+                continue
+            winner = pgn_game.winner
+            board = Board()
+            board.load_fen(START_FEN)
+            for san in pgn_game.moves[:plies]:
+                try:
+                    move = san_to_move(board, san)
+                except ValueError:
+                    break
+                points = 1 if winner is None else 2 if winner == board.side_to_move else 0
+                entry = (board.zobrist, encode_move(board, move))
+                weights[entry] = weights.get(entry, 0) + points
+                board.make_move(*move)
+
+    top = max(weights.values(), default=0)
+    scale = _MAX_WEIGHT / top if top > _MAX_WEIGHT else 1
+    with open(output, 'wb') as file:
+        count = 0
+        for (key, code), weight in sorted(weights.items(), key=lambda item: (item[0][0], -item[1])):
+            weight = int(weight * scale)
+            if weight:
+                file.write(_ENTRY.pack(key, code, weight, 0))
+                count += 1
+    return count
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Дебютная книга")
+    commands = parser.add_subparsers(dest='command', required=True)
+    build = commands.add_parser('build', help="Собрать книгу из PGN")
+    build.add_argument('output', help="Файл книги")
+    build.add_argument('pgn', nargs='+', help="Файлы PGN")
+    build.add_argument('--plies', type=int, default=20, help="Сколько первых полуходов учитывать")
+    probe = commands.add_parser('probe', help="Показать ходы книги для позиции")
+    probe.add_argument('book', help="Файл книги")
+    probe.add_argument('--fen', default=START_FEN, help="Позиция в FEN")
+    args = parser.parse_args(argv)
+
+    if args.command == 'build':
+        count = build_book(args.pgn, args.output, args.plies)
+        print(f"{count} entries written to {args.output}")
+        return 0
+
+    board = Board()
+    board.load_fen(args.fen)
+    with OpeningBook(args.book) as book:
+        for move, weight in sorted(book.moves(board), key=lambda item: -item[1]):
+            print(f"{move_to_notation(move)} {weight}")
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
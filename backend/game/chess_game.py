@@ -1,18 +1,44 @@
-import copy
-from typing import Union, Literal, cast
+import logging
+from collections import deque
+from typing import NamedTuple, Union, Literal, cast
 
-from .board import Board
-from .index_notation import index_to_notation, notation_to_index
+from .bitboard import BISHOP, KNIGHT, LIGHT_SQUARES, PAWN, QUEEN, ROOK
+from .board import Board, MoveUndo, PIECE_KINDS, PROMOTION_PIECES
+from .codec import pack_position, unpack_position
+from .engine import Engine
+from .index_notation import index_to_notation, move_to_notation, notation_to_index
+from .movegen import generate_legal_moves
 from .pieces.king import King
 from .pieces.pawn import Pawn
 from .pieces.piece import Piece
 from .pieces.rook import Rook
 
+logger = logging.getLogger(__name__)
+
 PieceColor = Union[Literal["white"], Literal["black"]]
 
+Square = tuple[int, int]
+
+# Сколько последних ходов хранится для ChessGame.changes_since
+DELTA_HISTORY = 64
+
+
+class MoveDelta(NamedTuple):
+    """
+    Изменение доски одним ходом.
+
+    version — версия позиции после хода, rook — перенос ладьи (откуда, куда) при рокировке,
+    changes — клетки с их новым содержимым (имя фигуры или None для пустой клетки).
+    """
+    version: int
+    move: tuple[Square, Square, str | None]
+    rook: tuple[Square, Square] | None
+    changes: tuple[tuple[Square, str | None], ...]
+
 
 class ChessGame:
     def __init__(self, game_time, increment) -> None:
+        self.game_time = game_time
         self.white_timer = game_time
         self.black_timer = game_time
         self.white: int | None = None
@@ -23,73 +49,204 @@ class ChessGame:
         self.white_king = (7, 4)
         self.black_king = (0, 4)
         self.result = None
+        # Счётчик полуходов без взятий и ходов пешкой и номер хода (как в FEN)
+        self.halfmove_clock = 0
+        self.fullmove_number = 1
+        # Сколько раз встречалась каждая позиция (по хешу) с последнего необратимого хода
+        self.repetitions: dict[int, int] = {}
+        # Число фигур каждого вида, индекс color * 6 + kind как в Board.bitboards
+        self.material = [0] * 12
+        # Движок, который играет за сторону engine_color (None — партия между людьми)
+        self.engine: Engine | None = None
+        self.engine_color: PieceColor | None = None
+        # Начальная позиция партии в FEN и сделанные с неё ходы ((from), (to), promotion) — для записи в PGN
+        self.start_fen: str | None = None
+        self.moves: list[tuple[tuple[int, int], tuple[int, int], str | None]] = []
+        # Версия позиции: увеличивается при каждом изменении доски
+        self.version = 0
+        # Изменения доски последними ходами, по одному на версию
+        self.deltas: deque[MoveDelta] = deque(maxlen=DELTA_HISTORY)
+        self._legal_moves_version = -1
+        self._legal_moves: dict[tuple[int, int], list[tuple[int, int]]] = {}
 
     def invert_current_player_color(self) -> None:
         self.current_player_color = "black" if self.current_player_color == "white" else "white"
 
     def start_game(self) -> None:
+        """
+        Начинает партию заново: начальная расстановка, полные часы, без результата и истории ходов.
+        """
         self.board.start_board()
-        self.board.print_board()
+        self._set_position(self.board, 0, 1)
+        self.white_timer = self.black_timer = self.game_time
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("New game\n%s", self.board.render())
+
+    def set_engine(self, color: PieceColor, engine: Engine | None = None) -> None:
+        """
+        Отдаёт сторону color движку.
+
+        :param engine: Настроенный движок; по умолчанию Engine() с бюджетом 1 секунда на ход.
+        """
+        self.engine = engine or Engine()
+        self.engine_color = color
+
+    @property
+    def is_engine_turn(self) -> bool:
+        return self.engine is not None and self.result is None and self.current_player_color == self.engine_color
+
+    def engine_move(self) -> str | None:
+        """
+        Делает ход за движок, если сейчас его очередь.
+
+        :return: Ход движка в координатной записи (например 'e7e5') или None.
+        """
+        if not self.is_engine_turn:
+            return None
+        return self.play_engine_move(self.engine.search(self.board, self.repetitions).move)
+
+    def play_engine_move(self, move: tuple[Square, Square, str | None] | None) -> str | None:
+        """
+        Делает ход, найденный движком; поиск можно вести отдельно, на копии доски.
+
+        :return: Ход в координатной записи или None, если хода нет или он уже невозможен.
+        """
+        if move is None:
+            return None
+        from_square, to_square, promotion = move
+        if not self.move(index_to_notation(*from_square), index_to_notation(*to_square), promotion):
+            return None
+        return move_to_notation(move)
+
+    def suggest_move(self, engine: Engine) -> str | None:
+        """
+        Подсказывает ход стороне, которая ходит (сначала по дебютной книге движка, затем поиском).
+
+        :return: Ход в координатной записи или None, если партия окончена.
+        """
+        if self.result is not None:
+            return None
+        found = engine.search(self.board, self.repetitions)
+        return move_to_notation(found.move) if found.move is not None else None
+
+    def _reset_draw_state(self) -> None:
+        self.material = [bin(mask).count('1') for mask in self.board.bitboards]
+        self.repetitions = {self.board.zobrist: 1}
+
+    def fen(self) -> str:
+        """
+        Возвращает текущую позицию партии в нотации FEN.
+        """
+        return self.board.fen(self.halfmove_clock, self.fullmove_number)
+
+    def load_fen(self, fen: str) -> None:
+        """
+        Устанавливает позицию партии из FEN.
+
+        :raises ValueError: Если строка FEN некорректна
+        """
+        board = Board()
+        halfmove_clock, fullmove_number = board.load_fen(fen)
+        self._set_position(board, halfmove_clock, fullmove_number)
+
+    def pack(self) -> bytes:
+        """
+        Возвращает позицию партии в двоичном виде фиксированного размера (см. codec.py).
+        """
+        return pack_position(self.board, self.halfmove_clock, self.fullmove_number)
+
+    def load_packed(self, data: bytes) -> None:
+        """
+        Устанавливает позицию партии из результата ChessGame.pack.
+
+        :raises ValueError: Если данные повреждены
+        """
+        self._set_position(*unpack_position(data))
+
+    def _set_position(self, board: Board, halfmove_clock: int, fullmove_number: int) -> None:
+        self.board = board
+        self.halfmove_clock = halfmove_clock
+        self.fullmove_number = fullmove_number
+        self.current_player_color = board.side_to_move
+        self.white_king = board.king_square('white')
+        self.black_king = board.king_square('black')
+        self.result = None
+        self._reset_draw_state()
+        self.start_fen = self.fen()
+        self.moves = []
+        self.deltas.clear()
+        self.version += 1
+
+    @property
+    def position_hash(self) -> int:
+        """
+        64-битный хеш Zobrist текущей позиции (с учётом очереди хода, рокировок и взятия на проходе).
+        """
+        return self.board.zobrist
+
+    def legal_moves(self) -> dict[tuple[int, int], list[tuple[int, int]]]:
+        """
+        Возвращает легальные ходы стороны, которая ходит, сгруппированные по исходной клетке.
+
+        Ходы генерируются один раз для каждой версии позиции; проверка хода,
+        get_possible_moves и check_game_over используют один и тот же результат.
+        """
+        if self._legal_moves_version != self.version:
+            legal_moves: dict[tuple[int, int], list[tuple[int, int]]] = {}
+            for from_square, to_square, _ in generate_legal_moves(self.board, self.current_player_color):
+                targets = legal_moves.setdefault(from_square, [])
+                # Превращение даёт четыре хода на одну клетку, оставляем одну
+                if to_square not in targets:
+                    targets.append(to_square)
+            self._legal_moves = legal_moves
+            self._legal_moves_version = self.version
+        return self._legal_moves
 
     def get_possible_moves(self, from_position: str) -> list[tuple[int, int]]:
         try:
             from_position_index = notation_to_index(from_position)
         except ValueError as ve:
-            print(f"Ошибка формата клетки: {ve}")
-            return []
-        from_square = self.board[from_position_index]
-        if from_square is None:
-            return []
-        elif from_square.color != self.current_player_color:
+            logger.debug("Ошибка формата клетки: %s", ve)
             return []
-        else:
-            uncut_possible_moves = from_square.show_possible_moves(self.board.board)
-            possible_moves = []
-            for move in uncut_possible_moves:
-                # Make a deep copy of the board and game state
-                board_copy = copy.deepcopy(self.board)
-                white_king_pos = self.white_king
-                black_king_pos = self.black_king
-                current_player_color = self.current_player_color
-
-                # Simulate the move on the copy
-                from_square_copy = board_copy[from_position_index]
-                from_square_copy.move(move, board_copy.board)
-                if isinstance(from_square_copy, King):
-                    if current_player_color == 'white':
-                        white_king_pos = move
-                    else:
-                        black_king_pos = move
-
-                # Now check if the king is in check on the copied board
-                if current_player_color == 'white':
-                    king_piece = board_copy[white_king_pos]
-                    if not king_piece.is_in_check(board_copy.board):
-                        possible_moves.append(move)
-                else:
-                    king_piece = board_copy[black_king_pos]
-                    if not king_piece.is_in_check(board_copy.board):
-                        possible_moves.append(move)
-
-                # No need to undo the move, since we worked on a copy
+        return list(self.legal_moves().get(from_position_index, []))
 
-            return possible_moves
-
-    def move(self, from_position: str, to_position: str) -> bool:
+    def move(self, from_position: str, to_position: str, promotion: str | None = None) -> bool:
+        if self.result is not None:
+            logger.debug("Игра окончена: %s", self.result)
+            return False
         previous_player_color = self.current_player_color
         try:
             from_position_index = notation_to_index(from_position)
             to_position_index = notation_to_index(to_position)
+            if promotion is not None and promotion.upper() not in PROMOTION_PIECES:
+                raise ValueError("Фигура превращения должна быть одной из Q, R, B, N.")
         except ValueError as ve:
-            print(f"Ошибка формата хода: {ve}")
-            self.board.print_board()
+            logger.debug("Ошибка формата хода: %s", ve)
             return False
-        from_square = self.board[from_position_index]
-        if to_position_index not in self.get_possible_moves(from_position):
-            print("Impossible move")
-            self.board.print_board()
+        if to_position_index not in self.legal_moves().get(from_position_index, []):
+            logger.debug("Impossible move %s%s", from_position, to_position)
             return False
-        from_square.move(to_position_index, self.board.board)
+        undo = self.board.make_move(from_position_index, to_position_index,
+                                    promotion.upper() if promotion else None)
+        if undo.promoted is not None:
+            promotion = (promotion or 'Q').upper()
+        else:
+            promotion = None
+        self.moves.append((from_position_index, to_position_index, promotion))
+        if undo.captured is not None or isinstance(undo.piece, Pawn):
+            self.halfmove_clock = 0
+            # После взятия или хода пешкой прежние позиции повториться уже не могут
+            self.repetitions.clear()
+        else:
+            self.halfmove_clock += 1
+        self.repetitions[self.board.zobrist] = self.repetitions.get(self.board.zobrist, 0) + 1
+        if undo.captured is not None:
+            self._update_material(undo.captured, -1)
+        if undo.promoted is not None:
+            self._update_material(undo.piece, -1)
+            self._update_material(undo.promoted, 1)
+        if self.current_player_color == "black":
+            self.fullmove_number += 1
         if isinstance(self.board[to_position_index], King):
             if self.current_player_color == "white":
                 self.white_king = to_position_index
@@ -98,21 +255,83 @@ class ChessGame:
 
         # Invert the current player color
         self.invert_current_player_color()
-        next_player_color = self.current_player_color
-        color_change = f"{previous_player_color}->{next_player_color}"
-        print(color_change)
-
-        # Add an extra newline to separate output
-        print()
-
-        # Print the board
-        self.board.print_board()
+        self.version += 1
+        self._record_delta(undo, promotion)
+        if logger.isEnabledFor(logging.DEBUG):
+            # Доска рисуется только при включённой отладке: это десятки строк на каждый ход
+            logger.debug("%s->%s\n%s", previous_player_color, self.current_player_color, self.board.render())
 
         # Check if the game is over after the move
         self.check_game_over()
 
         return True
 
+    def _record_delta(self, undo: MoveUndo, promotion: str | None) -> None:
+        changes = [(undo.from_square, None)]
+        if undo.captured_square is not None and undo.captured_square != undo.to_square:
+            changes.append((undo.captured_square, None))
+        rook = None
+        if undo.rook is not None:
+            rook = (undo.rook_from, undo.rook_to)
+            changes.append((undo.rook_from, None))
+            changes.append((undo.rook_to, undo.rook.name()))
+        changes.append((undo.to_square, (undo.promoted or undo.piece).name()))
+        self.deltas.append(MoveDelta(self.version, (undo.from_square, undo.to_square, promotion),
+                                     rook, tuple(changes)))
+
+    def changes_since(self, version: int) -> list[MoveDelta] | None:
+        """
+        Возвращает ходы, сделанные после версии позиции version.
+
+        :return: Список MoveDelta по порядку (пустой, если версия текущая) или None,
+                 если version неизвестна или старше сохранённой истории — тогда клиенту
+                 нужна позиция целиком.
+        """
+        if version == self.version:
+            return []
+        if version > self.version or not self.deltas or version < self.deltas[0].version - 1:
+            return None
+        return [delta for delta in self.deltas if delta.version > version]
+
+    def _update_material(self, piece: Piece, delta: int) -> None:
+        index = (0 if piece.color == 'white' else 6) + PIECE_KINDS[type(piece)]
+        self.material[index] += delta
+
+    def is_insufficient_material(self) -> bool:
+        """
+        Проверяет, что ни одна из сторон не может поставить мат: остались только короли
+        и не больше одной лёгкой фигуры либо только слоны на полях одного цвета.
+        """
+        material = self.material
+        for color in (0, 6):
+            if material[color + PAWN] or material[color + ROOK] or material[color + QUEEN]:
+                return False
+        knights = material[KNIGHT] + material[6 + KNIGHT]
+        bishops = material[BISHOP] + material[6 + BISHOP]
+        if knights + bishops <= 1:
+            return True
+        if knights:
+            return False
+        bishop_squares = self.board.bitboards[BISHOP] | self.board.bitboards[6 + BISHOP]
+        return not bishop_squares & LIGHT_SQUARES or not bishop_squares & ~LIGHT_SQUARES
+
+    def _check_draw(self) -> bool:
+        """
+        Ничья по недостаточному материалу, троекратному повторению или правилу 50 ходов.
+        """
+        if self.is_insufficient_material():
+            logger.info("Insufficient material! It's a draw.")
+            self.result = "Недостаточно материала. Ничья!"
+        elif self.repetitions.get(self.board.zobrist, 0) >= 3:
+            logger.info("Threefold repetition! It's a draw.")
+            self.result = "Троекратное повторение. Ничья!"
+        elif self.halfmove_clock >= 100:
+            logger.info("Fifty-move rule! It's a draw.")
+            self.result = "Правило 50 ходов. Ничья!"
+        else:
+            return False
+        return True
+
     def check_game_over(self) -> bool:
         if self.current_player_color == "white":
             king_pos = self.white_king
@@ -120,33 +339,23 @@ class ChessGame:
             king_pos = self.black_king
         king_piece = self.board[king_pos]
         # Check if any move is possible for the current player
-        has_possible_moves = False
-        for i in range(8):
-            for j in range(8):
-                piece = self.board[i, j]
-                if piece is not None and piece.color == self.current_player_color:
-                    from_notation = index_to_notation(i, j)
-                    if self.get_possible_moves(from_notation):
-                        has_possible_moves = True
-                        break
-            if has_possible_moves:
-                break
+        has_possible_moves = bool(self.legal_moves())
 
         if has_possible_moves:
-            # The player has possible moves; the game continues
-            return False
+            # The player has possible moves; the game continues unless it is a draw
+            return self._check_draw()
         else:
             # No possible moves, check if the king is in check
-            if isinstance(king_piece, King) and king_piece.is_in_check(self.board.board):
+            if isinstance(king_piece, King) and self.board.is_in_check(self.current_player_color):
                 # King is in check, checkmate
                 if self.current_player_color == "white":
-                    print("Checkmate! Black wins.")
+                    logger.info("Checkmate! Black wins.")
                     self.result = "Мат. Победа черных!"
                 else:
-                    print("Checkmate! White wins.")
+                    logger.info("Checkmate! White wins.")
                     self.result = "Мат. Победа белых!"
             else:
                 # King is not in check, stalemate
-                print("Stalemate! It's a draw.")
+                logger.info("Stalemate! It's a draw.")
                 self.result = "Тупик. Ничья!"
             return True
\ No newline at end of file
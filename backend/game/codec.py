@@ -0,0 +1,83 @@
+"""
+Компактное двоичное представление позиции фиксированного размера.
+
+Формат (PACKED_SIZE = 29 байт, порядок байтов big-endian):
+    8 байт  — маска занятых клеток (бит square = row * 8 + col);
+    16 байт — фигуры в порядке возрастания клеток по 4 бита (color * 6 + kind),
+              старший полубайт первым; неиспользованные полубайты равны 0;
+    1 байт  — бит 0: очередь хода (1 — чёрные), биты 1-4: права на рокировку;
+    1 байт  — вертикаль взятия на проходе + 1 (0 — взятия нет);
+    1 байт  — счётчик полуходов (больше 255 записывается как 255);
+    2 байта — номер хода (от 1 до 65535).
+
+Строка байтов неизменяема и хешируема, поэтому подходит и как ключ кэша,
+и для передачи позиции в другой процесс.
+"""
+import struct
+from typing import Tuple
+
+from .bitboard import COLOR_INDEX, iter_squares, square_coords
+from .board import PIECE_KINDS, Board
+
+_FORMAT = '>Q16sBBBH'
+PACKED_SIZE = struct.calcsize(_FORMAT)
+
+_PIECE_CLASSES = {kind: piece_class for piece_class, kind in PIECE_KINDS.items()}
+_COLORS = ('white', 'black')
+
+
+def pack_position(board: Board, halfmove_clock: int = 0, fullmove_number: int = 1) -> bytes:
+    """
+    Упаковывает позицию доски вместе со счётчиками ходов.
+
+    :raises ValueError: Если на доске больше 32 фигур, счётчик полуходов отрицательный
+                        или номер хода не помещается в два байта
+    """
+    if halfmove_clock < 0:
+        raise ValueError("Счётчик полуходов не может быть отрицательным.")
+    if not 1 <= fullmove_number <= 0xFFFF:
+        raise ValueError("Номер хода должен быть от 1 до 65535.")
+    occupied = board.occupied
+    nibbles = []
+    for square in iter_squares(occupied):
+        row, col = square_coords(square)
+        piece = board.board[row][col]
+        nibbles.append(COLOR_INDEX[piece.color] * 6 + PIECE_KINDS[type(piece)])
+    if len(nibbles) > 32:
+        raise ValueError("Упаковать можно не больше 32 фигур.")
+    nibbles.extend([0] * (32 - len(nibbles)))
+    pieces = bytes(nibbles[i] << 4 | nibbles[i + 1] for i in range(0, 32, 2))
+
+    flags = (1 if board.side_to_move == 'black' else 0) | board.castling_rights << 1
+    en_passant = board.en_passant[1] + 1 if board.en_passant is not None else 0
+    return struct.pack(_FORMAT, occupied, pieces, flags, en_passant,
+                       min(halfmove_clock, 255), fullmove_number)
+
+
+def unpack_position(data: bytes) -> Tuple[Board, int, int]:
+    """
+    Восстанавливает позицию, упакованную pack_position.
+
+    :return: (доска, счётчик полуходов, номер хода)
+    :raises ValueError: Если данные повреждены
+    """
+    if len(data) != PACKED_SIZE:
+        raise ValueError(f"Упакованная позиция должна занимать {PACKED_SIZE} байт.")
+    occupied, pieces, flags, en_passant, halfmove_clock, fullmove_number = struct.unpack(_FORMAT, data)
+
+    board = Board()
+    for index, square in enumerate(iter_squares(occupied)):
+        if index >= 32:
+            raise ValueError("Упакованная позиция содержит больше 32 фигур.")
+        nibble = pieces[index >> 1] >> (0 if index & 1 else 4) & 0xF
+        if nibble >= 12:
+            raise ValueError(f"Неизвестный код фигуры: {nibble}")
+        row, col = square_coords(square)
+        board.board[row][col] = _PIECE_CLASSES[nibble % 6](_COLORS[nibble // 6], (row, col))
+
+    side_to_move = 'black' if flags & 1 else 'white'
+    en_passant_square = None
+    if en_passant:
+        en_passant_square = (2 if side_to_move == 'white' else 5, en_passant - 1)
+    board._setup_state(side_to_move, flags >> 1 & 0xF, en_passant_square)
+    return board, halfmove_clock, fullmove_number
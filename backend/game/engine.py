@@ -0,0 +1,348 @@
+"""
+Движок для игры против компьютера.
+
+Поиск — альфа-бета (negamax) с итеративным углублением, таблицей транспозиций,
+упорядочиванием ходов (ход из таблицы, взятия по MVV-LVA, killer-ходы) и
+поиском взятий (quiescence) на листьях; глубина поиска взятий ограничена, а заведомо
+не достающие до alpha взятия отсекаются (delta pruning). Оценка листа — tapered-оценка материала и
+позиции фигур (evaluation.py), которую доска поддерживает инкрементально.
+
+Если задана дебютная книга (book.py) и позиция в ней есть, ход берётся из книги без поиска.
+
+Время и число узлов на ход жёстко ограничены: когда бюджет исчерпан, поиск
+прерывается и возвращается лучший ход последней завершённой итерации. Первая
+итерация (глубина 1) доводится до конца независимо от времени, чтобы не играть
+неисследованный ход; лимит узлов действует всегда.
+"""
+import random
+import time
+from typing import Any, Dict, List, NamedTuple, Optional
+
+from .bitboard import PAWN
+from .board import Board, PIECE_KINDS, PROMOTION_KINDS
+from .book import OpeningBook
+from .evaluation import tapered
+from .movegen import Move, generate_legal_moves
+from .transposition import TranspositionTable
+
+# Стоимость фигур для упорядочивания взятий, индекс — kind из bitboard.py
+PIECE_VALUES = (100, 320, 330, 500, 900, 0)
+
+MATE_SCORE = 100000
+# Оценки по модулю выше порога означают мат за конечное число ходов
+MATE_THRESHOLD = MATE_SCORE - 1000
+INFINITY = MATE_SCORE + 1
+MAX_PLY = 64
+
+# Тип оценки в таблице транспозиций
+EXACT, LOWER, UPPER = 0, 1, 2
+
+# Как часто (в узлах) проверять время; лимит узлов проверяется в каждом узле
+_BUDGET_CHECK_INTERVAL = 1024
+
+# Наибольшая глубина поиска взятий в полуходах от листа основного поиска
+QUIESCENCE_DEPTH = 6
+# Запас delta pruning: взятие отбрасывается, если даже с ним оценка не дотягивает до alpha
+DELTA_MARGIN = 200
+
+
+class SearchResult(NamedTuple):
+    """
+    Результат поиска: лучший ход и статистика последней завершённой итерации.
+    """
+    move: Optional[Move]
+    score: int
+    depth: int
+    nodes: int
+    elapsed: float
+
+
+class SearchTimeout(Exception):
+    """
+    Бюджет на ход исчерпан.
+    """
+
+
+def evaluate(board: Board) -> int:
+    """
+    Статическая оценка позиции с точки зрения стороны, которая ходит: материал и позиция фигур
+    с интерполяцией по фазе партии. Суммы ведёт сама доска, поэтому оценка не обходит клетки.
+    """
+    score = tapered(board.mg_score, board.eg_score, board.phase)
+    return score if board.side_to_move == 'white' else -score
+
+
+def _score_to_tt(score: int, ply: int) -> int:
+    # В таблице мат хранится относительно узла, а не корня
+    if score >= MATE_THRESHOLD:
+        return score + ply
+    if score <= -MATE_THRESHOLD:
+        return score - ply
+    return score
+
+
+def _score_from_tt(score: int, ply: int) -> int:
+    if score >= MATE_THRESHOLD:
+        return score - ply
+    if score <= -MATE_THRESHOLD:
+        return score + ply
+    return score
+
+
+class Engine:
+    def __init__(self, max_depth: int = 32, time_limit: float = 1.0, node_limit: int = 200_000,
+                 tt_size: int = 1 << 18, tt: Optional[Any] = None, book: Optional[OpeningBook] = None) -> None:
+        """
+        :param max_depth: Наибольшая глубина итеративного углубления.
+        :param time_limit: Время на ход в секундах.
+        :param node_limit: Наибольшее число узлов на ход.
+        :param tt_size: Размер таблицы транспозиций (сохраняется между ходами).
+        :param tt: Готовая таблица с интерфейсом TranspositionTable (например, SharedTranspositionTable);
+                   если задана, tt_size не используется.
+        :param book: Дебютная книга, в которую движок заглядывает перед поиском.
+        """
+        if time_limit <= 0 or node_limit <= 0 or max_depth <= 0:
+            raise ValueError("Engine limits must be positive")
+        self.max_depth = min(max_depth, MAX_PLY)
+        self.time_limit = time_limit
+        self.node_limit = node_limit
+        self.tt = tt if tt is not None else TranspositionTable(tt_size)
+        self.book = book
+        # Ход из книги выбирается случайно пропорционально весу, чтобы дебюты не повторялись
+        self._book_rng = random.Random()
+        self.nodes = 0
+        self._deadline = 0.0
+        # Время проверяется только после первой завершённой итерации
+        self._timed = False
+        self._killers: List[List[Optional[Move]]] = []
+        self._path: List[int] = []
+        self._history: Dict[int, int] = {}
+
+    def search(self, board: Board, history: Optional[Dict[int, int]] = None,
+               start_depth: int = 1) -> SearchResult:
+        """
+        Ищет лучший ход для стороны board.side_to_move.
+
+        Доска не изменяется: поиск идёт по копии.
+
+        :param board: Позиция.
+        :param history: Позиции партии (хеш -> число повторений) для распознавания ничьей повторением.
+        :param start_depth: Первая глубина итеративного углубления (вспомогательные процессы
+                            параллельного поиска начинают с разных глубин).
+        :return: SearchResult; move равен None, если ходов нет. Для хода из книги depth равен 0.
+        """
+        started = time.perf_counter()
+        book_move = self.book_move(board)
+        if book_move is not None:
+            return SearchResult(book_move, evaluate(board), 0, 0, time.perf_counter() - started)
+        self.tt.new_search()
+        return self._iterate(board, history, start_depth)
+
+    def _iterate(self, board: Board, history: Optional[Dict[int, int]] = None,
+                 start_depth: int = 1) -> SearchResult:
+        """
+        Итеративное углубление без книги и без нового поколения таблицы транспозиций.
+
+        ParallelEngine сам начинает поколение общей таблицы до запуска процессов
+        и ведёт основной поиск этим методом, чтобы не сдвинуть поколение второй раз.
+        """
+        started = time.perf_counter()
+        board = board.copy()
+        self.nodes = 0
+        self._deadline = started + self.time_limit
+        self._killers = [[None, None] for _ in range(MAX_PLY + 1)]
+        self._path = []
+        self._history = history or {}
+
+        moves = generate_legal_moves(board, board.side_to_move)
+        if not moves:
+            return SearchResult(None, evaluate(board), 0, 0, 0.0)
+        if len(moves) == 1:
+            return SearchResult(moves[0], evaluate(board), 0, 0, time.perf_counter() - started)
+
+        best = SearchResult(self._order(board, moves, None, 0)[0], evaluate(board), 0, 0, 0.0)
+        for depth in range(min(start_depth, self.max_depth), self.max_depth + 1):
+            self._timed = depth > 1
+            try:
+                score, move = self._root(board, moves, depth)
+            except SearchTimeout:
+                break
+            best = SearchResult(move, score, depth, self.nodes, time.perf_counter() - started)
+            if abs(score) >= MATE_THRESHOLD:
+                break
+        return best._replace(nodes=self.nodes, elapsed=time.perf_counter() - started)
+
+    def book_move(self, board: Board) -> Optional[Move]:
+        """
+        Возвращает ход из дебютной книги или None, если книги нет или позиции в ней нет.
+        """
+        if self.book is None:
+            return None
+        return self.book.choose(board, self._book_rng)
+
+    def _check_budget(self) -> None:
+        if self.nodes >= self.node_limit or self._timed and time.perf_counter() >= self._deadline:
+            raise SearchTimeout()
+
+    def _root(self, board: Board, moves: List[Move], depth: int):
+        entry = self.tt.probe(board.zobrist)
+        tt_move = entry[1][2] if entry is not None else None
+        alpha = -INFINITY
+        best_move = None
+        self._path.append(board.zobrist)
+        for move in self._order(board, moves, tt_move, 0):
+            undo = board.make_move(*move)
+            score = -self._negamax(board, depth - 1, -INFINITY, -alpha, 1)
+            board.unmake_move(undo)
+            if score > alpha:
+                alpha = score
+                best_move = move
+        self._path.pop()
+        self.tt.store(board.zobrist, (_score_to_tt(alpha, 0), EXACT, best_move), depth)
+        return alpha, best_move
+
+    def _negamax(self, board: Board, depth: int, alpha: int, beta: int, ply: int) -> int:
+        self.nodes += 1
+        if self.nodes % _BUDGET_CHECK_INTERVAL == 0 or self.nodes >= self.node_limit:
+            self._check_budget()
+
+        key = board.zobrist
+        if key in self._path or self._history.get(key):
+            # Повторение позиции считаем ничьей
+            return 0
+        if depth <= 0 or ply >= MAX_PLY:
+            return self._quiesce(board, alpha, beta, ply)
+
+        tt_move = None
+        entry = self.tt.probe(key)
+        if entry is not None:
+            entry_depth, (stored, flag, tt_move) = entry
+            if entry_depth >= depth:
+                score = _score_from_tt(stored, ply)
+                if (flag == EXACT or flag == LOWER and score >= beta
+                        or flag == UPPER and score <= alpha):
+                    return score
+
+        color = board.side_to_move
+        moves = generate_legal_moves(board, color)
+        if not moves:
+            return -MATE_SCORE + ply if board.is_in_check(color) else 0
+
+        original_alpha = alpha
+        best_score = -INFINITY
+        best_move = None
+        self._path.append(key)
+        for move in self._order(board, moves, tt_move, ply):
+            quiet = not self._is_capture(board, move) and move[2] is None
+            undo = board.make_move(*move)
+            score = -self._negamax(board, depth - 1, -beta, -alpha, ply + 1)
+            board.unmake_move(undo)
+            if score > best_score:
+                best_score = score
+                best_move = move
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        if quiet:
+                            killers = self._killers[ply]
+                            if killers[0] != move:
+                                killers[1] = killers[0]
+                                killers[0] = move
+                        break
+        self._path.pop()
+
+        if best_score <= original_alpha:
+            flag = UPPER
+        elif best_score >= beta:
+            flag = LOWER
+        else:
+            flag = EXACT
+        self.tt.store(key, (_score_to_tt(best_score, ply), flag, best_move), depth)
+        return best_score
+
+    def _quiesce(self, board: Board, alpha: int, beta: int, ply: int, depth: int = 0) -> int:
+        """
+        Поиск только взятий и превращений, чтобы не оценивать позицию посреди размена.
+        Под шахом рассматриваются все ответы.
+
+        :param depth: Глубина от листа основного поиска; на QUIESCENCE_DEPTH возвращается оценка.
+        """
+        self.nodes += 1
+        if self.nodes % _BUDGET_CHECK_INTERVAL == 0 or self.nodes >= self.node_limit:
+            self._check_budget()
+
+        color = board.side_to_move
+        in_check = board.is_in_check(color)
+        stand_pat = evaluate(board)
+        if not in_check:
+            if stand_pat >= beta or ply >= MAX_PLY or depth >= QUIESCENCE_DEPTH:
+                return stand_pat
+            if stand_pat > alpha:
+                alpha = stand_pat
+
+        moves = generate_legal_moves(board, color)
+        if in_check:
+            if not moves:
+                return -MATE_SCORE + ply
+            if ply >= MAX_PLY or depth >= QUIESCENCE_DEPTH:
+                return stand_pat
+        else:
+            moves = [move for move in moves
+                     if (move[2] is not None or self._is_capture(board, move))
+                     and stand_pat + self._gain(board, move) + DELTA_MARGIN > alpha]
+
+        for move in self._order(board, moves, None, ply):
+            undo = board.make_move(*move)
+            score = -self._quiesce(board, -beta, -alpha, ply + 1, depth + 1)
+            board.unmake_move(undo)
+            if score > alpha:
+                alpha = score
+                if alpha >= beta:
+                    break
+        return alpha
+
+    @staticmethod
+    def _gain(board: Board, move: Move) -> int:
+        """
+        Наибольший выигрыш материала ходом: стоимость сбитой фигуры и прибавка от превращения.
+        """
+        _, (to_row, to_col), promotion = move
+        victim = board.board[to_row][to_col]
+        gain = PIECE_VALUES[PIECE_KINDS[type(victim)]] if victim is not None else PIECE_VALUES[PAWN]
+        if promotion is not None:
+            gain += PIECE_VALUES[PROMOTION_KINDS[promotion]] - PIECE_VALUES[PAWN]
+        return gain
+
+    @staticmethod
+    def _is_capture(board: Board, move: Move) -> bool:
+        (from_row, from_col), to_square, _ = move
+        if board.board[to_square[0]][to_square[1]] is not None:
+            return True
+        return to_square == board.en_passant and PIECE_KINDS[type(board.board[from_row][from_col])] == PAWN
+
+    def _order(self, board: Board, moves: List[Move], tt_move: Optional[Move], ply: int) -> List[Move]:
+        """
+        Сортирует ходы: ход из таблицы, взятия (сначала ценная жертва дешёвой фигурой),
+        превращения, killer-ходы, остальные.
+        """
+        killers = self._killers[ply] if ply < len(self._killers) else (None, None)
+        grid = board.board
+
+        def priority(move: Move) -> int:
+            if move == tt_move:
+                return 1_000_000
+            (from_row, from_col), (to_row, to_col), promotion = move
+            attacker = PIECE_KINDS[type(grid[from_row][from_col])]
+            score = 0
+            if promotion is not None:
+                score += 90_000 + PIECE_VALUES[PROMOTION_KINDS[promotion]]
+            victim = grid[to_row][to_col]
+            if victim is not None:
+                score += 100_000 + 10 * PIECE_VALUES[PIECE_KINDS[type(victim)]] - PIECE_VALUES[attacker]
+            elif attacker == PAWN and (to_row, to_col) == board.en_passant:
+                score += 100_000 + 9 * PIECE_VALUES[PAWN]
+            elif not score and move in killers:
+                score = 80_000 if move == killers[0] else 79_000
+            return score
+
+        return sorted(moves, key=priority, reverse=True)
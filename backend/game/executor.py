@@ -0,0 +1,51 @@
+"""
+Выполнение работы с партиями вне цикла событий.
+
+Ход (проверка легальности, поиск мата и пата) и поиск движка — чистый Python: ход
+занимает процессор на миллисекунды, поиск — до ENGINE_MAX_TIME. Выполненные прямо
+в обработчике, они останавливают цикл событий, и все остальные запросы, сокеты
+и долгие опросы процесса ждут. BoundedExecutor отдаёт такую работу пулу потоков.
+
+Одновременно выполняется не больше workers заданий, остальные ждут в очереди пула;
+если клиент отключился раньше, чем задание началось, оно отменяется. Потоки, а не процессы:
+партии живут в памяти процесса (active_games), и ход должен менять именно их.
+Интерпретатор передаёт управление между потоками каждые sys.getswitchinterval()
+секунд, поэтому цикл событий отвечает и во время долгого поиска.
+"""
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional, TypeVar
+
+T = TypeVar('T')
+
+
+class BoundedExecutor:
+    def __init__(self, workers: int) -> None:
+        """
+        :param workers: Число потоков и наибольшее число одновременно выполняемых заданий.
+        :raises ValueError: Если workers меньше 1.
+        """
+        if workers < 1:
+            raise ValueError(f"Executor needs at least one worker, got {workers}")
+        self.workers = workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    async def run(self, func: Callable[..., T], *args: Any) -> T:
+        """
+        Выполняет func(*args) в потоке пула, не занимая цикл событий.
+
+        :return: Результат func; исключение func поднимается здесь же.
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix='chess-worker')
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(func, *args))
+
+    def shutdown(self) -> None:
+        """
+        Останавливает потоки; следующий run создаст пул заново.
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
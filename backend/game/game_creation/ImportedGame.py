@@ -0,0 +1,35 @@
+from typing import Optional
+from sqlalchemy import Integer, String, Text
+from sqlalchemy.orm import Mapped, mapped_column
+from dbpackage.Base import Base
+
+class ImportedGames(Base):
+    """
+    Таблица партий, загруженных из файлов PGN (для дебютного справочника и аналитики).
+    """
+    # Теги PGN
+    event: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    site: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    date: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    white: Mapped[Optional[str]] = mapped_column(String, nullable=True)  # Имя игрока белыми
+    black: Mapped[Optional[str]] = mapped_column(String, nullable=True)  # Имя игрока черными
+
+    # Результат игры (0 - не завершена, 1 - белые победили, 2 - черные победили, 3 - ничья), как в Games
+    result: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+
+    # Начальная позиция в FEN, если партия начата не с начальной расстановки
+    start_fen: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    # Ходы в координатной записи через пробел, например "e2e4 e7e5 g1f3"
+    moves: Mapped[str] = mapped_column(Text, default="", nullable=False)
+    ply_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    # Позиция после последнего хода в FEN
+    final_fen: Mapped[str] = mapped_column(String, nullable=False)
+
+    # Файл, из которого загружена партия
+    source: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+
+    def __repr__(self):
+        return (
+            f"<ImportedGame(id={self.id}, white={self.white}, black={self.black}, result={self.result}, "
+            f"ply_count={self.ply_count})>"
+        )
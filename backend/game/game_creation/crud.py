@@ -15,7 +15,7 @@ async def create_game(db: AsyncSession, game: ChessGame, uuid: str) -> Games:
         white=game.white,
         black=game.black,
         result=game.result,
-        board={'board': game.board.pretty_board()},
+        board={'board': game.board.pretty_board(), 'fen': game.fen()},
         game_time=game.white_timer,
         increment=game.increment,
         # white_timer=game.game_time,
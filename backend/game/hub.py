@@ -0,0 +1,195 @@
+"""
+Рассылка состояния партий подключённым клиентам.
+
+GameHub хранит WebSocket-подписчиков (игроков и зрителей) по uuid партии в памяти
+процесса: после хода обработчик публикует новое состояние, и клиенты узнают о нём
+без повторных запросов GET /chess/{uuid}/.
+
+Состояние сериализуется один раз на версию позиции (Frame) и одной и той же строкой
+уходит всем подписчикам и в ответы GET. Публикация не ждёт сети: кадр кладётся
+в ограниченную очередь каждого подписчика, а отправляет его отдельная задача.
+Подписчик, у которого очередь переполнена, не успевает читать и отключается,
+чтобы не держать память и не тормозить остальных.
+
+Клиенты без WebSocket ждут изменения долгим опросом: GameHub.wait_for держит запрос
+на asyncio.Condition партии, а GameHub.notify будит его после каждой публикации.
+"""
+import asyncio
+import json
+import logging
+from typing import Any, Callable, Dict, Hashable, NamedTuple, Optional, Set
+
+from fastapi import WebSocket, status
+
+logger = logging.getLogger(__name__)
+
+# Сколько неотправленных кадров может накопиться у одного подписчика
+SUBSCRIBER_QUEUE_SIZE = 32
+
+
+class Frame(NamedTuple):
+    """
+    Неизменяемое сообщение, сериализованное один раз: text для WebSocket, body для HTTP.
+    """
+    key: Hashable
+    text: str
+    body: bytes
+
+    @classmethod
+    def encode(cls, key: Hashable, message: Dict[str, Any]) -> 'Frame':
+        text = json.dumps(message, ensure_ascii=False, separators=(',', ':'))
+        return cls(key, text, text.encode())
+
+    def extend(self, **fields: Any) -> bytes:
+        """
+        Дописывает поля в начало JSON-объекта кадра, не сериализуя его заново.
+
+        :return: Тело ответа HTTP.
+        """
+        if not fields:
+            return self.body
+        head = json.dumps(fields, ensure_ascii=False, separators=(',', ':'))
+        return (head[:-1] + ',' + self.text[1:]).encode()
+
+
+class Subscriber:
+    """
+    Подписчик канала: сокет, очередь кадров и задача, которая их отправляет.
+    """
+
+    def __init__(self, websocket: WebSocket, queue_size: int = SUBSCRIBER_QUEUE_SIZE) -> None:
+        self.websocket = websocket
+        self.queue: asyncio.Queue = asyncio.Queue(queue_size)
+        self.task: Optional[asyncio.Task] = None
+
+    def send(self, text: str) -> bool:
+        """
+        Ставит сообщение в очередь на отправку.
+
+        :return: False, если очередь переполнена.
+        """
+        try:
+            self.queue.put_nowait(text)
+        except asyncio.QueueFull:
+            return False
+        return True
+
+
+class GameHub:
+    def __init__(self, queue_size: int = SUBSCRIBER_QUEUE_SIZE) -> None:
+        self.queue_size = queue_size
+        self._channels: Dict[str, Set[Subscriber]] = {}
+        # Задачи закрытия отключённых сокетов: ссылки нужны, чтобы их не собрал сборщик мусора
+        self._closing: Set[asyncio.Task] = set()
+        # Условия долгого опроса и число ждущих на них запросов
+        self._conditions: Dict[str, asyncio.Condition] = {}
+        self._waiting: Dict[str, int] = {}
+
+    def subscribe(self, uuid: str, websocket: WebSocket) -> Subscriber:
+        """
+        Подписывает сокет на сообщения партии uuid и запускает отправку его очереди.
+
+        Вызывается из работающего цикла событий.
+        """
+        subscriber = Subscriber(websocket, self.queue_size)
+        subscriber.task = asyncio.get_running_loop().create_task(self._drain(uuid, subscriber))
+        self._channels.setdefault(uuid, set()).add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, uuid: str, subscriber: Subscriber) -> None:
+        """
+        Отписывает подписчика и останавливает отправку; канал без подписчиков удаляется.
+        """
+        if subscriber.task is not None:
+            subscriber.task.cancel()
+        channel = self._channels.get(uuid)
+        if channel is None:
+            return
+        channel.discard(subscriber)
+        if not channel:
+            del self._channels[uuid]
+
+    def subscribers(self, uuid: str) -> int:
+        """
+        :return: Число подписчиков партии uuid.
+        """
+        return len(self._channels.get(uuid, ()))
+
+    def send(self, uuid: str, subscriber: Subscriber, text: str) -> bool:
+        """
+        Отправляет сообщение одному подписчику (после уже поставленных в его очередь).
+
+        :return: False, если подписчик не успевал читать и был отключён.
+        """
+        if subscriber.send(text):
+            return True
+        self._drop(uuid, subscriber)
+        return False
+
+    def publish(self, uuid: str, frame: Frame) -> int:
+        """
+        Ставит кадр в очередь всем подписчикам партии, не дожидаясь отправки.
+
+        :return: Число подписчиков, которым кадр поставлен в очередь.
+        """
+        delivered = 0
+        for subscriber in list(self._channels.get(uuid, ())):
+            if self.send(uuid, subscriber, frame.text):
+                delivered += 1
+        return delivered
+
+    async def notify(self, uuid: str) -> None:
+        """
+        Будит запросы, ждущие изменения партии в wait_for.
+        """
+        condition = self._conditions.get(uuid)
+        if condition is not None:
+            async with condition:
+                condition.notify_all()
+
+    async def wait_for(self, uuid: str, predicate: Callable[[], bool], timeout: float) -> bool:
+        """
+        Ждёт, пока predicate() не станет истинным; проверяется после каждого notify.
+
+        :param timeout: Наибольшее время ожидания в секундах.
+        :return: Значение predicate() в момент возврата.
+        """
+        condition = self._conditions.setdefault(uuid, asyncio.Condition())
+        self._waiting[uuid] = self._waiting.get(uuid, 0) + 1
+        try:
+            async with condition:
+                await asyncio.wait_for(condition.wait_for(predicate), timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            self._waiting[uuid] -= 1
+            if not self._waiting[uuid]:
+                del self._waiting[uuid]
+                del self._conditions[uuid]
+        return predicate()
+
+    def _drop(self, uuid: str, subscriber: Subscriber) -> None:
+        logger.info("Dropping slow subscriber", extra={'game': uuid})
+        self.unsubscribe(uuid, subscriber)
+        task = asyncio.get_running_loop().create_task(self._close(subscriber.websocket))
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    async def _drain(self, uuid: str, subscriber: Subscriber) -> None:
+        try:
+            while True:
+                text = await subscriber.queue.get()
+                await subscriber.websocket.send_text(text)
+        except asyncio.CancelledError:
+            raise
+        except Exception as error:
+            logger.debug("Dropping subscriber of %s: %r", uuid, error)
+            subscriber.task = None
+            self.unsubscribe(uuid, subscriber)
+
+    @staticmethod
+    async def _close(websocket: WebSocket) -> None:
+        try:
+            await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER, reason="Клиент не успевает читать")
+        except Exception as error:
+            logger.debug("Closing dropped subscriber failed: %r", error)
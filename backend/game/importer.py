@@ -0,0 +1,195 @@
+"""
+Массовый импорт партий из файлов PGN в архивную базу (settings_archive).
+
+Главный процесс только режет поток строк на куски по games_per_chunk партий, не разбирая
+ходы; разбор и проверка ходов (pgn.replay — без ChessGame, вывода и часов) идут в пуле
+процессов. Готовые строки пишутся в базу пачками по batch_size одним executemany.
+В работе одновременно не больше двух кусков на процесс, поэтому память не растёт
+с размером файла.
+
+Запуск из каталога backend:
+    python -m game.importer games.pgn more.pgn --workers 4
+    python -m game.importer games.pgn --workers 0   # в текущем процессе
+"""
+import argparse
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+from sqlalchemy import create_engine, insert
+
+from game.game_creation.ImportedGame import ImportedGames
+from pkgs.config import settings_archive
+from .index_notation import move_to_notation
+from .board import START_FEN
+from .pgn import PgnGame, read_games, replay
+
+# Результат PGN -> код результата в таблице (как в Games)
+RESULT_CODES = {'1-0': 1, '0-1': 2, '1/2-1/2': 3, '*': 0}
+
+
+class RejectedGame(NamedTuple):
+    """
+    Партия, которую не удалось загрузить: файл, номер партии в файле (с 1) и причина.
+    """
+    source: str
+    index: int
+    message: str
+
+
+class ImportReport(NamedTuple):
+    games: int
+    imported: int
+    errors: List[RejectedGame]
+    elapsed: float
+
+    @property
+    def games_per_second(self) -> float:
+        return self.games / self.elapsed if self.elapsed > 0 else 0.0
+
+
+def split_games(lines: Iterable[str], games_per_chunk: int) -> Iterator[Tuple[int, str]]:
+    """
+    Режет строки PGN на куски по games_per_chunk партий, не разбирая ходы.
+
+    Новая партия начинается со строки тега, идущей после текста ходов.
+
+    :return: Итератор (номер первой партии куска с 1, текст куска).
+    """
+    chunk: List[str] = []
+    first = 1
+    count = 0
+    in_moves = False
+    for line in lines:
+        stripped = line.lstrip()
+        if stripped.startswith('['):
+            if in_moves:
+                in_moves = False
+                count += 1
+                if count == games_per_chunk:
+                    yield first, ''.join(chunk)
+                    first += count
+                    chunk, count = [], 0
+        elif stripped:
+            in_moves = True
+        chunk.append(line)
+    if any(line.strip() for line in chunk):
+        yield first, ''.join(chunk)
+
+
+def _row(pgn_game: PgnGame, source: str) -> Dict[str, Any]:
+    board, moves, halfmove_clock, fullmove_number = replay(pgn_game)
+    headers = pgn_game.headers
+    start_fen = headers.get('FEN')
+    return {
+        'event': headers.get('Event'),
+        'site': headers.get('Site'),
+        'date': headers.get('Date'),
+        'white': headers.get('White'),
+        'black': headers.get('Black'),
+        'result': RESULT_CODES.get(pgn_game.result, 0),
+        'start_fen': start_fen if start_fen and start_fen != START_FEN else None,
+        'moves': ' '.join(move_to_notation(move) for move in moves),
+        'ply_count': len(moves),
+        'final_fen': board.fen(halfmove_clock, fullmove_number),
+        'source': source,
+    }
+
+
+def _import_chunk(source: str, first: int, text: str) -> Tuple[List[Dict[str, Any]], List[RejectedGame]]:
+    rows = []
+    errors = []
+    for index, pgn_game in enumerate(read_games(text.splitlines()), start=first):
+        try:
+            rows.append(_row(pgn_game, source))
+        except ValueError as error:
+            errors.append(RejectedGame(source, index, str(error)))
+    return rows, errors
+
+
+def import_pgn(paths: Iterable[Union[str, Path]], database_url: str = settings_archive.DATABASE_NAME,
+               workers: Optional[int] = None, games_per_chunk: int = 200,
+               batch_size: int = 1000) -> ImportReport:
+    """
+    Загружает партии из файлов PGN в таблицу ImportedGames.
+
+    :param workers: Число процессов (по умолчанию os.cpu_count()); 0 — в текущем процессе.
+    :param games_per_chunk: Сколько партий отдаётся процессу за раз.
+    :param batch_size: Сколько строк записывается в базу одним запросом.
+    :return: ImportReport; партии с ошибками в базу не попадают и перечислены в errors.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 0 or games_per_chunk <= 0 or batch_size <= 0:
+        raise ValueError("Import parameters must be positive")
+    engine = create_engine(database_url)
+    ImportedGames.metadata.create_all(engine, tables=[ImportedGames.__table__])
+
+    started = time.perf_counter()
+    pending: List[Dict[str, Any]] = []
+    errors: List[RejectedGame] = []
+    imported = 0
+
+    def flush() -> None:
+        nonlocal imported
+        if pending:
+            with engine.begin() as connection:
+                connection.execute(insert(ImportedGames), pending)
+            imported += len(pending)
+            pending.clear()
+
+    def collect(rows: List[Dict[str, Any]], chunk_errors: List[RejectedGame]) -> None:
+        pending.extend(rows)
+        errors.extend(chunk_errors)
+        if len(pending) >= batch_size:
+            flush()
+
+    try:
+        if workers == 0:
+            for path in paths:
+                with open(path, encoding='utf-8', errors='replace') as file:
+                    for first, text in split_games(file, games_per_chunk):
+                        collect(*_import_chunk(Path(path).name, first, text))
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                in_flight: Deque[Future] = deque()
+                for path in paths:
+                    with open(path, encoding='utf-8', errors='replace') as file:
+                        for first, text in split_games(file, games_per_chunk):
+                            in_flight.append(executor.submit(_import_chunk, Path(path).name, first, text))
+                            if len(in_flight) >= 2 * workers:
+                                collect(*in_flight.popleft().result())
+                while in_flight:
+                    collect(*in_flight.popleft().result())
+        flush()
+    finally:
+        engine.dispose()
+
+    elapsed = time.perf_counter() - started
+    return ImportReport(imported + len(errors), imported, errors, elapsed)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Импорт партий из PGN в архивную базу")
+    parser.add_argument('pgn', nargs='+', help="Файлы PGN")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help="Число процессов (0 — в текущем процессе)")
+    parser.add_argument('--chunk', type=int, default=200, help="Партий в одном задании процесса")
+    parser.add_argument('--batch', type=int, default=1000, help="Строк в одном запросе к базе")
+    parser.add_argument('--db', default=settings_archive.DATABASE_NAME, help="URL базы SQLAlchemy")
+    args = parser.parse_args(argv)
+
+    report = import_pgn(args.pgn, args.db, args.workers, args.chunk, args.batch)
+    for error in report.errors:
+        print(f"{error.source} #{error.index}: {error.message}", file=sys.stderr)
+    print(f"{report.imported} of {report.games} games imported, {len(report.errors)} rejected "
+          f"in {report.elapsed:.2f}s ({report.games_per_second:,.0f} games/s, {args.workers} workers)")
+    return 0 if not report.errors else 1
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -1,4 +1,4 @@
-from typing import Tuple
+from typing import Optional, Tuple
 
 
 def index_to_notation(row: int, col: int) -> str:
@@ -35,3 +35,17 @@ def notation_to_index(notation: str) -> Tuple[int, int]:
             raise ValueError("Ход выходит за пределы доски.")
 
         return row, col
+
+
+def move_to_notation(move: Tuple[Tuple[int, int], Tuple[int, int], Optional[str]]) -> str:
+    """
+    Преобразует ход в координатную запись.
+
+    :param move: Ход в формате ((from_row, from_col), (to_row, to_col), promotion_piece)
+    :return: Строка вида 'e2e4' или 'e7e8q' при превращении
+    """
+    (from_row, from_col), (to_row, to_col), promotion = move
+    notation = index_to_notation(from_row, from_col) + index_to_notation(to_row, to_col)
+    if promotion:
+        notation += promotion.lower()
+    return notation
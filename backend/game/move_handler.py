@@ -1,29 +1,301 @@
 from hmac import new
-from fastapi import APIRouter, HTTPException, Depends
-from typing import Any, Dict, List
+import asyncio
+import json
+import logging
+from fastapi import APIRouter, HTTPException, Depends, Header, Query, WebSocket, WebSocketDisconnect, status
+from fastapi.responses import PlainTextResponse, Response
+from typing import Any, Awaitable, Callable, Coroutine, Dict, List, Literal, Optional, Set, Tuple, TypeVar
 from sqlalchemy.ext.asyncio import AsyncSession
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, model_validator
 from uuid import UUID, uuid4
 from api_v1.user.views import get_current_user_id
 from api_v1.user.crud import get_user_by_id
 from dbpackage.DBHelper import db_helper_game, db_helper_user
 from game.game_creation.crud import create_game, get_all_games, get_game, update_game
 from game.chess_game import ChessGame
+from game.book import OpeningBook
+from game.engine import Engine, SearchResult
+from game.executor import BoundedExecutor
+from game.hub import Frame, GameHub
+from game.index_notation import index_to_notation, move_to_notation
+from game.pgn import game_to_pgn
+from pkgs.config import settings_engine
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+T = TypeVar('T')
+
 # Хранилище активных игр
 active_games: Dict[str, ChessGame] = {}
+# Подписчики WebSocket по uuid партии
+hub = GameHub()
+# Последние сериализованные кадры каждой партии: полное состояние и обновление (см. state_update)
+state_frames: Dict[str, Frame] = {}
+update_frames: Dict[str, Frame] = {}
+# Ходы одной партии выполняются по очереди, разных партий — параллельно в executor.
+# Под блокировкой партию меняют и читают её состояние для ответа или рассылки.
+game_locks: Dict[str, asyncio.Lock] = {}
+# Потоки для ходов и поиска движка: цикл событий не ждёт их (см. game/executor.py)
+executor = BoundedExecutor(settings_engine.WORKERS)
+# Ходы, которые доводятся до конца и после отмены запроса (см. detached)
+pending_turns: Set[asyncio.Task] = set()
+
+# Наибольшее время на ход движка в секундах: один ход не должен занимать бэкенд надолго
+ENGINE_MAX_TIME = 5.0
+# Наибольшее число узлов на ход движка
+ENGINE_NODE_LIMIT = 200_000
+# Время на поиск подсказки в секундах
+HINT_TIME = 0.5
+# Наибольшее время долгого опроса GET /{uuid}/?wait= в секундах
+MAX_WAIT = 30.0
+
+# Книга открывается через mmap один раз на процесс и общая для всех партий
+opening_book = OpeningBook(settings_engine.OPENING_BOOK)
+# Движок подсказок общий, поэтому подсказки ищутся по одной (hint_lock)
+hint_engine = Engine(time_limit=HINT_TIME, node_limit=ENGINE_NODE_LIMIT, book=opening_book)
+hint_lock = asyncio.Lock()
 
 class Move(BaseModel):
     start: str  # Начальная позиция, например "e2"
     end: str  # Конечная позиция, например "e4"
+    promotion: Optional[str] = None  # Фигура превращения: "Q", "R", "B" или "N" (по умолчанию ферзь)
+    version: Optional[int] = None  # Версия позиции у клиента: тогда ответ — обновление (см. state_update)
 
 class GameSetup(BaseModel):
     game_time: int  # Время на партию в минутах
     increment: int  # Инкремент в секундах
     white: bool
     black: bool
+    engine: Optional[Literal["white", "black"]] = None  # Сторона, за которую играет компьютер
+    engine_time: float = Field(default=1.0, gt=0, le=ENGINE_MAX_TIME)  # Время на ход компьютера в секундах
+
+    @model_validator(mode='after')
+    def engine_side_is_free(self) -> 'GameSetup':
+        """
+        Компьютер не может играть за сторону, которую занял игрок: иначе за неё ходили бы оба.
+        """
+        if self.engine is not None and getattr(self, self.engine):
+            raise ValueError(f"Сторона {self.engine} уже занята игроком и не может быть отдана компьютеру")
+        return self
+
+
+def board_state(game: ChessGame) -> List[List[str]]:
+    return [
+        [piece.name() if piece else '\u00A0' for piece in row]
+        for row in game.board.board
+    ]
+
+
+def game_state(uuid: str, game: ChessGame) -> Dict[str, Any]:
+    """
+    Состояние партии, которое отдаёт GET /{uuid}/ и рассылает канал /{uuid}/ws.
+    """
+    return {
+        "type": "state",
+        "uuid": uuid,
+        "version": game.version,
+        "board": board_state(game),
+        "fen": game.fen(),
+        "current_turn": game.current_player_color,
+        "white": game.white,
+        "black": game.black,
+        "white_timer": game.white_timer,
+        "black_timer": game.black_timer,
+        "result": game.result,
+        "last_move": move_to_notation(game.moves[-1]) if game.moves else None,
+    }
+
+
+def state_update(game: ChessGame, since: int) -> Dict[str, Any]:
+    """
+    Обновление для клиента, у которого позиция версии since.
+
+    Тип обновления:
+        unchanged — позиция не изменилась (могли смениться игроки);
+        delta — сделанные ходы и изменённые клетки ["e4", "♙"] (null — клетка опустела);
+        snapshot — позиция целиком в FEN, если since неизвестна или старше истории ходов.
+    """
+    update = {
+        "version": game.version,
+        "current_turn": game.current_player_color,
+        "result": game.result,
+        "white": game.white,
+        "black": game.black,
+    }
+    deltas = game.changes_since(since)
+    if deltas is None:
+        return {"type": "snapshot", **update, "fen": game.fen()}
+    if not deltas:
+        return {"type": "unchanged", **update}
+    changes: Dict[tuple, Optional[str]] = {}
+    for delta in deltas:
+        changes.update(delta.changes)
+    return {
+        "type": "delta",
+        "from": since,
+        **update,
+        "moves": [
+            {
+                "from": index_to_notation(*delta.move[0]),
+                "to": index_to_notation(*delta.move[1]),
+                "promotion": delta.move[2],
+                "rook": [index_to_notation(*square) for square in delta.rook] if delta.rook else None,
+            }
+            for delta in deltas
+        ],
+        "changes": [[index_to_notation(*square), piece] for square, piece in changes.items()],
+    }
+
+
+def _cached_frame(frames: Dict[str, Frame], uuid: str, key: tuple,
+                  build: Callable[[], Dict[str, Any]]) -> Frame:
+    frame = frames.get(uuid)
+    if frame is None or frame.key != key:
+        frame = Frame.encode(key, build())
+        frames[uuid] = frame
+    return frame
+
+
+def state_frame(uuid: str, game: ChessGame) -> Frame:
+    """
+    Кадр состояния партии; строится заново, только если изменилась позиция или игроки.
+    """
+    return _cached_frame(state_frames, uuid, (game.version, game.white, game.black),
+                         lambda: game_state(uuid, game))
+
+
+def update_frame(uuid: str, game: ChessGame, since: int) -> Frame:
+    """
+    Кадр обновления с версии since; общий для всех клиентов с этой версией.
+    """
+    return _cached_frame(update_frames, uuid, (since, game.version, game.white, game.black),
+                         lambda: state_update(game, since))
+
+
+def reply_frame(uuid: str, game: ChessGame, since: Optional[int]) -> Frame:
+    return state_frame(uuid, game) if since is None else update_frame(uuid, game, since)
+
+
+def json_response(body: bytes, headers: Optional[Dict[str, str]] = None) -> Response:
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def state_etag(version: int, game: ChessGame) -> str:
+    """
+    ETag состояния партии: меняется с версией позиции и с составом игроков.
+    """
+    return f'"{version}-{game.white}-{game.black}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if if_none_match is None:
+        return False
+    tags = [tag.strip().removeprefix('W/') for tag in if_none_match.split(',')]
+    return '*' in tags or etag in tags
+
+
+def error_message(message: str) -> str:
+    return json.dumps({"type": "error", "message": message}, ensure_ascii=False)
+
+
+def can_move(game: ChessGame, user: Optional[int]) -> bool:
+    """
+    Проверяет, что user — игрок той стороны, чей сейчас ход.
+    """
+    if user is None:
+        return False
+    if game.current_player_color == "white":
+        return user == game.white
+    return user == game.black
+
+
+def game_lock(uuid: str) -> asyncio.Lock:
+    return game_locks.setdefault(uuid, asyncio.Lock())
+
+
+async def publish_update(uuid: str, game: ChessGame, since: int) -> None:
+    """
+    Рассылает подписчикам обновление с версии since и будит долгие опросы.
+
+    Вызывается под game_lock(uuid) вместе с ходом: новый подписчик получает состояние
+    тоже под блокировкой, поэтому все подписчики видели именно версию since.
+    """
+    hub.publish(uuid, update_frame(uuid, game, since))
+    await hub.notify(uuid)
+
+
+def _finish_turn(task: asyncio.Task) -> None:
+    pending_turns.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.error("Turn failed", exc_info=task.exception())
+
+
+def detached(coroutine: Coroutine[Any, Any, T]) -> Awaitable[T]:
+    """
+    Запускает coroutine отдельной задачей и возвращает ожидание её результата.
+
+    Отмена ожидающего (клиент отключился, истёк таймаут) не прерывает задачу: ход,
+    который уже выполняется в потоке executor, доводится до конца и рассылается,
+    пока задача держит game_lock, а движок всё равно отвечает на сделанный ход.
+    """
+    task = asyncio.ensure_future(coroutine)
+    pending_turns.add(task)
+    task.add_done_callback(_finish_turn)
+    return asyncio.shield(task)
+
+
+async def play_move(uuid: str, game: ChessGame, move: 'Move', user: Optional[int]) -> Optional[bool]:
+    """
+    Делает ход игрока user под game_lock(uuid) в потоке executor и рассылает обновление.
+
+    :return: None, если сейчас не ход user; False, если ход невозможен.
+    """
+    async with game_lock(uuid):
+        if not can_move(game, user):
+            return None
+        before = game.version
+        if not await executor.run(game.move, move.start, move.end, move.promotion):
+            return False
+        await publish_update(uuid, game, before)
+        return True
+
+
+async def play_turn(uuid: str, game: ChessGame, move: 'Move',
+                    user: Optional[int]) -> Tuple[Optional[bool], Optional[str]]:
+    """
+    Ход игрока и, если он сделан, ответ движка. Обработчики запускают его через detached.
+
+    :return: Результат play_move и ход движка в координатной записи (или None).
+    """
+    moved = await play_move(uuid, game, move, user)
+    return moved, await engine_reply(uuid, game) if moved else None
+
+
+async def engine_reply(uuid: str, game: ChessGame) -> Optional[str]:
+    """
+    Отвечает ходом движка, если сейчас его очередь, и рассылает обновление.
+
+    Поиск идёт в потоке executor на копии доски без блокировки партии: пока движок
+    думает, партию можно читать. Найденный ход делается, только если позиция с тех пор
+    не изменилась.
+
+    :return: Ход движка в координатной записи или None.
+    """
+    async with game_lock(uuid):
+        if not game.is_engine_turn:
+            return None
+        version = game.version
+        board, history = game.board.copy(), dict(game.repetitions)
+    found: SearchResult = await executor.run(game.engine.search, board, history)
+    async with game_lock(uuid):
+        if game.version != version:
+            return None
+        notation = await executor.run(game.play_engine_move, found.move)
+        if notation is not None:
+            await publish_update(uuid, game, version)
+        return notation
 
 
 @router.post("/setup")
@@ -41,15 +313,20 @@ async def setup_game(settings: GameSetup,
         game.white = curr_user
     if settings.black:
         game.black = curr_user
+    if settings.engine is not None:
+        game.set_engine(settings.engine, Engine(time_limit=settings.engine_time, node_limit=ENGINE_NODE_LIMIT,
+                                                book=opening_book))
 
     game.start_game()  # Инициализация игры
     active_games[uuid] = game
+    await detached(engine_reply(uuid, game))  # Если компьютер играет белыми, он ходит первым
     await create_game(session, game, uuid)
     return {
         "message": "Игра настроена",
         "uuid": uuid,
         "game_time": settings.game_time,
         "increment": settings.increment,
+        "engine": settings.engine,
     }
     # except Exception as e:
     #     print(str(e))
@@ -60,86 +337,168 @@ async def setup_game(settings: GameSetup,
 async def make_move(uuid: str, move: Move, 
                     session: AsyncSession = Depends(db_helper_game.scoped_session_dependency),
                     curr_user: int = Depends(get_current_user_id)
-                    ) -> Dict[str, Any]:
+                    ) -> Response:
     """
     Обрабатывает ход в игре.
+
+    Ответ — состояние партии (как GET /{uuid}/) или, если в запросе есть version,
+    обновление с этой версии (см. state_update); к нему добавляются message и engine_move.
     """
     game = active_games.get(uuid)
     if game is None:
         raise HTTPException(status_code=404, detail="Игра не найдена")
 
     try:
-        if curr_user != game.white and curr_user != game.black or \
-            curr_user != game.white and game.current_player_color == "white" or \
-                curr_user != game.black and game.current_player_color == "black":
-            return {
-            "message":f"Вам сейчас нельзя ходить!, ваш id: {curr_user}, белые: {game.white}, черные:",
-            "board": game.board.pretty_board(),
-            "current_turn": game.current_player_color,
-            "result": game.result,
-        }
-        game.move(move.start, move.end)
-        board_state: List[List[str]] = [
-            # [piece.name() if piece else '\uA900' for piece in row]
-            [piece.name() if piece else '\u00A0' for piece in row]
-            for row in game.board.board
-        ]
-        active_games[uuid] = game
-        return {
-            "message": "Ход выполнен успешно!",
-            "board": board_state,
-            "current_turn": game.current_player_color,
-            "result": game.result,
-        }
+        moved, reply = await detached(play_turn(uuid, game, move, curr_user))
+        async with game_lock(uuid):
+            frame = reply_frame(uuid, game, move.version)
+            if moved is None:
+                message = f"Вам сейчас нельзя ходить!, ваш id: {curr_user}, белые: {game.white}, черные: {game.black}"
+                return json_response(frame.extend(message=message))
+        return json_response(frame.extend(message="Ход выполнен успешно!", engine_move=reply))
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Ошибка при обработке хода: {str(e)}")
 
 @router.get("/{uuid}/")
-async def get_game_state(uuid: str) -> Dict[str, Any]:
+async def get_game_state(uuid: str, since: Optional[int] = None,
+                         wait: float = Query(default=0, ge=0, le=MAX_WAIT),
+                         if_none_match: Optional[str] = Header(default=None)) -> Response:
     """
     Возвращает текущее состояние доски и информацию об игре.
+
+    С параметром since (версия позиции у клиента) возвращает обновление с этой версии
+    (см. state_update) вместо всей доски. Ответ несёт ETag; если он совпадает
+    с If-None-Match, возвращается 304 без тела.
+
+    С параметром wait (секунды) запрос, у которого уже есть текущее состояние
+    (If-None-Match или since), ждёт изменения партии не дольше wait.
     """
     game = active_games.get(uuid)
     if not game:
         raise HTTPException(status_code=404, detail="Игра не найдена")
 
-    board_state: List[List[str]] = [
-        [piece.name() if piece else '\u00A0' for piece in row]
-        for row in game.board.board
-    ]
+    # Без If-None-Match считаем, что клиент с версией since знает нынешних игроков
+    since_etag = state_etag(since, game) if since is not None else None
+
+    def client_is_current() -> bool:
+        etag = state_etag(game.version, game)
+        if if_none_match is not None:
+            return etag_matches(if_none_match, etag)
+        return etag == since_etag
 
+    if wait and client_is_current():
+        await hub.wait_for(uuid, lambda: not client_is_current(), wait)
+
+    async with game_lock(uuid):
+        headers = {"ETag": state_etag(game.version, game), "Cache-Control": "no-cache"}
+        if etag_matches(if_none_match, headers["ETag"]):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        return json_response(reply_frame(uuid, game, since).body, headers)
+
+
+@router.websocket("/{uuid}/ws")
+async def game_socket(websocket: WebSocket, uuid: str, token: Optional[str] = None,
+                      since: Optional[int] = None) -> None:
+    """
+    Канал партии: сразу после подключения присылает {"type": "state", ...} с тем же
+    состоянием, что GET /{uuid}/, а после каждого хода — обновление с предыдущей
+    версии (см. state_update). Клиент, который переподключается, передаёт в since
+    версию своей позиции и вместо всего состояния получает обновление с неё.
+
+    Игрок передаёт токен в параметре token (браузер не задаёт заголовок Authorization
+    для WebSocket) и ходит сообщением {"type": "move", "start": "e2", "end": "e4"};
+    подключение без токена — зритель. Ошибки хода приходят только отправителю
+    как {"type": "error", "message": ...}.
+    """
+    game = active_games.get(uuid)
+    if game is None:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason="Игра не найдена")
+        return
+    user = None
+    if token is not None:
+        try:
+            user = await get_current_user_id(token)
+        except HTTPException as error:
+            await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason=str(error.detail))
+            return
+
+    await websocket.accept()
+    async with game_lock(uuid):
+        subscriber = hub.subscribe(uuid, websocket)
+        hub.send(uuid, subscriber, reply_frame(uuid, game, since).text)
+    try:
+        while True:
+            try:
+                message = await websocket.receive_json()
+                if not isinstance(message, dict) or message.get("type") != "move":
+                    raise ValueError("Ожидается сообщение {\"type\": \"move\", ...}")
+                move = Move(**message)
+            except ValueError as error:  # в том числе неверный JSON и ValidationError
+                hub.send(uuid, subscriber, error_message(str(error)))
+                continue
+            moved, _ = await detached(play_turn(uuid, game, move, user))
+            if moved is None:
+                hub.send(uuid, subscriber, error_message("Вам сейчас нельзя ходить!"))
+            elif not moved:
+                hub.send(uuid, subscriber, error_message("Невозможный ход"))
+    except WebSocketDisconnect:
+        pass
+    finally:
+        hub.unsubscribe(uuid, subscriber)
+
+@router.get("/{uuid}/hint")
+async def get_hint(uuid: str) -> Dict[str, Any]:
+    """
+    Подсказывает ход стороне, которая сейчас ходит.
+    """
+    game = active_games.get(uuid)
+    if not game:
+        raise HTTPException(status_code=404, detail="Игра не найдена")
+
+    async with game_lock(uuid):
+        current_turn = game.current_player_color
+        finished = game.result is not None
+        board, history = game.board.copy(), dict(game.repetitions)
+    suggestion = None
+    if not finished:
+        async with hint_lock:
+            found: SearchResult = await executor.run(hint_engine.search, board, history)
+        if found.move is not None:
+            suggestion = move_to_notation(found.move)
     return {
         "uuid": uuid,
-        "board": board_state,
-        "current_turn": game.current_player_color,
-        "white_timer": game.white_timer,
-        "black_timer": game.black_timer,
-        "result": game.result,
+        "current_turn": current_turn,
+        "move": suggestion,
     }
 
+@router.get("/{uuid}/pgn", response_class=PlainTextResponse)
+async def get_game_pgn(uuid: str) -> str:
+    """
+    Возвращает партию в формате PGN.
+    """
+    game = active_games.get(uuid)
+    if not game:
+        raise HTTPException(status_code=404, detail="Игра не найдена")
+
+    async with game_lock(uuid):
+        return game_to_pgn(game, {"Event": "Higher School of Chess", "Site": uuid})
+
 @router.post("/{uuid}/connect")
 async def connect_to_game(uuid: str, session: AsyncSession = Depends(db_helper_game.scoped_session_dependency),
                           new_player: int = Depends(get_current_user_id)):
     game = active_games[uuid]   
 
-    if game.white is None:
-        game.white = new_player
-        await update_game(session, uuid, {"white": game.white})
-
-    if game.black is None:
-        game.black = new_player
-        await update_game(session, uuid, {"black": game.black})
+    async with game_lock(uuid):
+        if game.white is None and game.engine_color != "white":
+            game.white = new_player
+            await update_game(session, uuid, {"white": game.white})
 
-    active_games[uuid] = game
+        if game.black is None and game.engine_color != "black":
+            game.black = new_player
+            await update_game(session, uuid, {"black": game.black})
 
-    return {
-        "uuid": uuid,
-        "board": game.board.pretty_board(),
-        "current_turn": game.current_player_color,
-        "white_timer": game.white_timer,
-        "black_timer": game.black_timer,
-        "result": game.result,
-    }
+        await publish_update(uuid, game, game.version)
+        return json_response(state_frame(uuid, game).body)
 
 @router.get("/active-games")
 async def get_active_games(db: AsyncSession = Depends(db_helper_game.scoped_session_dependency)) -> List[Dict[str, Any]]:
@@ -167,6 +526,9 @@ async def delete_game(uuid: str, db: AsyncSession = Depends(db_helper_game.scope
     """
     if uuid in active_games:
         del active_games[uuid]
+    state_frames.pop(uuid, None)
+    update_frames.pop(uuid, None)
+    game_locks.pop(uuid, None)
 
     deleted = await delete_game(db, game_uuid=uuid)
     if not deleted:
@@ -0,0 +1,196 @@
+"""
+Генератор легальных ходов.
+
+Для стороны, которая ходит, один раз вычисляются шахующие фигуры, связки
+и маска допустимых клеток при шахе, после чего ходы всех фигур строятся
+за один проход без пробного выполнения хода.
+"""
+from typing import Dict, List, Optional, Tuple
+
+from .bitboard import (
+    COLOR_INDEX, BISHOP, KING, KNIGHT, PAWN, QUEEN, ROOK, FULL,
+    BISHOP_DIRECTIONS, ROOK_DIRECTIONS, KING_ATTACKS, KNIGHT_ATTACKS, PAWN_ATTACKS, RAYS,
+    bishop_attacks, iter_squares, queen_attacks, rook_attacks, square_coords,
+)
+from .board import PROMOTION_PIECES, Board
+from .pieces.rook import Rook
+
+# Ход: ((from_row, from_col), (to_row, to_col), promotion_piece)
+Move = Tuple[Tuple[int, int], Tuple[int, int], Optional[str]]
+
+PROMOTIONS = tuple(PROMOTION_PIECES)
+COORDS = [square_coords(square) for square in range(64)]
+
+
+def _first_blocker(mask: int, direction: Tuple[int, int]) -> int:
+    if direction[0] * 8 + direction[1] > 0:
+        return (mask & -mask).bit_length() - 1
+    return mask.bit_length() - 1
+
+
+def _pins(board: Board, king: int, color: int, occupied: int) -> Dict[int, int]:
+    """
+    Возвращает связанные фигуры: клетка фигуры -> маска клеток, по которым ей можно ходить.
+    """
+    own = board.occupancy[color]
+    base = (color ^ 1) * 6
+    queens = board.bitboards[base + QUEEN]
+    pins = {}
+    for directions, sliders in ((ROOK_DIRECTIONS, board.bitboards[base + ROOK] | queens),
+                                (BISHOP_DIRECTIONS, board.bitboards[base + BISHOP] | queens)):
+        if not sliders:
+            continue
+        for direction in directions:
+            ray = RAYS[direction][king]
+            blockers = ray & occupied
+            if not blockers:
+                continue
+            first = _first_blocker(blockers, direction)
+            if not own >> first & 1:
+                continue
+            behind = RAYS[direction][first] & occupied
+            if not behind:
+                continue
+            second = _first_blocker(behind, direction)
+            if sliders >> second & 1:
+                pins[first] = ray ^ RAYS[direction][second]
+    return pins
+
+
+def _between(king: int, checker: int) -> int:
+    """
+    Клетки между королём и шахующей фигурой, включая саму фигуру.
+    """
+    for direction, rays in RAYS.items():
+        if rays[king] >> checker & 1:
+            return rays[king] ^ RAYS[direction][checker]
+    return 1 << checker
+
+
+def _en_passant_square(board: Board, color: int) -> Optional[int]:
+    if board.en_passant is None:
+        return None
+    row, col = board.en_passant
+    # Белые бьют на проходе на 6-ю горизонталь (строка 2), чёрные — на 3-ю (строка 5)
+    if row != (2 if color == 0 else 5):
+        return None
+    return row * 8 + col
+
+
+def generate_legal_moves(board: Board, color: str) -> List[Move]:
+    """
+    Возвращает все легальные ходы стороны color.
+
+    Превращение пешки выдаётся четырьмя ходами с 'Q', 'R', 'B' и 'N'.
+
+    :param board: Доска с актуальными битовыми масками.
+    :param color: 'white' или 'black'
+    :return: Список ходов в формате ((from_row, from_col), (to_row, to_col), promotion).
+    """
+    us = COLOR_INDEX[color]
+    them = us ^ 1
+    bitboards = board.bitboards
+    own = board.occupancy[us]
+    enemy = board.occupancy[them]
+    occupied = own | enemy
+    moves: List[Move] = []
+
+    king_mask = bitboards[us * 6 + KING]
+    if not king_mask:
+        return moves
+    king = king_mask.bit_length() - 1
+    king_coords = COORDS[king]
+
+    # Ходы короля: клетка не должна быть под боем, даже если король уйдёт с линии атаки
+    without_king = occupied ^ king_mask
+    for target in iter_squares(KING_ATTACKS[king] & ~own):
+        if not board.square_attacked(target, them, without_king):
+            moves.append((king_coords, COORDS[target], None))
+
+    checkers = board.attackers_mask(king, them, occupied)
+    if checkers & (checkers - 1):
+        # Двойной шах: ходить может только король
+        return moves
+    if checkers:
+        evasion = _between(king, checkers.bit_length() - 1)
+    else:
+        evasion = FULL
+        moves.extend(castling_moves(board, color, king_coords, occupied))
+
+    pins = _pins(board, king, us, occupied)
+    base = us * 6
+
+    for kind, attacks in ((KNIGHT, None), (BISHOP, bishop_attacks), (ROOK, rook_attacks), (QUEEN, queen_attacks)):
+        for square in iter_squares(bitboards[base + kind]):
+            if attacks is None:
+                targets = KNIGHT_ATTACKS[square]
+            else:
+                targets = attacks(square, occupied)
+            targets &= ~own & evasion
+            if square in pins:
+                targets &= pins[square]
+            from_coords = COORDS[square]
+            for target in iter_squares(targets):
+                moves.append((from_coords, COORDS[target], None))
+
+    step = -8 if us == 0 else 8
+    start_row = 6 if us == 0 else 1
+    last_row = 0 if us == 0 else 7
+    en_passant = _en_passant_square(board, us)
+    for square in iter_squares(bitboards[base + PAWN]):
+        targets = PAWN_ATTACKS[us][square] & enemy
+        one = square + step
+        if 0 <= one < 64 and not occupied >> one & 1:
+            targets |= 1 << one
+            two = one + step
+            if square >> 3 == start_row and not occupied >> two & 1:
+                targets |= 1 << two
+        targets &= evasion
+        if square in pins:
+            targets &= pins[square]
+        from_coords = COORDS[square]
+        for target in iter_squares(targets):
+            to_coords = COORDS[target]
+            if to_coords[0] == last_row:
+                for promotion in PROMOTIONS:
+                    moves.append((from_coords, to_coords, promotion))
+            else:
+                moves.append((from_coords, to_coords, None))
+
+        if en_passant is not None and PAWN_ATTACKS[us][square] >> en_passant & 1:
+            # Взятие на проходе снимает с горизонтали сразу две пешки, поэтому
+            # проверяем короля по итоговой занятости, не доверяя маскам связок
+            captured = en_passant - step
+            after = (occupied ^ (1 << square) ^ (1 << captured)) | (1 << en_passant)
+            if not board.attackers_mask(king, them, after) & ~(1 << captured):
+                moves.append((from_coords, COORDS[en_passant], None))
+
+    return moves
+
+
+def castling_moves(board: Board, color: str, king_coords: Tuple[int, int], occupied: int) -> List[Move]:
+    """
+    Рокировки короля на клетке king_coords: король и ладья не ходили, путь свободен,
+    клетки, через которые проходит король, не под боем.
+
+    Шах королю не проверяется — вызывающий код делает это сам (Board.pseudo_legal_moves
+    и generate_legal_moves знают о нём заранее).
+    """
+    row, col = king_coords
+    king = board[row, col]
+    if getattr(king, 'has_moved', True):
+        return []
+    them = COLOR_INDEX[color] ^ 1
+    moves = []
+    for rook_col, king_col, path_cols in ((7, col + 2, range(col + 1, 7)),
+                                          (0, col - 2, range(1, col))):
+        rook = board[row, rook_col]
+        if not isinstance(rook, Rook) or rook.color != color or rook.has_moved:
+            continue
+        if any(occupied >> (row * 8 + c) & 1 for c in path_cols):
+            continue
+        step = 1 if king_col > col else -1
+        if any(board.square_attacked(row * 8 + c, them, occupied) for c in range(col + step, king_col + step, step)):
+            continue
+        moves.append((king_coords, (row, king_col), None))
+    return moves
@@ -0,0 +1,143 @@
+"""
+Параллельный поиск в стиле lazy SMP.
+
+Несколько процессов ищут из одной и той же корневой позиции и обмениваются
+результатами только через общую таблицу транспозиций (shared_tt.py).
+Вспомогательные процессы начинают итеративное углубление с разных глубин,
+чтобы не повторять работу друг друга. Ход выбирается из результата с наибольшей
+завершённой глубиной; при равенстве предпочитается основной процесс.
+
+Лимит узлов действует на каждый процесс отдельно. С одним процессом поиск идёт
+в вызывающем процессе и повторяет Engine.search: при ограничении по глубине или
+узлам результат детерминирован.
+
+Запуск из каталога backend:
+    python -m game.parallel_search --workers 4 --time 5
+    python -m game.parallel_search --fen "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1"
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+
+from .board import START_FEN, Board
+from .book import OpeningBook
+from .codec import pack_position, unpack_position
+from .engine import Engine, SearchResult, evaluate
+from .index_notation import move_to_notation
+from .shared_tt import SharedTranspositionTable
+
+# Движок процесса-исполнителя; создаётся один раз при запуске процесса
+_worker_engine: Optional[Engine] = None
+
+
+def _init_worker(tt_name: str, tt_size: int) -> None:
+    global _worker_engine
+    _worker_engine = Engine(tt=SharedTranspositionTable.attach(tt_name, tt_size))
+
+
+def _worker_search(packed: bytes, history: Dict[int, int], start_depth: int, max_depth: int,
+                   time_limit: float, node_limit: int) -> SearchResult:
+    engine = _worker_engine
+    engine.max_depth = max_depth
+    engine.time_limit = time_limit
+    engine.node_limit = node_limit
+    board, _, _ = unpack_position(packed)
+    return engine.search(board, history, start_depth)
+
+
+class ParallelEngine:
+    """
+    Поиск несколькими процессами с общей таблицей транспозиций.
+
+    Процессы и разделяемая память живут, пока не вызван close() (или до выхода из with).
+    """
+
+    def __init__(self, workers: Optional[int] = None, max_depth: int = 32, time_limit: float = 1.0,
+                 node_limit: int = 200_000, tt_size: int = 1 << 18, book: Optional[OpeningBook] = None) -> None:
+        """
+        :param workers: Число процессов поиска (по умолчанию os.cpu_count()).
+        :param max_depth: Наибольшая глубина итеративного углубления.
+        :param time_limit: Время на ход в секундах.
+        :param node_limit: Наибольшее число узлов на ход для каждого процесса.
+        :param tt_size: Число ячеек общей таблицы транспозиций.
+        :param book: Дебютная книга; ход из неё возвращается без запуска процессов.
+        """
+        self.workers = workers or os.cpu_count() or 1
+        if self.workers <= 0:
+            raise ValueError("Number of workers must be positive")
+        self.tt = SharedTranspositionTable(tt_size)
+        self.tt_size = tt_size
+        # Основной процесс тоже ищет и пишет в ту же таблицу
+        self.engine = Engine(max_depth, time_limit, node_limit, tt=self.tt, book=book)
+        self._pool: Optional[ProcessPoolExecutor] = None
+        if self.workers > 1:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers - 1, initializer=_init_worker,
+                                             initargs=(self.tt.name, tt_size))
+
+    def __enter__(self) -> 'ParallelEngine':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+        self.tt.close()
+
+    def search(self, board: Board, history: Optional[Dict[int, int]] = None) -> SearchResult:
+        """
+        Ищет лучший ход для стороны board.side_to_move (см. Engine.search).
+
+        :return: Результат процесса с наибольшей завершённой глубиной; nodes — сумма по всем процессам.
+        """
+        engine = self.engine
+        book_move = engine.book_move(board)
+        if book_move is not None:
+            return SearchResult(book_move, evaluate(board), 0, 0, 0.0)
+        # Одно новое поколение на ход, до запуска процессов: иначе их первые записи сразу устаревают
+        self.tt.new_search()
+        futures = []
+        if self._pool is not None:
+            packed = pack_position(board)
+            for index in range(1, self.workers):
+                futures.append(self._pool.submit(_worker_search, packed, history or {}, 1 + index % 2,
+                                                 engine.max_depth, engine.time_limit, engine.node_limit))
+        results = [engine._iterate(board, history)]
+        results.extend(future.result() for future in futures)
+
+        best = results[0]
+        for result in results[1:]:
+            if result.move is not None and result.depth > best.depth:
+                best = result
+        return best._replace(nodes=sum(result.nodes for result in results),
+                             elapsed=max(result.elapsed for result in results))
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Параллельный поиск лучшего хода")
+    parser.add_argument('--fen', default=START_FEN, help="Позиция в FEN")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help="Число процессов")
+    parser.add_argument('--time', type=float, default=1.0, help="Время на ход в секундах")
+    parser.add_argument('--nodes', type=int, default=10_000_000, help="Лимит узлов на процесс")
+    parser.add_argument('--depth', type=int, default=32, help="Наибольшая глубина")
+    args = parser.parse_args(argv)
+
+    board = Board()
+    board.load_fen(args.fen)
+    with ParallelEngine(args.workers, args.depth, args.time, args.nodes) as engine:
+        started = time.perf_counter()
+        result = engine.search(board)
+        elapsed = time.perf_counter() - started
+    move = move_to_notation(result.move) if result.move is not None else '-'
+    nps = result.nodes / elapsed if elapsed > 0 else float('inf')
+    print(f"bestmove {move} score {result.score} depth {result.depth} nodes {result.nodes} "
+          f"time {elapsed:.3f}s ({nps:,.0f} nodes/s, {args.workers} workers)")
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
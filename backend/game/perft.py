@@ -0,0 +1,230 @@
+"""
+Perft: подсчёт листьев дерева легальных ходов до заданной глубины.
+
+Используется для проверки генератора ходов (сравнение с опубликованными
+значениями) и для замера его скорости между релизами.
+
+Запуск из каталога backend:
+    python -m game.perft --depth 4
+    python -m game.perft --depth 3 --position kiwipete --divide
+    python -m game.perft --depth 3 --fen "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1"
+    python -m game.perft --depth 5 --position start --workers 8 --split-depth 2
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, Optional, Tuple
+
+from .board import START_FEN, Board
+from .codec import pack_position, unpack_position
+from .index_notation import move_to_notation
+from .movegen import generate_legal_moves
+
+# Стандартные тестовые позиции и опубликованные числа узлов для глубин 1, 2, 3, ...
+STANDARD_POSITIONS: Dict[str, Tuple[str, List[int]]] = {
+    'start': (START_FEN, [20, 400, 8902, 197281, 4865609, 119060324]),
+    'kiwipete': ('r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1',
+                 [48, 2039, 97862, 4085603, 193690690]),
+    'position3': ('8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1',
+                  [14, 191, 2812, 43238, 674624, 11030083]),
+    'position4': ('r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1',
+                  [6, 264, 9467, 422333, 15833292]),
+    'position5': ('rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8',
+                  [44, 1486, 62379, 2103487, 89941194]),
+    'position6': ('r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10',
+                  [46, 2079, 89890, 3894594, 164075551]),
+}
+
+
+def perft(board: Board, depth: int) -> int:
+    """
+    Считает число листьев дерева ходов глубины depth из текущей позиции доски.
+
+    Доска после вызова остаётся в исходном состоянии.
+    """
+    if depth <= 0:
+        return 1
+    moves = generate_legal_moves(board, board.side_to_move)
+    if depth == 1:
+        return len(moves)
+    nodes = 0
+    for from_square, to_square, promotion in moves:
+        undo = board.make_move(from_square, to_square, promotion)
+        nodes += perft(board, depth - 1)
+        board.unmake_move(undo)
+    return nodes
+
+
+def divide(board: Board, depth: int) -> Dict[str, int]:
+    """
+    Возвращает число листьев для каждого хода из корня (например {'e2e4': 8102, ...}).
+    """
+    counts = {}
+    for move in generate_legal_moves(board, board.side_to_move):
+        undo = board.make_move(*move)
+        counts[move_to_notation(move)] = perft(board, depth - 1)
+        board.unmake_move(undo)
+    return counts
+
+
+def _split_positions(board: Board, depth: int, root: Optional[str] = None) -> List[Tuple[str, bytes]]:
+    """
+    Перечисляет все позиции на глубине depth от текущей.
+
+    :return: Пары (ход из корня, упакованная позиция).
+    """
+    if depth == 0:
+        return [(root, pack_position(board))]
+    positions = []
+    for move in generate_legal_moves(board, board.side_to_move):
+        undo = board.make_move(*move)
+        positions.extend(_split_positions(board, depth - 1, root or move_to_notation(move)))
+        board.unmake_move(undo)
+    return positions
+
+
+def _perft_task(root: str, packed: bytes, depth: int) -> Tuple[str, int, float, int]:
+    """
+    Задача для процесса-исполнителя: распаковывает позицию и считает perft оставшейся глубины.
+
+    :return: (root, nodes, elapsed_seconds, worker_pid)
+    """
+    started = time.perf_counter()
+    board, _, _ = unpack_position(packed)
+    nodes = perft(board, depth)
+    return root, nodes, time.perf_counter() - started, os.getpid()
+
+
+def parallel_perft(fen: str, depth: int, workers: Optional[int] = None,
+                   split_depth: int = 1) -> Tuple[Dict[str, int], Dict[int, Tuple[int, int, float]]]:
+    """
+    Считает perft, распределяя поддеревья по пулу процессов.
+
+    Дерево режется на глубине split_depth: каждая позиция на этой глубине становится
+    отдельной задачей. Исполнитель получает позицию в упакованном виде (codec.py),
+    а не объект доски.
+
+    :param fen: Корневая позиция.
+    :param depth: Полная глубина перебора.
+    :param workers: Число процессов (по умолчанию os.cpu_count()).
+    :param split_depth: Глубина разбиения дерева на задачи (1 — по ходам из корня).
+    :return: (узлы для каждого хода из корня, статистика по исполнителям pid -> (tasks, nodes, busy_seconds))
+    :raises ValueError: Если depth меньше 1: такое дерево не делится на ходы из корня.
+    """
+    if depth <= 0:
+        raise ValueError(f"Parallel perft needs depth >= 1, got {depth}")
+    board = Board()
+    board.load_fen(fen)
+    split_depth = max(1, min(split_depth, depth))
+    positions = _split_positions(board, split_depth)
+
+    counts: Dict[str, int] = {}
+    workers_stats: Dict[int, Tuple[int, int, float]] = {}
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(_perft_task, root, packed, depth - split_depth)
+                   for root, packed in positions]
+        for future in as_completed(futures):
+            root, nodes, elapsed, pid = future.result()
+            counts[root] = counts.get(root, 0) + nodes
+            tasks, total_nodes, busy = workers_stats.get(pid, (0, 0, 0.0))
+            workers_stats[pid] = (tasks + 1, total_nodes + nodes, busy + elapsed)
+
+    # Ходы из корня, после которых нет продолжений, всё равно должны попасть в divide
+    for move in generate_legal_moves(board, board.side_to_move):
+        counts.setdefault(move_to_notation(move), 0)
+    return counts, workers_stats
+
+
+def run_parallel(name: str, fen: str, depth: int, workers: Optional[int], split_depth: int,
+                 expected: Optional[int] = None, show_divide: bool = False) -> bool:
+    """
+    Параллельный вариант run_position: дополнительно печатает время работы каждого процесса.
+    """
+    if depth <= 0:
+        # Дерево глубины 0 — один лист, делить его между процессами нечего
+        return run_position(name, fen, depth, expected, show_divide)
+    started = time.perf_counter()
+    counts, workers_stats = parallel_perft(fen, depth, workers, split_depth)
+    elapsed = time.perf_counter() - started
+    nodes = sum(counts.values())
+
+    if show_divide:
+        for move, count in sorted(counts.items()):
+            print(f"  {move}: {count}")
+    busy_total = 0.0
+    for pid, (tasks, worker_nodes, busy) in sorted(workers_stats.items()):
+        busy_total += busy
+        print(f"  worker {pid}: {tasks} tasks, {worker_nodes} nodes, {busy:.3f}s busy")
+    nps = nodes / elapsed if elapsed > 0 else float('inf')
+    parallelism = busy_total / elapsed if elapsed > 0 else 0.0
+    status = ''
+    if expected is not None:
+        status = 'OK' if nodes == expected else f'MISMATCH (expected {expected})'
+    print(f"{name} depth {depth}: {nodes} nodes in {elapsed:.3f}s ({nps:,.0f} nodes/s, "
+          f"{len(workers_stats)} workers, effective parallelism {parallelism:.2f}) {status}")
+    return expected is None or nodes == expected
+
+
+def run_position(name: str, fen: str, depth: int, expected: Optional[int] = None,
+                 show_divide: bool = False) -> bool:
+    """
+    Считает perft для позиции, печатает узлы, время и скорость.
+
+    :return: False, если результат не совпал с ожидаемым значением.
+    """
+    board = Board()
+    board.load_fen(fen)
+    started = time.perf_counter()
+    if show_divide and depth > 0:
+        counts = divide(board, depth)
+        nodes = sum(counts.values())
+    else:
+        counts = {}
+        nodes = perft(board, depth)
+    elapsed = time.perf_counter() - started
+
+    for move, count in sorted(counts.items()):
+        print(f"  {move}: {count}")
+    nps = nodes / elapsed if elapsed > 0 else float('inf')
+    status = ''
+    if expected is not None:
+        status = 'OK' if nodes == expected else f'MISMATCH (expected {expected})'
+    print(f"{name} depth {depth}: {nodes} nodes in {elapsed:.3f}s ({nps:,.0f} nodes/s) {status}")
+    return expected is None or nodes == expected
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Perft для генератора ходов")
+    parser.add_argument('--depth', type=int, default=3, help="Глубина перебора")
+    parser.add_argument('--position', choices=sorted(STANDARD_POSITIONS) + ['all'], default='all',
+                        help="Стандартная позиция (по умолчанию все)")
+    parser.add_argument('--fen', help="Произвольная позиция в FEN вместо стандартной")
+    parser.add_argument('--divide', action='store_true', help="Показать число узлов для каждого хода из корня")
+    parser.add_argument('--workers', type=int, default=0,
+                        help="Число процессов для параллельного подсчёта (0 — в текущем процессе)")
+    parser.add_argument('--split-depth', type=int, default=1,
+                        help="Глубина, на которой дерево делится на задачи для процессов")
+    args = parser.parse_args(argv)
+    if args.depth < 0:
+        parser.error(f"--depth must not be negative, got {args.depth}")
+
+    def run(name: str, fen: str, expected: Optional[int] = None) -> bool:
+        if args.workers > 0:
+            return run_parallel(name, fen, args.depth, args.workers, args.split_depth, expected, args.divide)
+        return run_position(name, fen, args.depth, expected, args.divide)
+
+    if args.fen:
+        return 0 if run('fen', args.fen) else 1
+
+    names = sorted(STANDARD_POSITIONS) if args.position == 'all' else [args.position]
+    ok = True
+    for name in names:
+        fen, counts = STANDARD_POSITIONS[name]
+        expected = counts[args.depth - 1] if 0 < args.depth <= len(counts) else None
+        ok &= run(name, fen, expected)
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
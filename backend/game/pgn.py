@@ -0,0 +1,348 @@
+"""
+Чтение и запись партий в формате PGN, ходы в краткой алгебраической нотации (SAN).
+
+Чтение потоковое: read_games разбирает строки по одной и отдаёт партии по мере
+их окончания, поэтому в памяти одновременно находится только текущая партия,
+сколько бы партий ни было в файле. Комментарии, варианты и NAG пропускаются.
+
+Ходы SAN сопоставляются со списком легальных ходов позиции (generate_legal_moves):
+и разбор, и уточнение неоднозначных ходов при записи опираются на него.
+"""
+import re
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+from .bitboard import (
+    COLOR_INDEX, BISHOP, KING, KNIGHT, PAWN, QUEEN, ROOK, WHITE,
+    KING_ATTACKS, KNIGHT_ATTACKS, PAWN_ATTACKS,
+    bishop_attacks, iter_squares, queen_attacks, rook_attacks, square_coords,
+)
+from .board import FEN_SYMBOLS, PIECE_KINDS, PROMOTION_KINDS, START_FEN, Board
+from .chess_game import ChessGame
+from .index_notation import index_to_notation
+from .movegen import Move, generate_legal_moves
+
+RESULTS = ('1-0', '0-1', '1/2-1/2', '*')
+# Обязательные теги PGN в обязательном порядке
+SEVEN_TAG_ROSTER = ('Event', 'Site', 'Date', 'Round', 'White', 'Black', 'Result')
+_TAG_DEFAULTS = {'Date': '????.??.??'}
+
+_SAN = re.compile(r'^([NBRQK])?([a-h])?([1-8])?x?([a-h][1-8])(?:=?([NBRQ]))?$')
+_SAN_KINDS = {**PROMOTION_KINDS, 'K': KING}
+_TAG = re.compile(r'^\[\s*(\w+)\s+"((?:[^"\\]|\\.)*)"\s*\]')
+_MOVE_NUMBER = re.compile(r'^\d+\.+')
+_TOKENS = re.compile(r'(\{|\}|\(|\)|\s+)')
+_FILES = 'abcdefgh'
+_LINE_WIDTH = 80
+
+
+class PgnGame(NamedTuple):
+    """
+    Партия из файла PGN: теги, ходы в SAN и результат ('1-0', '0-1', '1/2-1/2' или '*').
+    """
+    headers: Dict[str, str]
+    moves: List[str]
+    result: str
+
+    @property
+    def winner(self) -> Optional[str]:
+        return {'1-0': 'white', '0-1': 'black'}.get(self.result)
+
+
+def san_to_move(board: Board, san: str, legal: Optional[List[Move]] = None) -> Move:
+    """
+    Находит легальный ход позиции board по его записи в SAN.
+
+    Если список легальных ходов не передан, он не строится: клетки, с которых фигура
+    нужного вида может пойти на целевое поле, берутся из таблиц атак, а легальность
+    каждого кандидата проверяется пробным ходом. Так разбор партии в разы быстрее.
+    Рокировки всегда сверяются со списком легальных ходов.
+
+    :param legal: Готовый список легальных ходов позиции, если он уже есть.
+    :raises ValueError: Если ход не распознан, нелегален или неоднозначен
+    """
+    text = san.rstrip('+#!?')
+    grid = board.board
+    if text in ('O-O', '0-0', 'O-O-O', '0-0-0'):
+        to_col = 6 if len(text) == 3 else 2
+        moves = legal if legal is not None else generate_legal_moves(board, board.side_to_move)
+        candidates = [move for move in moves
+                      if PIECE_KINDS[type(grid[move[0][0]][move[0][1]])] == KING
+                      and move[0][1] == 4 and move[1][1] == to_col]
+    else:
+        match = _SAN.match(text)
+        if match is None:
+            raise ValueError(f"Unrecognized move: {san}")
+        piece, from_file, from_rank, target, promotion = match.groups()
+        kind = _SAN_KINDS[piece] if piece else PAWN
+        to_square = (8 - int(target[1]), _FILES.index(target[0]))
+        if legal is not None:
+            candidates = [move for move in legal
+                          if move[1] == to_square and move[2] == promotion
+                          and PIECE_KINDS[type(grid[move[0][0]][move[0][1]])] == kind
+                          and (from_file is None or move[0][1] == _FILES.index(from_file))
+                          and (from_rank is None or move[0][0] == 8 - int(from_rank))]
+        else:
+            candidates = _candidates(board, kind, to_square, promotion,
+                                     None if from_file is None else _FILES.index(from_file),
+                                     None if from_rank is None else 8 - int(from_rank))
+    if len(candidates) != 1:
+        raise ValueError(f"Illegal or ambiguous move: {san}")
+    return candidates[0]
+
+
+def _candidates(board: Board, kind: int, to_square: Tuple[int, int], promotion: Optional[str],
+                from_col: Optional[int], from_row: Optional[int]) -> List[Move]:
+    """
+    Легальные ходы фигурой вида kind на клетку to_square (с учётом уточнения откуда).
+    """
+    color = board.side_to_move
+    us = COLOR_INDEX[color]
+    to_row, to_col = to_square
+    target = to_row * 8 + to_col
+    if board.occupancy[us] >> target & 1:
+        return []
+    pieces = board.bitboards[us * 6 + kind]
+    occupied = board.occupied
+    if kind == PAWN:
+        last_row = 0 if us == WHITE else 7
+        if (promotion is not None) != (to_row == last_row):
+            return []
+        if from_col is not None and from_col != to_col:
+            if not (board.occupancy[us ^ 1] >> target & 1 or to_square == board.en_passant):
+                return []
+            origins = PAWN_ATTACKS[us ^ 1][target] & pieces
+        else:
+            if occupied >> target & 1:
+                return []
+            step = 8 if us == WHITE else -8
+            origins = 1 << (target + step) & pieces if 0 <= target + step < 64 else 0
+            if not origins and to_row == (4 if us == WHITE else 3) and not occupied >> (target + step) & 1:
+                origins = 1 << (target + 2 * step) & pieces
+    elif promotion is not None:
+        return []
+    elif kind == KNIGHT:
+        origins = KNIGHT_ATTACKS[target] & pieces
+    elif kind == BISHOP:
+        origins = bishop_attacks(target, occupied) & pieces
+    elif kind == ROOK:
+        origins = rook_attacks(target, occupied) & pieces
+    elif kind == QUEEN:
+        origins = queen_attacks(target, occupied) & pieces
+    else:
+        origins = KING_ATTACKS[target] & pieces
+
+    candidates = []
+    for origin in iter_squares(origins):
+        from_square = square_coords(origin)
+        if from_col is not None and from_square[1] != from_col or from_row is not None and from_square[0] != from_row:
+            continue
+        undo = board.make_move(from_square, to_square, promotion)
+        if not board.is_in_check(color):
+            candidates.append((from_square, to_square, promotion))
+        board.unmake_move(undo)
+    return candidates
+
+
+def move_to_san(board: Board, move: Move, legal: Optional[List[Move]] = None) -> str:
+    """
+    Записывает легальный ход позиции board в SAN, включая '+' и '#'.
+
+    Доска временно изменяется (ход делается и отменяется), чтобы определить шах и мат.
+
+    :param legal: Готовый список легальных ходов позиции, если он уже есть.
+    """
+    (from_row, from_col), (to_row, to_col), promotion = move
+    grid = board.board
+    piece = grid[from_row][from_col]
+    kind = PIECE_KINDS[type(piece)]
+    target = index_to_notation(to_row, to_col)
+    if kind == KING and abs(to_col - from_col) == 2:
+        san = 'O-O' if to_col > from_col else 'O-O-O'
+    elif kind == PAWN:
+        capture = from_col != to_col
+        san = (_FILES[from_col] + 'x' if capture else '') + target + ('=' + promotion if promotion else '')
+    else:
+        legal = legal if legal is not None else generate_legal_moves(board, board.side_to_move)
+        rivals = [other_from for other_from, other_to, _ in legal
+                  if other_to == (to_row, to_col) and other_from != (from_row, from_col)
+                  and type(grid[other_from[0]][other_from[1]]) is type(piece)]
+        prefix = ''
+        if rivals:
+            if all(col != from_col for _, col in rivals):
+                prefix = _FILES[from_col]
+            elif all(row != from_row for row, _ in rivals):
+                prefix = str(8 - from_row)
+            else:
+                prefix = _FILES[from_col] + str(8 - from_row)
+        capture = grid[to_row][to_col] is not None
+        san = FEN_SYMBOLS[type(piece)].upper() + prefix + ('x' if capture else '') + target
+
+    undo = board.make_move(*move)
+    opponent = board.side_to_move
+    if board.is_in_check(opponent):
+        san += '+' if generate_legal_moves(board, opponent) else '#'
+    board.unmake_move(undo)
+    return san
+
+
+def read_games(lines: Iterable[str]) -> Iterator[PgnGame]:
+    """
+    Потоково читает партии из строк PGN (например, из открытого файла).
+
+    Партия заканчивается токеном результата; если его нет, следующей секцией тегов или концом файла.
+    """
+    headers: Dict[str, str] = {}
+    moves: List[str] = []
+    variation_depth = 0
+    in_comment = False
+    for line in lines:
+        line = line.strip()
+        if line.startswith('%'):
+            continue
+        if not in_comment and not variation_depth and line.startswith('['):
+            tag = _TAG.match(line)
+            if tag is None:
+                continue
+            if moves:
+                yield PgnGame(headers, moves, headers.get('Result', '*'))
+                headers, moves = {}, []
+            headers[tag.group(1)] = tag.group(2).replace('\\"', '"').replace('\\\\', '\\')
+            continue
+        for token in _TOKENS.split(line):
+            if not token or token.isspace():
+                continue
+            if in_comment:
+                in_comment = token != '}'
+            elif token == '{':
+                in_comment = True
+            elif token.startswith(';'):
+                break
+            elif token == '(':
+                variation_depth += 1
+            elif token == ')':
+                variation_depth = max(0, variation_depth - 1)
+            elif variation_depth or token.startswith('$') or token == 'e.p.':
+                continue
+            elif token in RESULTS:
+                yield PgnGame(headers, moves, token)
+                headers, moves = {}, []
+            else:
+                token = _MOVE_NUMBER.sub('', token)
+                if token:
+                    moves.append(token)
+    if headers or moves:
+        yield PgnGame(headers, moves, headers.get('Result', '*'))
+
+
+def open_games(path: Union[str, Path]) -> Iterator[PgnGame]:
+    """
+    Потоково читает партии из файла PGN.
+    """
+    with open(path, encoding='utf-8', errors='replace') as file:
+        yield from read_games(file)
+
+
+def play_game(pgn_game: PgnGame, game_time: int = 0, increment: int = 0) -> ChessGame:
+    """
+    Воспроизводит партию PGN ходами ChessGame.move (с той же проверкой, что и ходы игроков).
+
+    :raises ValueError: Если ход записан неверно или нелегален
+    """
+    game = ChessGame(game_time, increment)
+    fen = pgn_game.headers.get('FEN')
+    if fen:
+        game.load_fen(fen)
+    else:
+        game.start_game()
+    for san in pgn_game.moves:
+        from_square, to_square, promotion = san_to_move(game.board, san)
+        if not game.move(index_to_notation(*from_square), index_to_notation(*to_square), promotion):
+            raise ValueError(f"Move rejected: {san}")
+    return game
+
+
+def replay(pgn_game: PgnGame) -> Tuple[Board, List[Move], int, int]:
+    """
+    Быстро проверяет партию PGN на доске, без ChessGame: без вывода, часов и проверки конца партии.
+
+    :return: (конечная позиция, ходы, счётчик полуходов, номер хода).
+    :raises ValueError: Если ход записан неверно или нелегален (с номером полухода)
+    """
+    board = Board()
+    halfmove_clock, fullmove_number = board.load_fen(pgn_game.headers.get('FEN') or START_FEN)
+    moves = []
+    for ply, san in enumerate(pgn_game.moves, start=1):
+        try:
+            move = san_to_move(board, san)
+        except ValueError as error:
+            raise ValueError(f"ply {ply}: {error}") from None
+        (from_row, from_col), (to_row, to_col), _ = move
+        irreversible = (board.board[to_row][to_col] is not None
+                        or PIECE_KINDS[type(board.board[from_row][from_col])] == PAWN)
+        board.make_move(*move)
+        moves.append(move)
+        halfmove_clock = 0 if irreversible else halfmove_clock + 1
+        if board.side_to_move == 'white':
+            fullmove_number += 1
+    return board, moves, halfmove_clock, fullmove_number
+
+
+def result_token(result: Optional[str]) -> str:
+    """
+    Переводит ChessGame.result в результат PGN.
+    """
+    if result is None:
+        return '*'
+    if 'Победа белых' in result:
+        return '1-0'
+    if 'Победа черных' in result:
+        return '0-1'
+    return '1/2-1/2'
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"')
+
+
+def game_to_pgn(game: ChessGame, headers: Optional[Dict[str, str]] = None) -> str:
+    """
+    Записывает партию ChessGame в PGN.
+
+    :param headers: Дополнительные теги; недостающие теги обязательного набора заполняются '?'.
+    """
+    result = result_token(game.result)
+    start_fen = game.start_fen or START_FEN
+    tags = {name: _TAG_DEFAULTS.get(name, '?') for name in SEVEN_TAG_ROSTER}
+    tags.update(headers or {})
+    tags['Result'] = result
+    if start_fen != START_FEN:
+        tags['SetUp'] = '1'
+        tags['FEN'] = start_fen
+
+    board = Board()
+    _, fullmove_number = board.load_fen(start_fen)
+    tokens = []
+    for index, move in enumerate(game.moves):
+        white = board.side_to_move == 'white'
+        if white:
+            tokens.append(f"{fullmove_number}.")
+        elif index == 0:
+            tokens.append(f"{fullmove_number}...")
+        tokens.append(move_to_san(board, move))
+        board.make_move(*move)
+        if not white:
+            fullmove_number += 1
+    tokens.append(result)
+
+    lines = [f'[{name} "{_escape(value)}"]' for name, value in tags.items()]
+    lines.append('')
+    line = ''
+    for token in tokens:
+        if line and len(line) + 1 + len(token) > _LINE_WIDTH:
+            lines.append(line)
+            line = token
+        else:
+            line = f"{line} {token}" if line else token
+    lines.append(line)
+    return '\n'.join(lines) + '\n'
@@ -1,9 +1,17 @@
 from typing import List, Tuple, Optional
+from ..bitboard import COLOR_INDEX, KING_ATTACKS, KNIGHT_ATTACKS, PAWN_ATTACKS, \
+    BISHOP_DIRECTIONS, ROOK_DIRECTIONS, iter_squares, square_coords, square_index
+from .bishop import Bishop
+from .knight import Knight
+from .pawn import Pawn
 from .piece import Piece
+from .queen import Queen
 from .rook import Rook
 
 
 class King(Piece):
+    __slots__ = ('has_moved',)
+
     def __init__(self, color: str, position: Tuple[int, int]):
         """
         Инициализация короля.
@@ -194,22 +202,35 @@ class King(Piece):
         :param target_col: Индекс столбца клетки.
         :return: True если клетка атакуется, иначе False.
         """
-        for row in range(8):
-            for col in range(8):
+        square = square_index(target_row, target_col)
+
+        # Пешки, кони и короли противника ищутся по таблицам атак от целевой клетки
+        leapers = (
+            (PAWN_ATTACKS[COLOR_INDEX[self.color]][square], Pawn),
+            (KNIGHT_ATTACKS[square], Knight),
+            (KING_ATTACKS[square], King),
+        )
+        for mask, piece_class in leapers:
+            for attacker_square in iter_squares(mask):
+                row, col = square_coords(attacker_square)
                 piece = board[row][col]
-                if piece is None:
-                    continue  # Пустая клетка
-
-                if piece.color == self.color:
-                    continue  # Не проверяем свои фигуры
-
-                if isinstance(piece, King):
-                    continue  # Пропускаем проверку атак королей, чтобы избежать рекурсии
-
-                possible_moves = piece.show_possible_moves(board)
-                if (target_row, target_col) in possible_moves:
+                if isinstance(piece, piece_class) and piece.color != self.color:
                     return True  # Клетка атакуется
 
+        # Дальнобойные фигуры ищутся лучами от целевой клетки до первой фигуры
+        for directions, piece_classes in ((ROOK_DIRECTIONS, (Rook, Queen)),
+                                          (BISHOP_DIRECTIONS, (Bishop, Queen))):
+            for dr, dc in directions:
+                row, col = target_row + dr, target_col + dc
+                while 0 <= row < 8 and 0 <= col < 8:
+                    piece = board[row][col]
+                    # Сам король не загораживает луч: он уходит с этой линии
+                    if piece is not None and piece is not self:
+                        if isinstance(piece, piece_classes) and piece.color != self.color:
+                            return True  # Клетка атакуется
+                        break
+                    row, col = row + dr, col + dc
+
         return False  # Клетка не атакуется
 
     def would_move_into_check(self, board: List[List[Optional[Piece]]], move: Tuple[int, int]) -> bool:
@@ -220,17 +241,21 @@ class King(Piece):
         :param move: Кортеж с предполагаемым ходом (new_row, new_col).
         :return: True если король окажется под шахом после хода, иначе False.
         """
-        import copy
-        test_board = copy.deepcopy(board)
         row, col = self.current_square
         new_row, new_col = move
 
-        # Выполняем ход на тестовой доске
-        test_board[row][col] = None
-        test_board[new_row][new_col] = self
-
-        # Проверяем, находится ли король под шахом после хода
-        return self.is_in_check(test_board)
+        # Выполняем ход прямо на доске и затем возвращаем всё на место
+        target_piece = board[new_row][new_col]
+        board[row][col] = None
+        board[new_row][new_col] = self
+        self.current_square = move
+        try:
+            # Проверяем, находится ли король под шахом после хода
+            return self.is_in_check(board)
+        finally:
+            self.current_square = (row, col)
+            board[new_row][new_col] = target_piece
+            board[row][col] = self
 
     def can_castle_short(self, board: List[List[Optional[Piece]]]) -> bool:
         """
@@ -1,3 +1,4 @@
+import logging
 from typing import List, Tuple, Optional
 from .piece import Piece
 from .queen import Queen
@@ -5,11 +6,22 @@ from .rook import Rook
 from .knight import Knight
 from .bishop import Bishop
 
+logger = logging.getLogger(__name__)
+
+# Фигуры, в которые превращается пешка, в порядке генерации ходов (сначала ферзь)
+PROMOTION_PIECES = {
+    'Q': Queen,
+    'R': Rook,
+    'B': Bishop,
+    'N': Knight,
+}
+
 
 class Pawn(Piece):
+    __slots__ = ('already_moved',)
+
     def __init__(self, color: str, position: Tuple[int, int]):
         super().__init__(color, position)
-        self.can_be_captured_en_passant = False
         self.already_moved = False
 
     def name(self) -> str:
@@ -23,7 +35,9 @@ class Pawn(Piece):
     def move(
         self,
         move: Tuple[int, int],
-        board: List[List[Optional['Piece']]]
+        board: List[List[Optional['Piece']]],
+        promotion: str = 'Q',
+        last_move: Optional[Tuple[Tuple[int, int], Tuple[int, int], Optional[str]]] = None
     ) -> bool:
         new_row, new_col = move
         old_row, old_col = self.current_square
@@ -33,7 +47,7 @@ class Pawn(Piece):
             return False
 
         # Get the list of possible moves
-        possible_moves = self.show_possible_moves(board)
+        possible_moves = self.show_possible_moves(board, last_move)
         if move not in possible_moves:
             return False
 
@@ -49,12 +63,11 @@ class Pawn(Piece):
             captured_piece = board[captured_row][captured_col]
             if (captured_piece and
                 isinstance(captured_piece, Pawn) and
-                self._is_opponent_piece(captured_piece) and
-                captured_piece.can_be_captured_en_passant):
+                self._is_opponent_piece(captured_piece)):
                 board[captured_row][captured_col] = None
                 is_en_passant = True
             else:
-                print("Error: No pawn to capture en passant.")
+                logger.debug("No pawn to capture en passant")
                 return False
 
         # Move the pawn
@@ -63,21 +76,9 @@ class Pawn(Piece):
         self.current_square = (new_row, new_col)
         self.already_moved = True
 
-        # Reset en passant flags for all pawns except this one
-        for row_pieces in board:
-            for piece in row_pieces:
-                if isinstance(piece, Pawn) and piece != self:
-                    piece.can_be_captured_en_passant = False
-
-        # If the pawn moved two squares forward, set can_be_captured_en_passant to True
-        if abs(new_row - old_row) == 2:
-            self.can_be_captured_en_passant = True
-        else:
-            self.can_be_captured_en_passant = False
-
         # Check for promotion
         if self._is_promotion(new_row):
-            self._promote(board, new_row, new_col)
+            self._promote(board, new_row, new_col, promotion)
 
         return True
 
@@ -98,37 +99,22 @@ class Pawn(Piece):
             self,
             board: List[List['Piece']],
             new_row: int,
-            new_col: int
+            new_col: int,
+            promotion: str = 'Q'
     ):
         """
-        Превращает пешку всегда в ферзя.
+        Превращает пешку в выбранную фигуру.
+
+        :param promotion: 'Q', 'R', 'B' или 'N' (по умолчанию ферзь).
         """
+        if promotion.upper() not in PROMOTION_PIECES:
+            raise ValueError("Promotion piece must be one of 'Q', 'R', 'B', 'N'")
 
-        # Ниже закомментированная логика выбора фигуры.
-        # Оставлена для примера, но больше не используется.
-        #
-        # piece_classes = {
-        #     'Q': Queen,
-        #     'R': Rook,
-        #     'B': Bishop,
-        #     'N': Knight
-        # }
-        #
-        # while True:
-        #     promotion_choice = input("Choose promotion piece (Q, R, B, N): ").upper()
-        #     if promotion_choice in piece_classes:
-        #         break
-        #     else:
-        #         print("Invalid choice. Please try again.")
-        #
-        # promoted_piece = piece_classes[promotion_choice](self.color, (new_row, new_col))
-
-        # В данной версии пешка всегда превращается в ферзя:
-        promoted_piece = Queen(self.color, (new_row, new_col))
+        promoted_piece = PROMOTION_PIECES[promotion.upper()](self.color, (new_row, new_col))
 
         # Ставим новую фигуру на доску
         board[new_row][new_col] = promoted_piece
-    
+
     def show_possible_moves(
         self,
         board: List[List[Optional['Piece']]],
@@ -138,7 +124,8 @@ class Pawn(Piece):
         Returns a list of valid moves for the pawn, considering the current board state.
 
         :param board: The current board.
-        :param last_move: (Unused in this method, included for consistency)
+        :param last_move: The previous move; en passant is allowed only right after an enemy double push,
+                          so without last_move it is never offered (Board keeps the square in Board.en_passant).
         :return: List of tuples with valid moves (new_row, new_col).
         """
         possible_moves = []
@@ -172,11 +159,24 @@ class Pawn(Piece):
                         if (adjacent_piece and
                             isinstance(adjacent_piece, Pawn) and
                             self._is_opponent_piece(adjacent_piece) and
-                            adjacent_piece.can_be_captured_en_passant):
+                            self._en_passant_allowed(adjacent_piece, last_move)):
                             possible_moves.append((target_row, new_col))
 
         return possible_moves
 
+    @staticmethod
+    def _en_passant_allowed(
+        pawn: 'Pawn',
+        last_move: Optional[Tuple[Tuple[int, int], Tuple[int, int], Optional[str]]]
+    ) -> bool:
+        """
+        Checks if the pawn has just made a double push and can be captured en passant.
+        """
+        if last_move is None:
+            return False
+        (from_row, _), to_square, _ = last_move
+        return to_square == pawn.current_square and abs(to_square[0] - from_row) == 2
+
     def _is_opponent_piece(self, piece: 'Piece') -> bool:
         """
         Checks if the piece belongs to the opponent.
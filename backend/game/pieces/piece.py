@@ -3,6 +3,16 @@ from abc import ABC, abstractmethod
 
 
 class Piece(ABC):
+    # Фиксированный набор атрибутов вместо __dict__: фигур в каждой партии 32,
+    # а активных партий много. Подклассы добавляют свои флаги в __slots__.
+    __slots__ = ('color', 'current_square', '_is_tied')
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Все атрибуты экземпляра с учётом базовых классов, для copy()
+        cls._fields = tuple(name for klass in reversed(cls.__mro__)
+                            for name in klass.__dict__.get('__slots__', ()))
+
     def __init__(self, color: str, position: Tuple[int, int]):
         """
         Инициализация фигуры.
@@ -26,6 +36,15 @@ class Piece(ABC):
         self.current_square = position  # (row, column)
         self._is_tied = False  # Изначально фигура не связана
 
+    def copy(self) -> 'Piece':
+        """
+        Возвращает независимую копию фигуры с тем же состоянием (без вызова __init__ и проверок).
+        """
+        clone = object.__new__(type(self))
+        for name in self._fields:
+            setattr(clone, name, getattr(self, name))
+        return clone
+
     def get_current_square(self) -> Tuple[int, int]:
         """
         Возвращает текущую позицию фигуры.
@@ -3,6 +3,8 @@ from .piece import Piece
 
 
 class Queen(Piece):
+    __slots__ = ()
+
     def __init__(self, color: str, position: Tuple[int, int]):
         """
         Инициализация ферзя.
@@ -3,6 +3,8 @@ from .piece import Piece
 
 
 class Rook(Piece):
+    __slots__ = ('has_moved',)
+
     def __init__(self, color: str, position: Tuple[int, int]):
         """
         Инициализация ладьи.
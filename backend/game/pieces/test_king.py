@@ -175,4 +175,24 @@ class TestKing(unittest.TestCase):
         self.board[7][0] = rook_ally
         self.board[0][4] = rook_enemy
 
-        self.assertFalse(king.move((7, 2), self.board))
\ No newline at end of file
+        self.assertFalse(king.move((7, 2), self.board))
+
+    def test_cannot_move_next_to_enemy_king(self):
+        king = King("white", (4, 4))
+        enemy_king = King("black", (2, 4))
+        self.board[4][4] = king
+        self.board[2][4] = enemy_king
+
+        for move in [(3, 3), (3, 4), (3, 5)]:
+            with self.subTest(move=move):
+                self.assertFalse(king.move(move, self.board))
+                self.assertIsInstance(self.board[4][4], King)
+
+    def test_cannot_step_back_along_checking_ray(self):
+        king = King("white", (4, 4))
+        rook_enemy = Rook("black", (4, 0))
+        self.board[4][4] = king
+        self.board[4][0] = rook_enemy
+
+        self.assertFalse(king.move((4, 5), self.board))
+        self.assertTrue(king.move((3, 5), self.board))
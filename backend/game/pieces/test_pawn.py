@@ -1,7 +1,6 @@
 import copy
 import unittest
 import pytest
-from unittest import mock
 from typing import Optional
 
 from backend.game.pieces.bishop import Bishop
@@ -114,11 +113,31 @@ class TestPawn(unittest.TestCase):
 
         enemy_pawn.move((3, 2), self.board)
 
-        self.assertTrue(pawn.move((2, 2), self.board))
+        self.assertTrue(pawn.move((2, 2), self.board, last_move=((1, 2), (3, 2), None)))
         self.assertIsNone(self.board[3][3])
         self.assertIsNone(self.board[3][2])
         self.assertIsInstance(self.board[2][2], Pawn)
 
+    def test_en_passant_expires_after_another_move(self):
+        pawn = Pawn("white", (3, 3))
+        other_pawn = Pawn("white", (6, 7))
+        enemy_pawn = Pawn("black", (1, 2))
+        enemy_knight = Knight("black", (0, 6))
+        self.board[3][3] = pawn
+        self.board[6][7] = other_pawn
+        self.board[1][2] = enemy_pawn
+        self.board[0][6] = enemy_knight
+
+        self.assertTrue(enemy_pawn.move((3, 2), self.board))
+        self.assertTrue(other_pawn.move((5, 7), self.board))
+        self.assertTrue(enemy_knight.move((2, 5), self.board))
+
+        self.assertFalse(pawn.move((2, 2), self.board, last_move=((0, 6), (2, 5), None)))
+        # Без предыдущего хода взятие на проходе не предлагается
+        self.assertNotIn((2, 2), pawn.show_possible_moves(self.board))
+        self.assertIs(self.board[3][2], enemy_pawn)
+        self.assertIs(self.board[3][3], pawn)
+
     def test_invalid_move_en_passant(self):
         pawn = Pawn("white", (3, 3))
         enemy_pawn = Pawn("black", (2, 2))
@@ -127,18 +146,17 @@ class TestPawn(unittest.TestCase):
 
         enemy_pawn.move((3, 2), self.board)
 
-        self.assertFalse(pawn.move((2, 2), self.board))
+        self.assertFalse(pawn.move((2, 2), self.board, last_move=((2, 2), (3, 2), None)))
         self.assertIsInstance(self.board[3][2], Pawn)
         self.assertIsInstance(self.board[3][3], Pawn)
 
-    @mock.patch('builtins.input', create=True)
-    def test_promotion(self, mock_input):
-        mock_input.side_effect = ['Q', 'R', 'B', 'N']  # Ввод для каждого из превращений
+    def test_promotion(self):
+        promotion_choices = ['Q', 'R', 'B', 'N']
         result_classes = [Queen, Rook, Bishop, Knight]
 
         for i in range(4):
             pawn = Pawn("white", (1, i))
-            pawn.move((0, i), self.board)
+            pawn.move((0, i), self.board, promotion_choices[i])
             # Проверяем, что новая фигура имеет правильный класс
             self.assertIsInstance(self.board[0][i], result_classes[i])
             # Проверяем, что новая фигура правильно инициализирована
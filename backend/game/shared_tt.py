@@ -0,0 +1,142 @@
+"""
+Таблица транспозиций движка в разделяемой памяти (multiprocessing.shared_memory).
+
+Запись занимает два 64-битных слова: (key ^ data, data). Процессы пишут и читают
+без блокировок; если запись порвана одновременной записью другого процесса,
+key ^ data не совпадёт с ключом и запись будет считаться отсутствующей.
+
+Поле data:
+    биты 0-15  — ход (бит 15 — ход есть, 0-5 — откуда, 6-11 — куда, 12-14 — превращение);
+    биты 16-35 — оценка со смещением 2^19;
+    биты 36-43 — глубина;
+    биты 44-45 — тип оценки (EXACT / LOWER / UPPER);
+    биты 46-53 — поколение поиска;
+    бит 63     — запись занята.
+"""
+from multiprocessing import shared_memory
+from typing import Any, Optional, Tuple
+
+from .bitboard import square_coords, square_index
+from .board import PROMOTION_KINDS, PROMOTION_SYMBOLS
+
+_SCORE_OFFSET = 1 << 19
+_VALID = 1 << 63
+_ENTRY_WORDS = 2
+# Первое слово буфера — текущее поколение
+_HEADER_WORDS = 1
+
+
+def _encode(value: Tuple[int, int, Any], depth: int, generation: int) -> int:
+    score, flag, move = value
+    move_code = 0
+    if move is not None:
+        from_square, to_square, promotion = move
+        move_code = (1 << 15 | square_index(*from_square) | square_index(*to_square) << 6
+                     | (PROMOTION_KINDS[promotion] if promotion else 0) << 12)
+    return (_VALID | move_code | (score + _SCORE_OFFSET) << 16 | max(0, min(depth, 255)) << 36
+            | flag << 44 | (generation & 0xFF) << 46)
+
+
+def _decode(data: int) -> Tuple[int, Tuple[int, int, Any]]:
+    move = None
+    if data & 1 << 15:
+        move = (square_coords(data & 63), square_coords(data >> 6 & 63), PROMOTION_SYMBOLS[data >> 12 & 7])
+    score = (data >> 16 & 0xFFFFF) - _SCORE_OFFSET
+    return data >> 36 & 0xFF, (score, data >> 44 & 3, move)
+
+
+class SharedTranspositionTable:
+    """
+    Заменяет TranspositionTable в движке; значения — кортежи (score, flag, move).
+
+    Таблицу создаёт один процесс (owner), остальные подключаются по имени через attach.
+    Поколение меняет только создатель таблицы.
+    """
+
+    def __init__(self, size: int = 1 << 18, name: Optional[str] = None) -> None:
+        """
+        :param size: Число ячеек; округляется вверх до степени двойки.
+        :param name: Имя существующего блока памяти; если не задано, создаётся новый.
+        """
+        if size <= 0:
+            raise ValueError("Size must be positive")
+        size = 1 << (size - 1).bit_length()
+        self.mask = size - 1
+        nbytes = (_HEADER_WORDS + size * _ENTRY_WORDS) * 8
+        self.owner = name is None
+        if self.owner:
+            self._shm = shared_memory.SharedMemory(create=True, size=nbytes)
+        else:
+            # Процессы пула используют трекер ресурсов создателя, поэтому повторная регистрация
+            # блока безопасна: он удаляется один раз, в close() создателя
+            self._shm = shared_memory.SharedMemory(name=name)
+        self._words = self._shm.buf.cast('Q')
+        if self.owner:
+            self.clear()
+
+    @classmethod
+    def attach(cls, name: str, size: int) -> 'SharedTranspositionTable':
+        return cls(size, name)
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    @property
+    def generation(self) -> int:
+        return self._words[0]
+
+    def __len__(self) -> int:
+        words = self._words
+        return sum(1 for index in range(_HEADER_WORDS + 1, len(words), _ENTRY_WORDS) if words[index])
+
+    def new_search(self) -> None:
+        if self.owner:
+            self._words[0] = (self._words[0] + 1) & 0xFF
+
+    def clear(self) -> None:
+        self._shm.buf[:] = bytes(len(self._shm.buf))
+
+    def probe(self, key: int) -> Optional[Tuple[int, Tuple[int, int, Any]]]:
+        """
+        Возвращает (depth, (score, flag, move)) для ключа или None.
+        """
+        index = _HEADER_WORDS + (key & self.mask) * _ENTRY_WORDS
+        data = self._words[index + 1]
+        if data and self._words[index] ^ data == key:
+            return _decode(data)
+        return None
+
+    def get(self, key: int, default: Any = None) -> Any:
+        entry = self.probe(key)
+        return entry[1] if entry is not None else default
+
+    def store(self, key: int, value: Tuple[int, int, Any], depth: int = 0) -> bool:
+        """
+        Сохраняет значение для ключа по тем же правилам замены, что и TranspositionTable.
+
+        :return: True, если запись сохранена.
+        """
+        index = _HEADER_WORDS + (key & self.mask) * _ENTRY_WORDS
+        words = self._words
+        generation = words[0]
+        old = words[index + 1]
+        if (old and words[index] ^ old != key and old >> 46 & 0xFF == generation
+                and depth < (old >> 36 & 0xFF)):
+            return False
+        data = _encode(value, depth, generation)
+        words[index] = key ^ data
+        words[index + 1] = data
+        return True
+
+    def close(self) -> None:
+        """
+        Отключается от памяти; создатель таблицы также освобождает её.
+        """
+        if self._words is None:
+            return
+        self._words.release()
+        self._words = None
+        self._shm.close()
+        if self.owner:
+            self._shm.unlink()
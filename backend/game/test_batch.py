@@ -0,0 +1,82 @@
+import random
+import unittest
+
+import numpy as np
+
+from backend.game.batch import attacked_squares, encode_boards, encode_fens, in_check, mobility
+from backend.game.board import Board
+from backend.game.movegen import generate_legal_moves
+from backend.game.perft import STANDARD_POSITIONS
+from backend.game.pieces.king import King
+
+
+def random_positions(plies=40, seed=7):
+    rng = random.Random(seed)
+    boards = []
+    for fen, _ in STANDARD_POSITIONS.values():
+        board = Board()
+        board.load_fen(fen)
+        for _ in range(plies):
+            moves = generate_legal_moves(board, board.side_to_move)
+            if not moves:
+                break
+            board.make_move(*rng.choice(moves))
+            boards.append(board.copy())
+    return boards
+
+
+def scalar_mobility(board, color):
+    count = 0
+    own = board.occupancy[0 if color == 'white' else 1]
+    for row in range(8):
+        for col in range(8):
+            piece = board[row, col]
+            if piece is None or piece.color != color:
+                continue
+            if isinstance(piece, King):
+                count += bin(board.attacks_from(row, col) & ~own).count('1')
+            else:
+                count += len(piece.show_possible_moves(board.board))
+    return count
+
+
+class TestBatch(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.boards = random_positions()
+        cls.bitboards, cls.sides = encode_boards(cls.boards)
+
+    def test_encoding(self):
+        self.assertEqual(self.bitboards.shape, (len(self.boards), 12))
+        self.assertEqual(self.bitboards.dtype, np.uint64)
+        for board, masks, side in zip(self.boards, self.bitboards, self.sides):
+            self.assertEqual([int(mask) for mask in masks], board.bitboards)
+            self.assertEqual(side, 0 if board.side_to_move == 'white' else 1)
+
+    def test_matches_scalar_generators(self):
+        for color_index, color in enumerate(('white', 'black')):
+            attacked = attacked_squares(self.bitboards, color_index)
+            checks = in_check(self.bitboards, color_index)
+            counts = mobility(self.bitboards, color_index)
+            for i, board in enumerate(self.boards):
+                with self.subTest(fen=board.fen(), color=color):
+                    self.assertEqual(int(attacked[i]), board.attacked_squares(color))
+                    self.assertEqual(bool(checks[i]), board.is_in_check(color))
+                    self.assertEqual(int(counts[i]), scalar_mobility(board, color))
+
+    def test_per_position_side(self):
+        checks = in_check(self.bitboards, self.sides)
+        for board, check in zip(self.boards, checks):
+            self.assertEqual(bool(check), board.is_in_check(board.side_to_move))
+        self.assertTrue(checks.any())
+
+    def test_encode_fens(self):
+        fens = [fen for fen, _ in STANDARD_POSITIONS.values()]
+        bitboards, sides = encode_fens(fens)
+        start = fens.index(STANDARD_POSITIONS['start'][0])
+        self.assertEqual(int(mobility(bitboards, sides)[start]), 20)
+        self.assertEqual(len(sides), len(fens))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,203 @@
+import unittest
+
+from backend.game.board import Board
+from backend.game.movegen import generate_legal_moves
+from backend.game.pieces.king import King
+from backend.game.pieces.knight import Knight
+from backend.game.pieces.pawn import Pawn
+from backend.game.pieces.queen import Queen
+from backend.game.pieces.rook import Rook
+
+
+class TestMakeUnmake(unittest.TestCase):
+    def setUp(self):
+        self.board = Board()
+
+    def assertRestored(self, before):
+        self.assertEqual(self.board.pretty_board(), before)
+        for row in range(8):
+            for col in range(8):
+                piece = self.board[row, col]
+                if piece is not None:
+                    self.assertEqual(piece.current_square, (row, col))
+
+    def test_quiet_move_and_capture(self):
+        self.board.start_board()
+        before = self.board.pretty_board()
+
+        undo = self.board.make_move((7, 6), (5, 5))
+        self.assertIsInstance(self.board[5, 5], Knight)
+        self.assertIsNone(self.board[7, 6])
+        self.board.unmake_move(undo)
+        self.assertRestored(before)
+
+        self.board[5, 5] = Pawn('black', (5, 5))
+        before = self.board.pretty_board()
+        undo = self.board.make_move((7, 6), (5, 5))
+        self.assertEqual(undo.captured_square, (5, 5))
+        self.board.unmake_move(undo)
+        self.assertRestored(before)
+
+    def test_castling(self):
+        king = King('white', (7, 4))
+        rook = Rook('white', (7, 7))
+        self.board[7, 4] = king
+        self.board[7, 7] = rook
+        before = self.board.pretty_board()
+
+        undo = self.board.make_move((7, 4), (7, 6))
+        self.assertIs(self.board[7, 6], king)
+        self.assertIs(self.board[7, 5], rook)
+        self.assertTrue(king.has_moved)
+        self.assertTrue(rook.has_moved)
+
+        self.board.unmake_move(undo)
+        self.assertRestored(before)
+        self.assertFalse(king.has_moved)
+        self.assertFalse(rook.has_moved)
+
+    def test_en_passant(self):
+        white_pawn = Pawn('white', (3, 3))
+        black_pawn = Pawn('black', (1, 2))
+        self.board[3, 3] = white_pawn
+        self.board[1, 2] = black_pawn
+
+        self.board.make_move((1, 2), (3, 2))
+        self.assertEqual(self.board.en_passant, (2, 2))
+        before = self.board.pretty_board()
+        zobrist = self.board.zobrist
+
+        undo = self.board.make_move((3, 3), (2, 2))
+        self.assertIsNone(self.board[3, 2])
+        self.assertIs(undo.captured, black_pawn)
+        self.assertIsNone(self.board.en_passant)
+
+        self.board.unmake_move(undo)
+        self.assertRestored(before)
+        self.assertEqual(self.board.en_passant, (2, 2))
+        self.assertEqual(self.board.zobrist, zobrist)
+
+    def test_en_passant_expires_after_any_move(self):
+        self.board[3, 3] = Pawn('white', (3, 3))
+        self.board[1, 2] = Pawn('black', (1, 2))
+        self.board[7, 1] = Knight('white', (7, 1))
+        self.board[0, 6] = Knight('black', (0, 6))
+
+        self.board.make_move((1, 2), (3, 2))
+        self.board.make_move((7, 1), (5, 2))
+        self.board.make_move((0, 6), (2, 5))
+        self.assertIsNone(self.board.en_passant)
+        self.assertNotIn((2, 2), self.board.pseudo_legal_moves(3, 3))
+        self.assertEqual(self.board.zobrist, self.board.compute_zobrist())
+
+    def test_promotion(self):
+        pawn = Pawn('white', (1, 0))
+        pawn.already_moved = True
+        self.board[1, 0] = pawn
+        before = self.board.pretty_board()
+
+        for promotion, cls in (('Q', Queen), ('N', Knight), (None, Queen)):
+            with self.subTest(promotion=promotion):
+                undo = self.board.make_move((1, 0), (0, 0), promotion)
+                self.assertIsInstance(self.board[0, 0], cls)
+                self.board.unmake_move(undo)
+                self.assertRestored(before)
+                self.assertIs(self.board[1, 0], pawn)
+                self.assertTrue(pawn.already_moved)
+
+
+class TestBitboards(unittest.TestCase):
+    def setUp(self):
+        self.board = Board()
+        self.board.start_board()
+
+    def assertMasksMatchGrid(self):
+        expected = Board()
+        expected.board = [row[:] for row in self.board.board]
+        expected.sync_bitboards()
+        self.assertEqual(self.board.bitboards, expected.bitboards)
+        self.assertEqual(self.board.occupancy, expected.occupancy)
+
+    def test_start_position_masks(self):
+        self.assertEqual(bin(self.board.occupied).count('1'), 32)
+        self.assertEqual(self.board.king_square('white'), (7, 4))
+        self.assertEqual(self.board.king_square('black'), (0, 4))
+
+    def test_masks_follow_make_unmake(self):
+        moves = [((6, 4), (4, 4)), ((1, 3), (3, 3)), ((4, 4), (3, 3)), ((0, 3), (3, 3))]
+        undos = []
+        for from_square, to_square in moves:
+            undos.append(self.board.make_move(from_square, to_square))
+            self.assertMasksMatchGrid()
+        for undo in reversed(undos):
+            self.board.unmake_move(undo)
+            self.assertMasksMatchGrid()
+
+    def test_pseudo_legal_moves_match_pieces(self):
+        self.board.make_move((6, 4), (4, 4))
+        self.board.make_move((1, 3), (3, 3))
+        for row in range(8):
+            for col in range(8):
+                piece = self.board[row, col]
+                if piece is None or isinstance(piece, King):
+                    continue
+                with self.subTest(square=(row, col)):
+                    self.assertCountEqual(
+                        self.board.pseudo_legal_moves(row, col),
+                        piece.show_possible_moves(self.board.board)
+                    )
+
+    def test_pseudo_legal_castling_matches_movegen(self):
+        for fen, castles in (('r3k2r/8/8/8/8/8/8/R3K2R w KQkq - 0 1', [(7, 2), (7, 6)]),
+                             ('r3kr2/8/8/8/8/8/8/R3K2R w KQq - 0 1', [(7, 2)]),
+                             ('r3k2r/8/8/8/4r3/8/8/R3K2R w KQk - 0 1', [])):
+            with self.subTest(fen=fen):
+                self.board.load_fen(fen)
+                legal = [to_square for from_square, to_square, _ in generate_legal_moves(self.board, 'white')
+                         if from_square == (7, 4) and abs(to_square[1] - 4) == 2]
+                pseudo = [to_square for to_square in self.board.pseudo_legal_moves(7, 4)
+                          if abs(to_square[1] - 4) == 2]
+                self.assertCountEqual(legal, castles)
+                self.assertCountEqual(pseudo, castles)
+
+    def test_setitem_updates_masks(self):
+        self.board[4, 4] = Queen('white', (4, 4))
+        self.board[6, 0] = None
+        self.assertMasksMatchGrid()
+        self.assertFalse(self.board.is_in_check('black'))
+
+    def test_copy_is_independent(self):
+        self.board.make_move((6, 4), (4, 4))
+        clone = self.board.copy()
+        self.assertEqual(clone.pretty_board(), self.board.pretty_board())
+        self.assertEqual(clone.zobrist, self.board.zobrist)
+        self.assertEqual(clone.side_to_move, 'black')
+        self.assertTrue(clone[4, 4].already_moved)
+
+        clone.make_move((1, 3), (3, 3))
+        clone.make_move((4, 4), (3, 3))
+        self.assertIsInstance(self.board[4, 4], Pawn)
+        self.assertEqual(self.board[4, 4].current_square, (4, 4))
+        self.assertIsNone(self.board[3, 3])
+        self.assertMasksMatchGrid()
+
+    def test_pieces_have_no_instance_dict(self):
+        for piece in (Pawn('white', (6, 0)), Rook('black', (0, 0)), King('white', (7, 4)), Queen('black', (0, 3))):
+            with self.subTest(piece=type(piece).__name__):
+                self.assertFalse(hasattr(piece, '__dict__'))
+                clone = piece.copy()
+                self.assertIsNot(clone, piece)
+                self.assertEqual(clone.color, piece.color)
+                self.assertEqual(clone.current_square, piece.current_square)
+
+
+class TestRender(unittest.TestCase):
+    def test_render(self):
+        lines = Board().render().splitlines()
+        self.assertEqual(len(lines), 9)
+        self.assertTrue(lines[0].startswith('8|'))
+        self.assertEqual(lines[8], '  a b c d e f g h ')
+
+
+if __name__ == '__main__':
+    unittest.main()
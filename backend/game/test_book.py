@@ -0,0 +1,113 @@
+import os
+import tempfile
+import unittest
+
+from backend.game.board import Board
+from backend.game.board import START_FEN
+from backend.game.book import ENTRY_SIZE, OpeningBook, build_book, decode_move, encode_move
+from backend.game.engine import Engine
+from backend.game.index_notation import move_to_notation
+from backend.game.movegen import generate_legal_moves
+
+PGN = """[Event "Test"]
+[White "A"]
+[Black "B"]
+[Result "1-0"]
+
+1. e4 {king's pawn} e5 2. Nf3 (2. Bc4 Nf6) Nc6 3. Bb5 a6 $1 4. Ba4 Nf6 5. O-O 1-0
+
+[Event "Test"]
+[Result "1/2-1/2"]
+
+1. e4 c5 2. Nf3 d6 ; Sicilian
+3. d4 1/2-1/2
+
+[Event "Test"]
+[Result "0-1"]
+
+1. d4 d5 0-1
+
+[Event "From position"]
+[FEN "4k3/8/8/8/8/8/4P3/4K3 w - - 0 1"]
+[Result "1-0"]
+
+1. e4 1-0
+"""
+
+
+def board_from(fen=START_FEN):
+    board = Board()
+    board.load_fen(fen)
+    return board
+
+
+class TestBookMoves(unittest.TestCase):
+    def test_castling_is_encoded_as_king_takes_rook(self):
+        board = board_from('r3k2r/8/8/8/8/8/8/R3K2R w KQkq - 0 1')
+        short = ((7, 4), (7, 6), None)
+        code = encode_move(board, short)
+        self.assertEqual(code & 7, 7)
+        self.assertEqual(decode_move(board, code), short)
+        long = ((7, 4), (7, 2), None)
+        self.assertEqual(decode_move(board, encode_move(board, long)), long)
+
+    def test_promotion_round_trip(self):
+        board = board_from('7k/P7/8/8/8/8/8/4K3 w - - 0 1')
+        move = ((1, 0), (0, 0), 'N')
+        self.assertEqual(decode_move(board, encode_move(board, move)), move)
+
+
+class TestOpeningBook(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        pgn_path = os.path.join(self.directory.name, 'games.pgn')
+        with open(pgn_path, 'w', encoding='utf-8') as file:
+            file.write(PGN)
+        self.path = os.path.join(self.directory.name, 'book.bin')
+        self.count = build_book([pgn_path], self.path, plies=4)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_build(self):
+        self.assertEqual(os.path.getsize(self.path), self.count * ENTRY_SIZE)
+        with OpeningBook(self.path) as book:
+            self.assertEqual(len(book), self.count)
+            moves = {move_to_notation(move): weight for move, weight in book.moves(board_from())}
+        # e4: победа белых (2) и ничья (1); d4 только из проигранной партии
+        self.assertEqual(moves, {'e2e4': 3})
+
+    def test_variations_and_comments_are_skipped(self):
+        board = board_from()
+        for notation in ('e2e4', 'e7e5'):
+            moves = generate_legal_moves(board, board.side_to_move)
+            board.make_move(*next(move for move in moves if move_to_notation(move) == notation))
+        with OpeningBook(self.path) as book:
+            moves = [move_to_notation(move) for move, _ in book.moves(board)]
+        self.assertEqual(moves, ['g1f3'])
+
+    def test_plies_limit(self):
+        board = board_from('r1bqkbnr/pppp1ppp/2n5/4p3/4P3/5N2/PPPP1PPP/RNBQKB1R w KQkq - 2 3')
+        with OpeningBook(self.path) as book:
+            self.assertEqual(book.moves(board), [])
+
+    def test_engine_plays_book_move(self):
+        with OpeningBook(self.path) as book:
+            result = Engine(book=book).search(board_from())
+        self.assertEqual(move_to_notation(result.move), 'e2e4')
+        self.assertEqual(result.nodes, 0)
+
+    def test_missing_book_is_empty(self):
+        with OpeningBook(os.path.join(self.directory.name, 'missing.bin')) as book:
+            self.assertEqual(len(book), 0)
+            self.assertIsNone(book.choose(board_from()))
+
+    def test_corrupted_book(self):
+        with open(self.path, 'ab') as file:
+            file.write(b'\x00')
+        with self.assertRaises(ValueError):
+            OpeningBook(self.path)
+
+
+if __name__ == '__main__':
+    unittest.main()
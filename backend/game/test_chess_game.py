@@ -0,0 +1,124 @@
+import contextlib
+import io
+import logging
+import unittest
+
+from backend.game.chess_game import ChessGame
+
+
+class TestDraws(unittest.TestCase):
+    def setUp(self):
+        self.game = ChessGame(60, 0)
+
+    def play(self, *moves):
+        for from_square, to_square in moves:
+            self.assertTrue(self.game.move(from_square, to_square), f"{from_square}-{to_square}")
+
+    def test_threefold_repetition(self):
+        self.game.start_game()
+        shuffle = (('g1', 'f3'), ('g8', 'f6'), ('f3', 'g1'), ('f6', 'g8'))
+        self.play(*shuffle)
+        self.assertIsNone(self.game.result)
+        self.play(*shuffle[:3])
+        self.assertIsNone(self.game.result)
+        self.play(shuffle[3])
+        self.assertEqual(self.game.result, "Троекратное повторение. Ничья!")
+        self.assertFalse(self.game.move('e2', 'e4'))
+
+    def test_repetition_counts_position_after_double_push(self):
+        self.game.start_game()
+        # После 1.e4 взять на проходе нечем, поэтому позиция совпадает с повторами без поля e3
+        self.play(('e2', 'e4'))
+        shuffle = (('g8', 'f6'), ('g1', 'f3'), ('f6', 'g8'), ('f3', 'g1'))
+        self.play(*shuffle)
+        self.assertIsNone(self.game.result)
+        self.play(*shuffle)
+        self.assertEqual(self.game.result, "Троекратное повторение. Ничья!")
+
+    def test_start_game_resets_a_finished_game(self):
+        self.game.load_fen('4k3/8/8/8/3pP3/8/8/R3K3 b Q e3 40 30')
+        self.game.white_timer, self.game.black_timer = 5, 7
+        self.play(('e8', 'd7'), ('a1', 'a7'))
+        self.game.result = "Мат. Победа белых!"
+        start = self.game.version
+
+        self.game.start_game()
+        fresh = ChessGame(60, 0)
+        fresh.start_game()
+        self.assertIsNone(self.game.result)
+        self.assertEqual(self.game.fen(), fresh.fen())
+        self.assertEqual((self.game.white_timer, self.game.black_timer), (60, 60))
+        self.assertEqual((self.game.current_player_color, self.game.moves), ('white', []))
+        self.assertEqual(self.game.changes_since(start), None)
+        self.assertEqual(self.game.changes_since(self.game.version), [])
+        self.play(('e2', 'e4'))
+
+    def test_repetitions_reset_after_pawn_move(self):
+        self.game.start_game()
+        self.play(('g1', 'f3'), ('g8', 'f6'), ('f3', 'g1'), ('f6', 'g8'), ('e2', 'e3'))
+        self.assertEqual(self.game.repetitions, {self.game.position_hash: 1})
+
+    def test_fifty_move_rule(self):
+        self.game.load_fen('4k3/8/8/8/8/8/R7/4K3 w - - 98 80')
+        self.play(('a2', 'a3'))
+        self.assertIsNone(self.game.result)
+        self.play(('e8', 'd8'))
+        self.assertEqual(self.game.result, "Правило 50 ходов. Ничья!")
+
+    def test_checkmate_has_priority_over_fifty_move_rule(self):
+        self.game.load_fen('k7/8/1K6/8/8/8/8/7R w - - 99 80')
+        self.play(('h1', 'h8'))
+        self.assertEqual(self.game.result, "Мат. Победа белых!")
+
+    def test_insufficient_material_after_capture(self):
+        self.game.load_fen('4k3/8/8/8/8/8/3r4/4K3 w - - 0 1')
+        self.assertFalse(self.game.is_insufficient_material())
+        self.play(('e1', 'd2'))
+        self.assertEqual(self.game.result, "Недостаточно материала. Ничья!")
+
+    def test_insufficient_material_signatures(self):
+        cases = {
+            '4k3/8/8/8/8/8/8/4KN2 w - - 0 1': True,
+            '4k3/8/8/8/8/8/8/4KB2 w - - 0 1': True,
+            '2b1k3/8/8/8/8/8/8/4KB2 w - - 0 1': True,
+            '1b2k3/8/8/8/8/8/8/4KB2 w - - 0 1': False,
+            '4k3/8/8/8/8/8/8/3NKN2 w - - 0 1': False,
+            '4k3/8/8/8/8/8/P7/4K3 w - - 0 1': False,
+        }
+        for fen, expected in cases.items():
+            with self.subTest(fen=fen):
+                self.game.load_fen(fen)
+                self.assertEqual(self.game.is_insufficient_material(), expected)
+
+    def test_material_follows_promotion(self):
+        self.game.load_fen('7k/P7/8/8/8/8/8/4K3 w - - 0 1')
+        self.assertTrue(self.game.move('a7', 'a8', 'N'))
+        self.assertEqual(self.game.material[0], 0)
+        self.assertEqual(self.game.material[1], 1)
+        self.assertEqual(self.game.result, "Недостаточно материала. Ничья!")
+
+
+class TestQuietGame(unittest.TestCase):
+    def play(self):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            game = ChessGame(60, 0)
+            game.start_game()
+            for move in (('f2', 'f3'), ('e7', 'e5'), ('g2', 'g4'), ('a1', 'a5'), ('d8', 'h4')):
+                game.move(*move)
+        self.assertEqual(game.result, "Мат. Победа черных!")
+        return output.getvalue()
+
+    def test_moves_do_not_print(self):
+        self.assertEqual(self.play(), '')
+
+    def test_board_is_logged_at_debug(self):
+        with self.assertLogs('backend.game.chess_game', logging.DEBUG) as logs:
+            self.assertEqual(self.play(), '')
+        self.assertIn('New game', logs.output[0])
+        self.assertIn('white->black', logs.output[1])
+        self.assertIn('Checkmate! Black wins.', logs.output[-1])
+
+
+if __name__ == '__main__':
+    unittest.main()
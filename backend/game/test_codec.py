@@ -0,0 +1,120 @@
+import unittest
+
+from backend.game.board import Board
+from backend.game.chess_game import ChessGame
+from backend.game.codec import PACKED_SIZE, pack_position, unpack_position
+from backend.game.perft import STANDARD_POSITIONS
+
+
+class TestFen(unittest.TestCase):
+    def test_round_trip_standard_positions(self):
+        for name, (fen, _) in STANDARD_POSITIONS.items():
+            with self.subTest(position=name):
+                board = Board()
+                clocks = board.load_fen(fen)
+                self.assertEqual(board.fen(*clocks), fen)
+
+    def test_start_board_export(self):
+        board = Board()
+        board.start_board()
+        self.assertEqual(board.fen(), STANDARD_POSITIONS['start'][0])
+
+    def test_en_passant_and_castling_after_moves(self):
+        board = Board()
+        board.start_board()
+        board.make_move((6, 4), (4, 4))
+        self.assertEqual(board.fen(), 'rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b KQkq e3 0 1')
+        board.make_move((0, 7), (2, 7))
+        board.make_move((7, 7), (5, 7))
+        self.assertEqual(board.fen().split()[2:4], ['Qq', '-'])
+
+    def test_invalid_fen(self):
+        for fen in ('8/8/8 w - - 0 1', '8/8/8/8/8/8/8/8 x - - 0 1', '4k3/8/8/8/8/8/8/4K3 w - e3 0 1',
+                    '8/8/8/8/8/8/8/8 w - - zero 1', '4k3/8/8/8/8/8/8/4K3 w - - -1 1', '4k3/8/8/8/8/8/8/4K3 w - - 0 0',
+                    # Нет короля, два короля, пешки на крайних горизонталях
+                    '8/8/8/8/8/8/8/4K3 w - - 0 1', '4k3/8/8/8/8/8/8/3KK3 w - - 0 1',
+                    '4k2P/8/8/8/8/8/8/4K3 w - - 0 1', '4k3/8/8/8/8/8/8/p3K3 w - - 0 1'):
+            with self.subTest(fen=fen):
+                with self.assertRaises(ValueError):
+                    Board().load_fen(fen)
+
+
+class TestPackedPosition(unittest.TestCase):
+    def test_round_trip_standard_positions(self):
+        for name, (fen, _) in STANDARD_POSITIONS.items():
+            with self.subTest(position=name):
+                board = Board()
+                clocks = board.load_fen(fen)
+                packed = pack_position(board, *clocks)
+                self.assertEqual(len(packed), PACKED_SIZE)
+                restored, halfmove_clock, fullmove_number = unpack_position(packed)
+                self.assertEqual(restored.fen(halfmove_clock, fullmove_number), fen)
+                self.assertEqual(restored.zobrist, board.zobrist)
+
+    def test_en_passant_is_kept(self):
+        board = Board()
+        board.load_fen('rnbqkbnr/ppp1p1pp/8/3pPp2/8/8/PPPP1PPP/RNBQKBNR w KQkq f6 0 3')
+        restored, _, _ = unpack_position(pack_position(board, 0, 3))
+        self.assertEqual(restored.en_passant, (2, 5))
+        self.assertIn((2, 5), restored.pseudo_legal_moves(3, 4))
+
+    def test_corrupted_data(self):
+        with self.assertRaises(ValueError):
+            unpack_position(b'\x00' * (PACKED_SIZE - 1))
+        board = Board()
+        board.start_board()
+        packed = bytearray(pack_position(board))
+        packed[8] = 0xCC
+        with self.assertRaises(ValueError):
+            unpack_position(bytes(packed))
+
+    def test_counters_out_of_range(self):
+        board = Board()
+        board.start_board()
+        self.assertEqual(unpack_position(pack_position(board, 300, 0xFFFF))[1:], (255, 0xFFFF))
+        for halfmove_clock, fullmove_number in ((-1, 1), (0, 0), (0, 0x10000)):
+            with self.subTest(halfmove_clock=halfmove_clock, fullmove_number=fullmove_number):
+                with self.assertRaises(ValueError):
+                    pack_position(board, halfmove_clock, fullmove_number)
+
+
+class TestChessGameSerialization(unittest.TestCase):
+    def test_clocks_follow_moves(self):
+        game = ChessGame(60, 0)
+        game.start_game()
+        for from_square, to_square in (('g1', 'f3'), ('b8', 'c6'), ('e2', 'e4')):
+            self.assertTrue(game.move(from_square, to_square))
+        self.assertEqual(game.fen(), 'r1bqkbnr/pppppppp/2n5/8/4P3/5N2/PPPP1PPP/RNBQKB1R b KQkq e3 0 2')
+        game.move('g8', 'f6')
+        self.assertEqual(game.fen().split()[4:], ['1', '3'])
+
+    def test_load_fen_and_packed(self):
+        fen = STANDARD_POSITIONS['position4'][0]
+        game = ChessGame(60, 0)
+        game.load_fen(fen)
+        self.assertEqual(game.current_player_color, 'white')
+        self.assertEqual(game.white_king, (7, 6))
+        self.assertEqual(game.fen(), fen)
+
+        other = ChessGame(60, 0)
+        other.start_game()
+        other.load_packed(game.pack())
+        self.assertEqual(other.fen(), fen)
+        self.assertEqual(sum(len(targets) for targets in other.legal_moves().values()), 6)
+
+    def test_impossible_positions_are_rejected(self):
+        game = ChessGame(60, 0)
+        game.start_game()
+        fen = game.fen()
+        for invalid in ('8/8/8/8/8/8/R7/4K3 w - - 0 1', 'P3k3/8/8/8/8/8/8/4K3 b - - 0 1'):
+            with self.subTest(fen=invalid):
+                with self.assertRaises(ValueError):
+                    game.load_fen(invalid)
+                self.assertEqual(game.fen(), fen)
+        game.load_fen('4k3/8/8/8/8/8/8/4K3 w - - 0 70000')
+        with self.assertRaises(ValueError):
+            game.pack()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+import unittest
+
+from backend.game.board import Board
+from backend.game.chess_game import ChessGame
+from backend.game.engine import MATE_THRESHOLD, Engine
+from backend.game.index_notation import move_to_notation
+
+
+class TestEngine(unittest.TestCase):
+    def search(self, fen, **limits):
+        board = Board()
+        board.load_fen(fen)
+        before = board.fen()
+        result = Engine(**limits).search(board)
+        self.assertEqual(board.fen(), before)
+        return result
+
+    def test_finds_mate_in_one(self):
+        result = self.search('6k1/5ppp/8/8/8/8/5PPP/3R2K1 w - - 0 1', time_limit=5.0)
+        self.assertEqual(move_to_notation(result.move), 'd1d8')
+        self.assertGreaterEqual(result.score, MATE_THRESHOLD)
+
+    def test_finds_mate_in_two(self):
+        # Спёртый мат: 1. Qg8+ Rxg8 2. Nf7#
+        result = self.search('1r5k/6pp/7N/3Q4/8/8/8/6K1 w - - 0 1', time_limit=5.0, node_limit=100_000)
+        self.assertGreaterEqual(result.score, MATE_THRESHOLD)
+        self.assertEqual(move_to_notation(result.move), 'd5g8')
+
+    def test_wins_hanging_queen(self):
+        result = self.search('4k3/8/8/3q4/8/8/3R4/3K4 w - - 0 1', max_depth=3)
+        self.assertEqual(move_to_notation(result.move), 'd2d5')
+
+    def test_avoids_losing_capture(self):
+        # Взятие защищённой пешки ферзём теряет ферзя
+        result = self.search('4k3/8/2p5/3p4/8/8/8/3QK3 w - - 0 1', max_depth=3)
+        self.assertNotEqual(move_to_notation(result.move), 'd1d5')
+
+    def test_node_budget_is_respected(self):
+        result = self.search('r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1',
+                             node_limit=2_000, time_limit=10.0)
+        self.assertIsNotNone(result.move)
+        self.assertLessEqual(result.nodes, 2_000)
+
+    def test_first_iteration_ignores_the_clock(self):
+        result = self.search('r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1',
+                             time_limit=1e-6)
+        self.assertGreaterEqual(result.depth, 1)
+
+    def test_quiescence_is_bounded(self):
+        # Без ограничения глубины и delta pruning одна итерация на этой позиции занимала ~7800 узлов
+        result = self.search('r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1',
+                             max_depth=1, time_limit=10.0)
+        self.assertEqual(result.depth, 1)
+        self.assertLess(result.nodes, 2_000)
+
+    def test_no_moves(self):
+        result = self.search('k7/1R6/1K6/8/8/8/8/8 b - - 0 1')
+        self.assertIsNone(result.move)
+
+
+class TestChessGameEngine(unittest.TestCase):
+    def test_engine_replies_for_its_side(self):
+        game = ChessGame(60, 0)
+        game.set_engine('black', Engine(max_depth=2))
+        game.start_game()
+        self.assertIsNone(game.engine_move())
+        self.assertTrue(game.move('e2', 'e4'))
+        self.assertTrue(game.is_engine_turn)
+        reply = game.engine_move()
+        self.assertIsNotNone(reply)
+        self.assertEqual(game.current_player_color, 'white')
+        self.assertFalse(game.is_engine_turn)
+
+    def test_engine_plays_white_first(self):
+        game = ChessGame(60, 0)
+        game.set_engine('white', Engine(max_depth=1))
+        game.start_game()
+        self.assertIsNotNone(game.engine_move())
+        self.assertEqual(game.current_player_color, 'black')
+
+
+if __name__ == '__main__':
+    unittest.main()
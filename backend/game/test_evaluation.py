@@ -0,0 +1,66 @@
+import random
+import unittest
+
+from backend.game.board import Board
+from backend.game.engine import evaluate
+from backend.game.evaluation import MAX_PHASE, compute_scores, tapered
+from backend.game.movegen import generate_legal_moves
+
+
+def board_from(fen):
+    board = Board()
+    board.load_fen(fen)
+    return board
+
+
+class TestEvaluation(unittest.TestCase):
+    def scores(self, board):
+        return board.mg_score, board.eg_score, board.phase
+
+    def test_start_position_is_balanced(self):
+        board = Board()
+        board.start_board()
+        self.assertEqual(self.scores(board), (0, 0, MAX_PHASE))
+        self.assertEqual(evaluate(board), 0)
+
+    def test_incremental_scores_match_full_recompute(self):
+        rng = random.Random(11)
+        for fen in ('rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1',
+                    'r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1',
+                    'n1n5/PPPk4/8/8/8/8/4Kppp/5N1N b - - 0 1'):
+            board = board_from(fen)
+            undos = []
+            history = [self.scores(board)]
+            for _ in range(80):
+                moves = generate_legal_moves(board, board.side_to_move)
+                if not moves:
+                    break
+                undos.append(board.make_move(*rng.choice(moves)))
+                self.assertEqual(self.scores(board), compute_scores(board.bitboards))
+                history.append(self.scores(board))
+            for undo in reversed(undos):
+                history.pop()
+                board.unmake_move(undo)
+                self.assertEqual(self.scores(board), history[-1])
+
+    def test_mirrored_position_has_opposite_score(self):
+        white = board_from('r1bqkb1r/pppp1ppp/2n2n2/4p3/2B1P3/5N2/PPPP1PPP/RNBQK2R w KQkq - 4 4')
+        black = board_from('rnbqk2r/pppp1ppp/5n2/2b1p3/4P3/2N2N2/PPPP1PPP/R1BQKB1R b KQkq - 4 4')
+        self.assertEqual(white.mg_score, -black.mg_score)
+        self.assertEqual(white.eg_score, -black.eg_score)
+        self.assertEqual(evaluate(white), evaluate(black))
+
+    def test_copy_keeps_scores(self):
+        board = board_from('4k3/8/8/8/8/8/3Q4/4K3 w - - 0 1')
+        self.assertEqual(self.scores(board.copy()), self.scores(board))
+        self.assertGreater(evaluate(board), 0)
+
+    def test_tapered_interpolates_by_phase(self):
+        self.assertEqual(tapered(100, 40, MAX_PHASE), 100)
+        self.assertEqual(tapered(100, 40, MAX_PHASE + 4), 100)
+        self.assertEqual(tapered(100, 40, 0), 40)
+        self.assertEqual(tapered(100, 40, MAX_PHASE // 2), 70)
+
+
+if __name__ == '__main__':
+    unittest.main()
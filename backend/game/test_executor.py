@@ -0,0 +1,36 @@
+import asyncio
+import threading
+import unittest
+
+from backend.game.executor import BoundedExecutor
+
+
+class TestBoundedExecutor(unittest.TestCase):
+    def test_runs_in_a_worker_thread(self):
+        executor = BoundedExecutor(2)
+
+        async def run():
+            return await executor.run(lambda a, b: (a + b, threading.current_thread().name), 2, 3)
+
+        total, thread = asyncio.run(run())
+        executor.shutdown()
+        self.assertEqual(total, 5)
+        self.assertTrue(thread.startswith('chess-worker'))
+
+    def test_errors_are_raised_to_the_caller(self):
+        executor = BoundedExecutor(1)
+
+        async def run():
+            await executor.run(int, 'not a number')
+
+        with self.assertRaises(ValueError):
+            asyncio.run(run())
+        executor.shutdown()
+
+    def test_needs_a_worker(self):
+        with self.assertRaises(ValueError):
+            BoundedExecutor(0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+import asyncio
+import json
+import unittest
+
+from backend.game.hub import Frame, GameHub
+
+
+class FakeSocket:
+    def __init__(self, fail=False, stall=False):
+        self.fail = fail
+        self.stall = stall
+        self.sent = []
+        self.closed = None
+
+    async def send_text(self, text):
+        if self.fail:
+            raise RuntimeError("closed")
+        if self.stall:
+            await asyncio.Event().wait()
+        self.sent.append(json.loads(text))
+
+    async def close(self, code=1000, reason=None):
+        self.closed = code
+
+
+async def settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+class TestFrame(unittest.TestCase):
+    def test_extend_keeps_the_encoded_state(self):
+        frame = Frame.encode(1, {'board': [['♙']], 'result': None})
+        self.assertEqual(frame.body, frame.text.encode())
+        self.assertEqual(json.loads(frame.extend(message='ok', engine_move=None)),
+                         {'message': 'ok', 'engine_move': None, 'board': [['♙']], 'result': None})
+        self.assertIs(frame.extend(), frame.body)
+
+
+class TestGameHub(unittest.TestCase):
+    def test_publish_reaches_only_the_game_channel(self):
+        async def run():
+            hub = GameHub()
+            first, second, other = FakeSocket(), FakeSocket(), FakeSocket()
+            subscribers = [hub.subscribe('a', first), hub.subscribe('a', second), hub.subscribe('b', other)]
+            self.assertEqual(hub.publish('a', Frame.encode(1, {'n': 1})), 2)
+            await settle()
+            self.assertEqual((first.sent, second.sent, other.sent), ([{'n': 1}], [{'n': 1}], []))
+            for uuid, subscriber in zip('aab', subscribers):
+                hub.unsubscribe(uuid, subscriber)
+            self.assertEqual(hub.subscribers('a'), 0)
+
+        asyncio.run(run())
+
+    def test_failed_socket_is_unsubscribed(self):
+        async def run():
+            hub = GameHub()
+            alive = hub.subscribe('a', FakeSocket())
+            hub.subscribe('a', FakeSocket(fail=True))
+            hub.publish('a', Frame.encode(1, {}))
+            await settle()
+            self.assertEqual(hub.subscribers('a'), 1)
+            hub.unsubscribe('a', alive)
+
+        asyncio.run(run())
+
+    def test_slow_consumer_is_dropped(self):
+        async def run():
+            hub = GameHub(queue_size=2)
+            slow_socket, fast_socket = FakeSocket(stall=True), FakeSocket()
+            hub.subscribe('a', slow_socket)
+            fast = hub.subscribe('a', fast_socket)
+            delivered = []
+            for version in range(4):
+                delivered.append(hub.publish('a', Frame.encode(version, {'v': version})))
+                await settle()
+            # Первый кадр застрял в отправке, ещё два заняли очередь, четвёртый не поместился
+            self.assertEqual(delivered, [2, 2, 2, 1])
+            self.assertEqual(hub.subscribers('a'), 1)
+            self.assertEqual(slow_socket.closed, 1013)
+            self.assertEqual([message['v'] for message in fast_socket.sent], [0, 1, 2, 3])
+            hub.unsubscribe('a', fast)
+
+        asyncio.run(run())
+
+
+class TestLongPoll(unittest.TestCase):
+    def test_wait_for_wakes_on_notify(self):
+        async def run():
+            hub = GameHub()
+            state = {'version': 1}
+            waiter = asyncio.create_task(hub.wait_for('a', lambda: state['version'] > 1, 5))
+            await settle()
+            await hub.notify('a')
+            await settle()
+            self.assertFalse(waiter.done())
+            state['version'] = 2
+            await hub.notify('a')
+            self.assertTrue(await asyncio.wait_for(waiter, 1))
+            self.assertFalse(await hub.wait_for('a', lambda: False, 0.01))
+
+        asyncio.run(run())
+
+
+if __name__ == '__main__':
+    unittest.main()
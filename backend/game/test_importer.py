@@ -0,0 +1,116 @@
+import io
+import os
+import random
+import tempfile
+import unittest
+
+from sqlalchemy import create_engine, select
+
+from backend.game.board import START_FEN, Board
+from backend.game.importer import ImportedGames, import_pgn, split_games
+from backend.game.movegen import generate_legal_moves
+from backend.game.pgn import move_to_san, read_games, replay, san_to_move
+
+GOOD = """[Event "Scholar"]
+[White "A"]
+[Black "B"]
+[Result "1-0"]
+
+1. e4 e5 2. Qh5 Nc6 3. Bc4 Nf6 4. Qxf7# 1-0
+
+"""
+
+ILLEGAL = """[Event "Illegal"]
+[Result "*"]
+
+1. e4 e5 2. Ke3 *
+
+"""
+
+SET_UP = """[Event "Set up"]
+[FEN "4k3/P7/8/8/8/8/8/4K3 w - - 0 60"]
+[Result "1/2-1/2"]
+
+60. a8=Q+ Kd7 1/2-1/2
+
+"""
+
+
+class TestSplitGames(unittest.TestCase):
+    def test_chunks_keep_whole_games(self):
+        text = GOOD + ILLEGAL + SET_UP + GOOD + ILLEGAL
+        chunks = list(split_games(io.StringIO(text), 2))
+        self.assertEqual([first for first, _ in chunks], [1, 3, 5])
+        counts = [len(list(read_games(chunk.splitlines()))) for _, chunk in chunks]
+        self.assertEqual(counts, [2, 2, 1])
+
+
+class TestReplay(unittest.TestCase):
+    def test_replay(self):
+        (game,) = read_games(io.StringIO(SET_UP))
+        board, moves, halfmove_clock, fullmove_number = replay(game)
+        self.assertEqual(moves, [((1, 0), (0, 0), 'Q'), ((0, 4), (1, 3), None)])
+        self.assertEqual(board.fen(halfmove_clock, fullmove_number), 'Q7/3k4/8/8/8/8/8/4K3 w - - 1 61')
+
+    def test_illegal_move_reports_ply(self):
+        (game,) = read_games(io.StringIO(ILLEGAL))
+        with self.assertRaisesRegex(ValueError, 'ply 3'):
+            replay(game)
+
+    def test_fast_san_matches_legal_moves(self):
+        rng = random.Random(7)
+        for _ in range(20):
+            board = Board()
+            board.load_fen(START_FEN)
+            for _ in range(60):
+                legal = generate_legal_moves(board, board.side_to_move)
+                if not legal:
+                    break
+                for move in legal:
+                    self.assertEqual(san_to_move(board, move_to_san(board, move, legal)), move)
+                board.make_move(*rng.choice(legal))
+
+
+class TestImportPgn(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'games.pgn')
+        with open(self.path, 'w', encoding='utf-8') as file:
+            file.write(GOOD + ILLEGAL + SET_UP + GOOD)
+        self.url = f"sqlite:///{os.path.join(self.directory.name, 'archive.db')}"
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def rows(self):
+        engine = create_engine(self.url)
+        with engine.connect() as connection:
+            rows = connection.execute(select(ImportedGames).order_by(ImportedGames.id)).all()
+        engine.dispose()
+        return rows
+
+    def check_import(self, workers):
+        report = import_pgn([self.path], self.url, workers=workers, games_per_chunk=1, batch_size=2)
+        self.assertEqual((report.games, report.imported), (4, 3))
+        (error,) = report.errors
+        self.assertEqual((error.source, error.index), ('games.pgn', 2))
+        self.assertIn('Ke3', error.message)
+
+        rows = self.rows()
+        self.assertEqual([row.result for row in rows], [1, 3, 1])
+        self.assertEqual(rows[0].moves, 'e2e4 e7e5 d1h5 b8c6 f1c4 g8f6 h5f7')
+        self.assertEqual(rows[0].ply_count, 7)
+        self.assertIsNone(rows[0].start_fen)
+        self.assertEqual(rows[1].start_fen, '4k3/P7/8/8/8/8/8/4K3 w - - 0 60')
+        self.assertEqual(rows[1].moves, 'a7a8q e8d7')
+        self.assertEqual(rows[1].final_fen, 'Q7/3k4/8/8/8/8/8/4K3 w - - 1 61')
+
+    def test_in_process(self):
+        self.check_import(0)
+
+    def test_process_pool(self):
+        self.check_import(2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,286 @@
+import asyncio
+import json
+import threading
+import time
+import unittest
+from unittest import mock
+
+import httpx
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+
+from backend.game import move_handler
+from backend.game.chess_game import ChessGame
+from backend.game.engine import Engine
+from api_v1.user.views import create_access_token
+
+
+class TestStateFrame(unittest.TestCase):
+    def test_frame_is_built_once_per_version(self):
+        game = ChessGame(60, 0)
+        game.start_game()
+        frame = move_handler.state_frame('test-frame', game)
+        self.assertIs(move_handler.state_frame('test-frame', game), frame)
+        game.white = 1
+        with_player = move_handler.state_frame('test-frame', game)
+        self.assertIsNot(with_player, frame)
+        self.assertTrue(game.move('e2', 'e4'))
+        moved = json.loads(move_handler.state_frame('test-frame', game).text)
+        self.assertEqual((moved['current_turn'], moved['last_move'], moved['white']), ('black', 'e2e4', 1))
+        move_handler.state_frames.pop('test-frame')
+
+
+def play(game, *moves):
+    for move in moves:
+        assert game.move(*move), move
+
+
+class TestStateUpdate(unittest.TestCase):
+    def setUp(self):
+        self.game = ChessGame(60, 0)
+        self.game.start_game()
+
+    def test_unchanged_and_delta(self):
+        game = self.game
+        start = game.version
+        self.assertEqual(move_handler.state_update(game, start)['type'], 'unchanged')
+        play(game, ('g1', 'f3'), ('g8', 'f6'), ('f3', 'g1'))
+        update = move_handler.state_update(game, start)
+        self.assertEqual((update['type'], update['from'], update['version']), ('delta', start, start + 3))
+        self.assertEqual([(move['from'], move['to']) for move in update['moves']],
+                         [('g1', 'f3'), ('g8', 'f6'), ('f3', 'g1')])
+        # Клетка упоминается один раз, с последним содержимым
+        self.assertEqual(update['changes'], [['g1', '♘'], ['f3', None], ['g8', None], ['f6', '♞']])
+
+    def test_castling_en_passant_and_promotion(self):
+        game = self.game
+        game.load_fen('4k3/1P6/8/3pP3/8/8/8/4K2R w K d6 0 1')
+        play(game, ('e1', 'g1'))
+        update = move_handler.state_update(game, game.version - 1)
+        self.assertEqual(update['moves'][0]['rook'], ['h1', 'f1'])
+        self.assertEqual(update['changes'], [['e1', None], ['h1', None], ['f1', '♖'], ['g1', '♔']])
+
+        game.load_fen('4k3/1P6/8/3pP3/8/8/8/4K3 w - d6 0 1')
+        play(game, ('e5', 'd6'), ('e8', 'f7'), ('b7', 'b8', 'N'))
+        update = move_handler.state_update(game, game.version - 3)
+        self.assertEqual(update['changes'], [['e5', None], ['d5', None], ['d6', '♙'], ['e8', None],
+                                             ['f7', '♚'], ['b7', None], ['b8', '♘']])
+        self.assertEqual(update['moves'][2]['promotion'], 'N')
+
+    def test_snapshot_when_too_far_behind(self):
+        game = self.game
+        before_new_game = game.version - 1
+        for _ in range(20):
+            play(game, ('g1', 'f3'), ('g8', 'f6'), ('f3', 'g1'), ('f6', 'g8'))
+            game.repetitions.clear()
+        for since in (before_new_game, game.version - 70, game.version + 1):
+            update = move_handler.state_update(game, since)
+            self.assertEqual(update['type'], 'snapshot')
+            self.assertEqual(update['fen'], game.fen())
+        self.assertEqual(move_handler.state_update(game, game.version - 64)['type'], 'delta')
+
+
+class TestGameSetup(unittest.TestCase):
+    def test_engine_cannot_take_a_human_side(self):
+        app = FastAPI()
+        app.include_router(move_handler.router, prefix='/chess')
+        client = TestClient(app)
+        token = create_access_token({'sub': '1'})
+        for side in ('white', 'black'):
+            with self.subTest(side=side):
+                settings = {'game_time': 10, 'increment': 0, 'white': side == 'white',
+                            'black': side == 'black', 'engine': side}
+                response = client.post('/chess/setup', json=settings, headers={'Authorization': f'Bearer {token}'})
+                self.assertEqual(response.status_code, 422)
+        setup = move_handler.GameSetup(game_time=10, increment=0, white=True, black=False, engine='black')
+        self.assertEqual(setup.engine, 'black')
+
+
+class TestGameSocket(unittest.TestCase):
+    def setUp(self):
+        self.app = FastAPI()
+        self.app.include_router(move_handler.router, prefix='/chess')
+        self.client = TestClient(self.app)
+        game = ChessGame(60, 0)
+        game.start_game()
+        game.white, game.black = 1, 2
+        move_handler.active_games['test-ws'] = game
+
+    def tearDown(self):
+        move_handler.active_games.pop('test-ws', None)
+        move_handler.state_frames.pop('test-ws', None)
+        move_handler.update_frames.pop('test-ws', None)
+        move_handler.game_locks.pop('test-ws', None)
+
+    def url(self, user=None):
+        if user is None:
+            return '/chess/test-ws/ws'
+        return f"/chess/test-ws/ws?token={create_access_token({'sub': str(user)})}"
+
+    def test_move_is_pushed_to_players_and_spectators(self):
+        with self.client.websocket_connect(self.url(1)) as white, \
+                self.client.websocket_connect(self.url(2)) as black, \
+                self.client.websocket_connect(self.url()) as spectator:
+            for socket in (white, black, spectator):
+                state = socket.receive_json()
+                self.assertEqual((state['type'], state['current_turn']), ('state', 'white'))
+            version = state['version']
+            self.assertEqual(self.client.get('/chess/test-ws/').json()['version'], version)
+
+            black.send_json({'type': 'move', 'start': 'e7', 'end': 'e5'})
+            self.assertEqual(black.receive_json()['type'], 'error')
+            spectator.send_json({'type': 'move', 'start': 'e2', 'end': 'e4'})
+            self.assertEqual(spectator.receive_json()['type'], 'error')
+            white.send_json({'type': 'move', 'start': 'e2', 'end': 'e5'})
+            self.assertEqual(white.receive_json()['message'], 'Невозможный ход')
+            white.send_text('not json')
+            self.assertEqual(white.receive_json()['type'], 'error')
+
+            white.send_json({'type': 'move', 'start': 'e2', 'end': 'e4'})
+            for socket in (white, black, spectator):
+                update = socket.receive_json()
+                self.assertEqual((update['type'], update['current_turn']), ('delta', 'black'))
+                self.assertEqual(update['changes'], [['e2', None], ['e4', '♙']])
+            self.assertEqual(move_handler.hub.subscribers('test-ws'), 3)
+            polled = self.client.get(f'/chess/test-ws/?since={version}').json()
+            self.assertEqual((polled['type'], polled['from'], polled['version']), ('delta', version, version + 1))
+        self.assertEqual(move_handler.hub.subscribers('test-ws'), 0)
+
+    def test_reconnect_resumes_from_version(self):
+        game = move_handler.active_games['test-ws']
+        version = game.version
+        game.move('e2', 'e4')
+        with self.client.websocket_connect(f'{self.url()}?since={version}') as spectator:
+            update = spectator.receive_json()
+        self.assertEqual((update['type'], update['from'], update['version']), ('delta', version, version + 1))
+        self.assertEqual(update['changes'], [['e2', None], ['e4', '♙']])
+        with self.client.websocket_connect(f'{self.url()}?since={game.version}') as spectator:
+            self.assertEqual(spectator.receive_json()['type'], 'unchanged')
+
+    def test_conditional_get(self):
+        first = self.client.get('/chess/test-ws/')
+        etag = first.headers['etag']
+        cached = self.client.get('/chess/test-ws/', headers={'If-None-Match': etag})
+        self.assertEqual((cached.status_code, cached.content, cached.headers['etag']), (304, b'', etag))
+
+        with mock.patch.object(move_handler.hub, 'wait_for', wraps=move_handler.hub.wait_for) as wait_for:
+            waited = self.client.get('/chess/test-ws/?wait=0.2', headers={'If-None-Match': f'W/{etag}'})
+        self.assertEqual(waited.status_code, 304)
+        self.assertEqual(wait_for.call_args.args[::2], ('test-ws', 0.2))
+
+        move_handler.active_games['test-ws'].move('e2', 'e4')
+        changed = self.client.get('/chess/test-ws/', headers={'If-None-Match': etag})
+        self.assertEqual(changed.status_code, 200)
+        self.assertNotEqual(changed.headers['etag'], etag)
+
+    def test_long_poll_returns_on_move(self):
+        async def run():
+            transport = httpx.ASGITransport(app=self.app)
+            async with httpx.AsyncClient(transport=transport, base_url='http://test') as client:
+                version = (await client.get('/chess/test-ws/')).json()['version']
+                poll = asyncio.create_task(client.get('/chess/test-ws/', params={'since': version, 'wait': 10}))
+                await asyncio.sleep(0.05)
+                self.assertFalse(poll.done())
+                token = create_access_token({'sub': '1'})
+                moved = await client.post('/chess/test-ws/move', json={'start': 'e2', 'end': 'e4'},
+                                          headers={'Authorization': f'Bearer {token}'})
+                self.assertEqual(moved.status_code, 200)
+                update = (await asyncio.wait_for(poll, 2)).json()
+            self.assertEqual((update['type'], update['from'], update['version']), ('delta', version, version + 1))
+
+        asyncio.run(run())
+
+    def post_move(self, client, start, end, user=1):
+        token = create_access_token({'sub': str(user)})
+        return client.post('/chess/test-ws/move', json={'start': start, 'end': end},
+                           headers={'Authorization': f'Bearer {token}'})
+
+    def test_concurrent_moves_are_serialized(self):
+        game = move_handler.active_games['test-ws']
+        version = game.version
+
+        async def run():
+            transport = httpx.ASGITransport(app=self.app)
+            async with httpx.AsyncClient(transport=transport, base_url='http://test') as client:
+                return await asyncio.gather(*(self.post_move(client, 'e2', 'e4') for _ in range(4)))
+
+        replies = [reply.json() for reply in asyncio.run(run())]
+        # Первый ход сделан, остальные увидели, что теперь ход черных
+        self.assertEqual(sum(reply['message'] == 'Ход выполнен успешно!' for reply in replies), 1)
+        self.assertEqual((game.version, len(game.moves)), (version + 1, 1))
+        self.assertEqual(game.current_player_color, 'black')
+
+    def test_engine_searches_off_the_event_loop(self):
+        game = move_handler.active_games['test-ws']
+        game.black = None
+        game.set_engine('black', Engine(time_limit=0.5, node_limit=10 ** 7))
+
+        async def run():
+            gaps = []
+
+            async def tick():
+                while True:
+                    started = time.perf_counter()
+                    await asyncio.sleep(0.005)
+                    gaps.append(time.perf_counter() - started)
+
+            ticker = asyncio.create_task(tick())
+            transport = httpx.ASGITransport(app=self.app)
+            async with httpx.AsyncClient(transport=transport, base_url='http://test') as client:
+                started = time.perf_counter()
+                reply = (await self.post_move(client, 'e2', 'e4')).json()
+                elapsed = time.perf_counter() - started
+            ticker.cancel()
+            return reply, gaps, elapsed
+
+        reply, gaps, elapsed = asyncio.run(run())
+        self.assertIsNotNone(reply['engine_move'])
+        self.assertEqual((game.current_player_color, len(game.moves)), ('white', 2))
+        # Поиск в том же потоке занял бы весь запрос одной паузой метронома;
+        # вне цикла событий метроном тикает всё время поиска
+        self.assertGreater(len(gaps), 2)
+        self.assertLess(max(gaps), elapsed / 2)
+
+    def test_cancelled_move_keeps_the_game_locked(self):
+        game = move_handler.active_games['test-ws']
+        started, release = threading.Event(), threading.Event()
+        move = game.move
+
+        def slow_move(*args):
+            started.set()
+            release.wait(5)
+            return move(*args)
+
+        async def run():
+            lock = move_handler.game_lock('test-ws')
+            with mock.patch.object(game, 'move', side_effect=slow_move):
+                request = asyncio.ensure_future(move_handler.detached(
+                    move_handler.play_turn('test-ws', game, move_handler.Move(start='e2', end='e4'), 1)))
+                while not started.is_set():
+                    await asyncio.sleep(0.01)
+                # Клиент ушёл, пока ход выполняется в потоке executor
+                request.cancel()
+                await asyncio.sleep(0.05)
+                self.assertTrue(lock.locked())
+                release.set()
+                await asyncio.gather(*move_handler.pending_turns)
+            self.assertFalse(lock.locked())
+            with self.assertRaises(asyncio.CancelledError):
+                await request
+
+        asyncio.run(run())
+        self.assertEqual((game.current_player_color, len(game.moves)), ('black', 1))
+        self.assertFalse(move_handler.pending_turns)
+
+    def test_unknown_game_and_bad_token_are_rejected(self):
+        with self.assertRaises(WebSocketDisconnect):
+            with self.client.websocket_connect('/chess/missing/ws') as socket:
+                socket.receive_json()
+        with self.assertRaises(WebSocketDisconnect):
+            with self.client.websocket_connect('/chess/test-ws/ws?token=bad') as socket:
+                socket.receive_json()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,119 @@
+import unittest
+
+from unittest import mock
+
+from backend.game.board import Board
+from backend.game.chess_game import ChessGame
+from backend.game.movegen import generate_legal_moves
+from backend.game.pieces.bishop import Bishop
+from backend.game.pieces.king import King
+from backend.game.pieces.knight import Knight
+from backend.game.pieces.pawn import Pawn
+from backend.game.pieces.queen import Queen
+from backend.game.pieces.rook import Rook
+
+
+class TestLegalMoveGenerator(unittest.TestCase):
+    def setUp(self):
+        self.board = Board()
+
+    def place(self, *pieces):
+        for piece in pieces:
+            self.board[piece.current_square] = piece
+
+    def moves_from(self, square, color='white'):
+        return {to for frm, to, _ in generate_legal_moves(self.board, color) if frm == square}
+
+    def count_nodes(self, color, depth):
+        moves = generate_legal_moves(self.board, color)
+        if depth == 1:
+            return len(moves)
+        other = 'black' if color == 'white' else 'white'
+        nodes = 0
+        for from_square, to_square, promotion in moves:
+            undo = self.board.make_move(from_square, to_square, promotion)
+            nodes += self.count_nodes(other, depth - 1)
+            self.board.unmake_move(undo)
+        return nodes
+
+    def test_start_position(self):
+        self.board.start_board()
+        self.assertEqual(len(generate_legal_moves(self.board, 'white')), 20)
+        self.assertEqual(self.count_nodes('white', 3), 8902)
+
+    def test_pinned_piece_moves_along_pin_only(self):
+        self.place(King('white', (7, 4)), Rook('white', (5, 4)), Rook('black', (0, 4)),
+                   Bishop('white', (6, 3)), Bishop('black', (4, 1)), King('black', (0, 0)))
+
+        self.assertEqual(self.moves_from((5, 4)), {(4, 4), (3, 4), (2, 4), (1, 4), (0, 4), (6, 4)})
+        self.assertEqual(self.moves_from((6, 3)), {(5, 2), (4, 1)})
+
+    def test_single_check_must_be_answered(self):
+        self.place(King('white', (7, 4)), Rook('black', (0, 4)), Knight('white', (5, 3)),
+                   Queen('white', (4, 0)), King('black', (2, 7)))
+
+        moves = generate_legal_moves(self.board, 'white')
+        for from_square, to_square, _ in moves:
+            if from_square != (7, 4):
+                self.assertEqual(to_square[1], 4)
+        self.assertIn(((5, 3), (3, 4), None), moves)
+        self.assertIn(((4, 0), (4, 4), None), moves)
+        self.assertIn(((4, 0), (0, 4), None), moves)
+        self.assertNotIn(((4, 0), (0, 0), None), moves)
+
+    def test_double_check_allows_only_king_moves(self):
+        self.place(King('white', (7, 4)), Rook('black', (0, 4)), Knight('black', (5, 3)),
+                   Queen('white', (3, 3)), King('black', (0, 0)))
+
+        for from_square, _, _ in generate_legal_moves(self.board, 'white'):
+            self.assertEqual(from_square, (7, 4))
+
+    def test_en_passant_exposing_king_is_illegal(self):
+        white_pawn = Pawn('white', (3, 4))
+        black_pawn = Pawn('black', (1, 3))
+        self.place(King('white', (3, 7)), white_pawn, black_pawn, Rook('black', (3, 0)),
+                   King('black', (0, 0)))
+        self.board.make_move((1, 3), (3, 3))
+
+        self.assertNotIn((2, 3), self.moves_from((3, 4)))
+
+    def test_en_passant_captures_checking_pawn(self):
+        self.place(King('white', (4, 5)), Pawn('white', (3, 5)), Pawn('black', (1, 4)),
+                   King('black', (0, 0)))
+        self.board.make_move((1, 4), (3, 4))
+
+        self.assertIn((2, 4), self.moves_from((3, 5)))
+
+    def test_all_promotions_are_generated(self):
+        self.place(King('white', (7, 4)), Pawn('white', (1, 0)), King('black', (0, 7)))
+
+        promotions = {promotion for frm, _, promotion in generate_legal_moves(self.board, 'white')
+                      if frm == (1, 0)}
+        self.assertEqual(promotions, {'Q', 'R', 'B', 'N'})
+
+
+class TestChessGameMoveCache(unittest.TestCase):
+    def setUp(self):
+        self.game = ChessGame(60, 0)
+        self.game.start_game()
+
+    def test_moves_are_generated_once_per_position(self):
+        with mock.patch('backend.game.chess_game.generate_legal_moves',
+                        wraps=generate_legal_moves) as generator:
+            self.assertCountEqual(self.game.get_possible_moves('e2'), [(5, 4), (4, 4)])
+            self.assertCountEqual(self.game.get_possible_moves('g1'), [(5, 7), (5, 5)])
+            self.assertTrue(self.game.move('e2', 'e4'))
+            self.assertCountEqual(self.game.get_possible_moves('e7'), [(2, 4), (3, 4)])
+            self.assertFalse(self.game.move('e2', 'e4'))
+        self.assertEqual(generator.call_count, 2)
+
+    def test_version_changes_only_on_successful_move(self):
+        version = self.game.version
+        self.assertFalse(self.game.move('e2', 'e5'))
+        self.assertEqual(self.game.version, version)
+        self.assertTrue(self.game.move('e2', 'e4'))
+        self.assertEqual(self.game.version, version + 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+import unittest
+
+from backend.game.board import Board
+from backend.game.engine import EXACT, LOWER, MATE_THRESHOLD, UPPER
+from backend.game.index_notation import move_to_notation
+from backend.game.parallel_search import ParallelEngine
+from backend.game.shared_tt import SharedTranspositionTable
+
+
+class TestSharedTranspositionTable(unittest.TestCase):
+    def setUp(self):
+        self.tt = SharedTranspositionTable(1 << 10)
+
+    def tearDown(self):
+        self.tt.close()
+
+    def test_round_trip(self):
+        values = {
+            0x1234_5678_9ABC_DEF0: (35, EXACT, ((6, 4), (4, 4), None)),
+            0x0FED_CBA9_8765_4321: (-99_990, UPPER, ((1, 0), (0, 1), 'N')),
+            0x1111_2222_3333_4444: (99_998, LOWER, None),
+        }
+        for depth, (key, value) in enumerate(values.items(), start=1):
+            self.assertTrue(self.tt.store(key, value, depth))
+        for depth, (key, value) in enumerate(values.items(), start=1):
+            self.assertEqual(self.tt.probe(key), (depth, value))
+        self.assertEqual(len(self.tt), 3)
+        self.assertIsNone(self.tt.probe(0x5555))
+
+    def test_torn_entry_is_rejected(self):
+        key = 0xABCD_EF01_2345_6789
+        self.tt.store(key, (10, EXACT, None), 3)
+        index = 1 + (key & self.tt.mask) * 2
+        self.tt._words[index + 1] ^= 1 << 20
+        self.assertIsNone(self.tt.probe(key))
+
+    def test_deeper_entry_of_current_search_is_kept(self):
+        self.tt.new_search()
+        self.tt.store(1, (0, EXACT, None), 5)
+        colliding = 1 + (self.tt.mask + 1)
+        self.assertFalse(self.tt.store(colliding, (0, EXACT, None), 2))
+        self.tt.new_search()
+        self.assertTrue(self.tt.store(colliding, (0, EXACT, None), 2))
+
+    def test_attached_table_shares_entries(self):
+        other = SharedTranspositionTable.attach(self.tt.name, 1 << 10)
+        try:
+            other.store(42, (7, EXACT, ((0, 0), (7, 7), None)), 4)
+            self.assertEqual(self.tt.probe(42), (4, (7, EXACT, ((0, 0), (7, 7), None))))
+        finally:
+            other.close()
+        self.assertEqual(self.tt.get(42), (7, EXACT, ((0, 0), (7, 7), None)))
+
+
+class TestParallelEngine(unittest.TestCase):
+    def search(self, fen, workers, **limits):
+        board = Board()
+        board.load_fen(fen)
+        with ParallelEngine(workers, **limits) as engine:
+            return engine.search(board)
+
+    def test_single_worker_is_deterministic(self):
+        fen = 'r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1'
+        first = self.search(fen, 1, node_limit=3_000, time_limit=30.0)
+        second = self.search(fen, 1, node_limit=3_000, time_limit=30.0)
+        self.assertEqual((first.move, first.score, first.depth, first.nodes),
+                         (second.move, second.score, second.depth, second.nodes))
+
+    def test_one_generation_per_search(self):
+        board = Board()
+        board.load_fen('r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1')
+        with ParallelEngine(2, max_depth=2, time_limit=30.0) as engine:
+            generation = engine.tt.generation
+            engine.search(board)
+            self.assertEqual(engine.tt.generation, generation + 1)
+            engine.search(board)
+            self.assertEqual(engine.tt.generation, generation + 2)
+
+    def test_workers_find_mate(self):
+        result = self.search('6k1/5ppp/8/8/8/8/5PPP/3R2K1 w - - 0 1', 3, time_limit=5.0)
+        self.assertEqual(move_to_notation(result.move), 'd1d8')
+        self.assertGreaterEqual(result.score, MATE_THRESHOLD)
+
+
+if __name__ == '__main__':
+    unittest.main()
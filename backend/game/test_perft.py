@@ -0,0 +1,77 @@
+import contextlib
+import io
+import unittest
+
+from backend.game.board import Board
+from backend.game.chess_game import ChessGame
+from backend.game.perft import STANDARD_POSITIONS, divide, main, parallel_perft, perft
+from backend.game.pieces.knight import Knight
+
+
+class TestPerft(unittest.TestCase):
+    def load(self, name):
+        board = Board()
+        board.load_fen(STANDARD_POSITIONS[name][0])
+        return board
+
+    def test_standard_positions(self):
+        for name, (fen, counts) in STANDARD_POSITIONS.items():
+            depth = 3 if name in ('start', 'position3', 'position4') else 2
+            with self.subTest(position=name):
+                board = self.load(name)
+                before = board.zobrist
+                self.assertEqual(perft(board, depth), counts[depth - 1])
+                self.assertEqual(board.zobrist, before)
+
+    def test_divide_sums_to_perft(self):
+        board = self.load('kiwipete')
+        counts = divide(board, 2)
+        self.assertEqual(len(counts), 48)
+        self.assertEqual(sum(counts.values()), 2039)
+        self.assertIn('e1g1', counts)
+
+    def test_underpromotions_are_counted(self):
+        board = Board()
+        board.load_fen('7k/P7/8/8/8/8/8/4K3 w - - 0 1')
+        counts = divide(board, 1)
+        for promotion in 'qrbn':
+            self.assertIn('a7a8' + promotion, counts)
+
+    def test_parallel_matches_divide(self):
+        fen = STANDARD_POSITIONS['kiwipete'][0]
+        for split_depth in (1, 2):
+            with self.subTest(split_depth=split_depth):
+                counts, workers = parallel_perft(fen, 2, workers=2, split_depth=split_depth)
+                self.assertEqual(counts, divide(self.load('kiwipete'), 2))
+                self.assertEqual(sum(tasks for tasks, _, _ in workers.values()),
+                                 48 if split_depth == 1 else 2039)
+
+    def test_depth_zero_is_one_leaf(self):
+        board = self.load('start')
+        self.assertEqual((perft(board, 0), perft(board, -1)), (1, 1))
+        with self.assertRaises(ValueError):
+            parallel_perft(STANDARD_POSITIONS['start'][0], 0, workers=2)
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            self.assertEqual(main(['--depth', '0', '--position', 'start', '--workers', '2']), 0)
+        self.assertIn('depth 0: 1 nodes', output.getvalue())
+        with contextlib.redirect_stderr(io.StringIO()), self.assertRaises(SystemExit):
+            main(['--depth', '-1'])
+
+
+class TestUnderpromotion(unittest.TestCase):
+    def test_game_promotes_to_chosen_piece(self):
+        game = ChessGame(60, 0)
+        # Пешка h2 оставляет белым материал, чтобы после превращения в коня партия продолжалась
+        game.load_fen('7k/P7/8/8/8/8/7P/4K3 w - - 0 1')
+
+        self.assertTrue(game.move('a7', 'a8', 'n'))
+        self.assertIsInstance(game.board[0, 0], Knight)
+        self.assertIsNone(game.result)
+        self.assertFalse(game.move('h8', 'g8', 'x'))
+        self.assertEqual(game.current_player_color, 'black')
+        self.assertTrue(game.move('h8', 'g8'))
+
+
+if __name__ == '__main__':
+    unittest.main()
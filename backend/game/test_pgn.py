@@ -0,0 +1,143 @@
+import io
+import unittest
+
+from backend.game.board import Board
+from backend.game.chess_game import ChessGame
+from backend.game.index_notation import move_to_notation
+from backend.game.movegen import generate_legal_moves
+from backend.game.pgn import game_to_pgn, move_to_san, play_game, read_games, san_to_move
+
+PGN = """[Event "Casual"]
+[Site "?"]
+[White "Player \\"One\\""]
+[Black "Two"]
+[Result "1-0"]
+
+1. e4 e5 2. Qh5 {threat} Nc6 (2... g6 3. Qxe5+) 3. Bc4 Nf6?? $4 4. Qxf7# 1-0
+
+[Event "No result token"]
+[Result "*"]
+
+1. d4 d5
+[Event "Set up"]
+[SetUp "1"]
+[FEN "4k3/P7/8/8/8/8/8/4K3 w - - 0 60"]
+[Result "1/2-1/2"]
+
+60. a8=Q+ ; checks
+60... Kd7 1/2-1/2
+"""
+
+
+def board_from(fen):
+    board = Board()
+    board.load_fen(fen)
+    return board
+
+
+def all_san(board):
+    return sorted(move_to_san(board, move) for move in generate_legal_moves(board, board.side_to_move))
+
+
+class TestSan(unittest.TestCase):
+    def test_disambiguation(self):
+        board = board_from('r3k2r/8/8/8/2R5/8/2N3N1/R3K2R w KQkq - 0 1')
+        self.assertEqual(move_to_notation(san_to_move(board, 'Nge3')), 'g2e3')
+        self.assertEqual(move_to_notation(san_to_move(board, 'R4c3')), 'c4c3')
+        self.assertEqual(move_to_notation(san_to_move(board, 'O-O-O+')), 'e1c1')
+        with self.assertRaises(ValueError):
+            san_to_move(board, 'Ne3')
+        with self.assertRaises(ValueError):
+            san_to_move(board, 'Qd4')
+        with self.assertRaises(ValueError):
+            san_to_move(board, 'hello')
+        sans = all_san(board)
+        self.assertIn('Nce3', sans)
+        self.assertIn('Raa4', sans)
+        self.assertIn('Rca4', sans)
+        self.assertIn('O-O', sans)
+        self.assertIn('R1a4', all_san(board_from('R7/8/7k/8/8/8/8/R3K3 w - - 0 1')))
+        self.assertIn('Qa1b2', all_san(board_from('8/8/8/8/8/7k/Q7/QQ2K3 w - - 0 1')))
+
+    def test_captures_promotions_and_mate(self):
+        board = board_from('r3k3/1P6/8/3pP3/8/8/8/4K2R w K d6 0 1')
+        sans = all_san(board)
+        for san in ('exd6', 'bxa8=Q+', 'b8=N', 'Rh8+', 'O-O'):
+            self.assertIn(san, sans)
+        mate = board_from('6k1/5ppp/8/8/8/8/5PPP/3R2K1 w - - 0 1')
+        self.assertEqual(move_to_san(mate, ((7, 3), (0, 3), None)), 'Rd8#')
+
+    def test_every_legal_move_round_trips(self):
+        for fen in ('r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1',
+                    'n1n5/PPPk4/8/8/8/8/4Kppp/5N1N b - - 0 1',
+                    '3k4/8/8/8/8/8/8/QQ1K1Q2 w - - 0 1'):
+            board = board_from(fen)
+            legal = generate_legal_moves(board, board.side_to_move)
+            for move in legal:
+                self.assertEqual(san_to_move(board, move_to_san(board, move, legal), legal), move)
+
+
+class TestPgnReader(unittest.TestCase):
+    def test_read_games(self):
+        games = list(read_games(io.StringIO(PGN)))
+        self.assertEqual(len(games), 3)
+        first, second, third = games
+        self.assertEqual(first.headers['White'], 'Player "One"')
+        self.assertEqual(first.moves, ['e4', 'e5', 'Qh5', 'Nc6', 'Bc4', 'Nf6??', 'Qxf7#'])
+        self.assertEqual(first.winner, 'white')
+        self.assertEqual((second.moves, second.result), (['d4', 'd5'], '*'))
+        self.assertEqual((third.moves, third.result), (['a8=Q+', 'Kd7'], '1/2-1/2'))
+
+    def test_read_games_is_lazy(self):
+        def lines():
+            yield from PGN.splitlines()[:9]
+            raise AssertionError("read past the first game")
+
+        self.assertEqual(next(read_games(lines())).result, '1-0')
+
+    def test_play_game(self):
+        first, _, third = read_games(io.StringIO(PGN))
+        game = play_game(first)
+        self.assertEqual(game.result, "Мат. Победа белых!")
+        game = play_game(third)
+        self.assertEqual(game.fen(), 'Q7/3k4/8/8/8/8/8/4K3 w - - 1 61')
+
+
+class TestPgnWriter(unittest.TestCase):
+    def test_round_trip(self):
+        game = ChessGame(60, 0)
+        game.start_game()
+        for move in (('e2', 'e4'), ('e7', 'e5'), ('d1', 'h5'), ('b8', 'c6'),
+                     ('f1', 'c4'), ('g8', 'f6'), ('h5', 'f7')):
+            self.assertTrue(game.move(*move))
+        text = game_to_pgn(game, {'White': 'A', 'Black': 'B'})
+        self.assertTrue(text.startswith('[Event "?"]\n[Site "?"]\n[Date "????.??.??"]'))
+        self.assertIn('[Result "1-0"]', text)
+        self.assertTrue(text.endswith('1. e4 e5 2. Qh5 Nc6 3. Bc4 Nf6 4. Qxf7# 1-0\n'))
+
+        (parsed,) = read_games(io.StringIO(text))
+        self.assertEqual(play_game(parsed).fen(), game.fen())
+
+    def test_set_up_position_with_black_to_move(self):
+        game = ChessGame(60, 0)
+        game.load_fen('4k3/8/8/8/8/8/p7/4K3 b - - 0 40')
+        self.assertTrue(game.move('a2', 'a1', 'R'))
+        self.assertTrue(game.move('e1', 'e2'))
+        text = game_to_pgn(game)
+        self.assertIn('[FEN "4k3/8/8/8/8/8/p7/4K3 b - - 0 40"]', text)
+        self.assertIn('40... a1=R+ 41. Ke2 *', text)
+
+    def test_long_games_are_wrapped(self):
+        game = ChessGame(60, 0)
+        game.start_game()
+        for _ in range(10):
+            for move in (('g1', 'f3'), ('g8', 'f6'), ('f3', 'g1'), ('f6', 'g8')):
+                if game.result is None:
+                    game.move(*move)
+        movetext = game_to_pgn(game).split('\n\n')[1]
+        self.assertTrue(all(len(line) <= 80 for line in movetext.splitlines()))
+        self.assertTrue(movetext.rstrip().endswith('1/2-1/2'))
+
+
+if __name__ == '__main__':
+    unittest.main()
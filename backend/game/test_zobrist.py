@@ -0,0 +1,105 @@
+import random
+import unittest
+
+from backend.game.board import Board
+from backend.game.chess_game import ChessGame
+from backend.game.movegen import generate_legal_moves
+from backend.game.transposition import TranspositionTable
+
+
+class TestZobrist(unittest.TestCase):
+    def setUp(self):
+        self.board = Board()
+        self.board.start_board()
+
+    @staticmethod
+    def board_at_start():
+        board = Board()
+        board.start_board()
+        return board
+
+    def test_incremental_hash_matches_full_recompute(self):
+        rng = random.Random(7)
+        undos = []
+        hashes = [self.board.zobrist]
+        for _ in range(120):
+            moves = generate_legal_moves(self.board, self.board.side_to_move)
+            if not moves:
+                break
+            undos.append(self.board.make_move(*rng.choice(moves)))
+            self.assertEqual(self.board.zobrist, self.board.compute_zobrist())
+            hashes.append(self.board.zobrist)
+
+        for undo in reversed(undos):
+            hashes.pop()
+            self.board.unmake_move(undo)
+            self.assertEqual(self.board.zobrist, hashes[-1])
+
+    def test_transposition_has_same_hash(self):
+        start = self.board.zobrist
+        for move in [((7, 6), (5, 5)), ((0, 6), (2, 5)), ((5, 5), (7, 6)), ((2, 5), (0, 6))]:
+            self.board.make_move(*move)
+        self.assertEqual(self.board.zobrist, start)
+
+    def test_side_castling_and_en_passant_change_hash(self):
+        start = self.board.zobrist
+
+        self.board.make_move((7, 6), (5, 5))
+        after_knight = self.board.zobrist
+        self.assertNotEqual(after_knight, start)
+
+        game = ChessGame(60, 0)
+        game.start_game()
+        for from_position, to_position in [('g1', 'h3'), ('g8', 'h6'), ('h1', 'g1'), ('h8', 'g8'),
+                                           ('g1', 'h1'), ('g8', 'h8'), ('h3', 'g1'), ('h6', 'g8')]:
+            game.move(from_position, to_position)
+        # Та же расстановка и очередь хода, но права на рокировку потеряны
+        self.assertEqual(game.board.pretty_board(), self.board_at_start().pretty_board())
+        self.assertNotEqual(game.position_hash, start)
+
+        with_double_push = self.board_at_start()
+        with_double_push.make_move((6, 4), (4, 4))
+        without_en_passant = Board()
+        without_en_passant.load_fen('rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b KQkq - 0 1')
+        self.assertEqual(with_double_push.en_passant, (5, 4))
+        # Взять пешку e4 на проходе нечем: позиции совпадают
+        self.assertEqual(with_double_push.zobrist, without_en_passant.zobrist)
+
+        capturable = Board()
+        capturable.load_fen('4k3/8/8/8/3pP3/8/8/4K3 b - e3 0 1')
+        without_en_passant.load_fen('4k3/8/8/8/3pP3/8/8/4K3 b - - 0 1')
+        self.assertNotEqual(capturable.zobrist, without_en_passant.zobrist)
+        capturable.load_fen('4k3/8/8/8/4P3/8/8/4K3 b - e3 0 1')
+        without_en_passant.load_fen('4k3/8/8/8/4P3/8/8/4K3 b - - 0 1')
+        self.assertEqual(capturable.zobrist, without_en_passant.zobrist)
+
+
+class TestTranspositionTable(unittest.TestCase):
+    def test_store_and_get(self):
+        table = TranspositionTable(8)
+        table.store(12345, 'value', depth=3)
+        self.assertEqual(table.get(12345), 'value')
+        self.assertEqual(table.probe(12345), (3, 'value'))
+        self.assertIsNone(table.get(54321))
+
+    def test_size_is_bounded(self):
+        table = TranspositionTable(10)
+        self.assertEqual(len(table.entries), 16)
+        for key in range(1000):
+            table.store(key, key)
+        self.assertLessEqual(len(table), 16)
+
+    def test_replacement_prefers_deeper_entries(self):
+        table = TranspositionTable(4)
+        table.store(1, 'deep', depth=5)
+        self.assertFalse(table.store(5, 'shallow', depth=2))
+        self.assertEqual(table.get(1), 'deep')
+
+        table.new_search()
+        self.assertTrue(table.store(5, 'fresh', depth=1))
+        self.assertEqual(table.get(5), 'fresh')
+        self.assertIsNone(table.get(1))
+
+
+if __name__ == '__main__':
+    unittest.main()
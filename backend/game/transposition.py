@@ -0,0 +1,66 @@
+from typing import Any, List, Optional, Tuple
+
+
+class TranspositionTable:
+    """
+    Таблица фиксированного размера, адресуемая хешем позиции (Board.zobrist).
+
+    Каждый ключ попадает в одну ячейку (key & mask). При коллизии запись
+    заменяется, если она из прошлого поиска или новая запись не менее глубокая.
+    """
+
+    def __init__(self, size: int = 1 << 16) -> None:
+        """
+        :param size: Число ячеек; округляется вверх до степени двойки.
+        """
+        if size <= 0:
+            raise ValueError("Size must be positive")
+        size = 1 << (size - 1).bit_length()
+        self.mask = size - 1
+        # Ячейка: (key, depth, generation, value) или None
+        self.entries: List[Optional[Tuple[int, int, int, Any]]] = [None] * size
+        self.generation = 0
+
+    def __len__(self) -> int:
+        return sum(1 for entry in self.entries if entry is not None)
+
+    def new_search(self) -> None:
+        """
+        Помечает все имеющиеся записи как устаревшие (их можно вытеснять в первую очередь).
+        """
+        self.generation += 1
+
+    def clear(self) -> None:
+        self.entries = [None] * (self.mask + 1)
+
+    def get(self, key: int, default: Any = None) -> Any:
+        """
+        Возвращает значение, сохранённое для ключа, или default.
+        """
+        entry = self.entries[key & self.mask]
+        if entry is not None and entry[0] == key:
+            return entry[3]
+        return default
+
+    def probe(self, key: int) -> Optional[Tuple[int, Any]]:
+        """
+        Возвращает (depth, value) для ключа или None.
+        """
+        entry = self.entries[key & self.mask]
+        if entry is not None and entry[0] == key:
+            return entry[1], entry[3]
+        return None
+
+    def store(self, key: int, value: Any, depth: int = 0) -> bool:
+        """
+        Сохраняет значение для ключа.
+
+        :return: True, если запись сохранена, False — если ячейку занимает более ценная запись.
+        """
+        index = key & self.mask
+        entry = self.entries[index]
+        if (entry is None or entry[0] == key or entry[2] != self.generation
+                or depth >= entry[1]):
+            self.entries[index] = (key, depth, self.generation, value)
+            return True
+        return False
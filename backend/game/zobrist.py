@@ -0,0 +1,23 @@
+"""
+Ключи Zobrist для 64-битного хеширования позиции.
+
+Ключи порождаются генератором с фиксированным зерном, поэтому хеш одной и той же
+позиции совпадает в разных процессах и между запусками сервера.
+"""
+import random
+
+_rng = random.Random(0x5C0FFEE)
+
+# PIECE_KEYS[color * 6 + kind][square]
+PIECE_KEYS = [[_rng.getrandbits(64) for _ in range(64)] for _ in range(12)]
+# Ключ добавляется, когда ходят чёрные
+SIDE_KEY = _rng.getrandbits(64)
+# Права на рокировку: бит 1 — белые в короткую, 2 — белые в длинную, 4 и 8 — то же для чёрных
+_CASTLING_BASE = [_rng.getrandbits(64) for _ in range(4)]
+CASTLING_KEYS = [0] * 16
+for _rights in range(16):
+    for _bit in range(4):
+        if _rights >> _bit & 1:
+            CASTLING_KEYS[_rights] ^= _CASTLING_BASE[_bit]
+# Вертикаль, на которой возможно взятие на проходе
+EN_PASSANT_KEYS = [_rng.getrandbits(64) for _ in range(8)]
@@ -12,24 +12,49 @@ class AuthJWT(BaseModel):
 
 class SettingsAuth(BaseSettings):
     api_v1_prefix: str = '/api/v1'
-    DATABASE_ECHO: bool = True
+    DATABASE_ECHO: bool = False
     auth_jwt: AuthJWT = AuthJWT()
     DATABASE_NAME: str = f'sqlite+aiosqlite:///{BASE_DIR}/databases/auth.db'
 
 settings_auth = SettingsAuth()
 
 class SettingsUsers(BaseSettings):
-    DATABASE_ECHO: bool = True
+    DATABASE_ECHO: bool = False
     DATABASE_NAME: str = f'sqlite+aiosqlite:///{BASE_DIR}/databases/user.db'
 
 settings_user = SettingsUsers()
 
 class SettingsGames(BaseSettings):
-    DATABASE_ECHO: bool = True
+    DATABASE_ECHO: bool = False
     DATABASE_NAME: str = f'sqlite+aiosqlite:///{BASE_DIR}/databases/games.db'
 
 settings_games = SettingsGames()
 
+class SettingsArchive(BaseSettings):
+    # Отдельная база: таблицы games.db пересоздаются при каждом запуске сервера.
+    # Импорт PGN пишет в неё синхронно, поэтому драйвер обычный sqlite
+    DATABASE_NAME: str = f'sqlite:///{BASE_DIR}/databases/archive.db'
+
+settings_archive = SettingsArchive()
+
+class SettingsEngine(BaseSettings):
+    # Дебютная книга (см. game/book.py); если файла нет, движок обходится без неё
+    OPENING_BOOK: Path = BASE_DIR / 'databases' / 'book.bin'
+    # Потоков для ходов и поиска движка (см. game/executor.py): они делят GIL с циклом
+    # событий, и каждый занятый поиском поток удлиняет его ожидание
+    WORKERS: int = 2
+
+settings_engine = SettingsEngine()
+
+class SettingsLogging(BaseSettings):
+    # Общий уровень и уровни отдельных модулей, например LOG_LEVELS='{"game": "DEBUG"}'
+    LOG_LEVEL: str = 'INFO'
+    LOG_LEVELS: dict[str, str] = {}
+    # 'text' — строка с полями key=value, 'json' — одна запись JSON на строку
+    LOG_FORMAT: str = 'text'
+
+settings_logging = SettingsLogging()
+
 if __name__ == '__main__':
     print(settings_auth.DATABASE_NAME)
     print(settings_user.DATABASE_NAME)
@@ -0,0 +1,105 @@
+"""
+Настройка журнала приложения.
+
+Модули пишут в свои логгеры (logging.getLogger(__name__)), а корневой логгер только
+кладёт записи в очередь (QueueHandler). В поток вывода их пишет отдельный поток
+QueueListener, поэтому обработчик запроса не ждёт ввода-вывода.
+
+Уровни задаются в settings_logging: общий LOG_LEVEL и уровни модулей LOG_LEVELS,
+например LOG_LEVELS='{"game": "DEBUG"}' включает отладочный вывод доски после хода.
+Поля, переданные через extra=, попадают в запись как ключи JSON или пары key=value.
+"""
+import json
+import logging
+import queue
+import sys
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, Optional, TextIO
+
+from pkgs.config import SettingsLogging, settings_logging
+
+# Атрибуты, которые есть у любой записи; остальные пришли через extra=
+_RECORD_ATTRIBUTES = frozenset(vars(logging.makeLogRecord({}))) | {'message', 'asctime', 'taskName'}
+
+_queue_handler: Optional[QueueHandler] = None
+_listener: Optional[QueueListener] = None
+
+
+def _extra_fields(record: logging.LogRecord) -> Dict[str, Any]:
+    return {key: value for key, value in vars(record).items() if key not in _RECORD_ATTRIBUTES}
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Одна запись — одна строка JSON с полями time, level, logger, message и полями из extra.
+
+    Трассировку исключения QueueHandler уже дописал в message в потоке, где оно возникло.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'time': self.formatTime(record),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        entry.update(_extra_fields(record))
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class KeyValueFormatter(logging.Formatter):
+    """
+    Текстовая строка журнала, к которой дописываются поля из extra в виде key=value.
+    """
+
+    def __init__(self) -> None:
+        super().__init__('%(asctime)s %(levelname)s %(name)s: %(message)s')
+
+    def format(self, record: logging.LogRecord) -> str:
+        line = super().format(record)
+        fields = _extra_fields(record)
+        if fields:
+            line += ' ' + ' '.join(f'{key}={value}' for key, value in fields.items())
+        return line
+
+
+def setup_logging(settings: SettingsLogging = settings_logging, stream: Optional[TextIO] = None) -> None:
+    """
+    Подключает неблокирующий обработчик к корневому логгеру и выставляет уровни модулей.
+
+    Повторный вызов заменяет прежнюю настройку.
+
+    :param settings: Уровни и формат журнала.
+    :param stream: Куда писать записи (по умолчанию sys.stderr).
+    :raises ValueError: Если формат не 'text' и не 'json' или уровень неизвестен.
+    """
+    global _queue_handler, _listener
+    if settings.LOG_FORMAT not in ('text', 'json'):
+        raise ValueError(f"Unknown log format: {settings.LOG_FORMAT}")
+    shutdown_logging()
+
+    handler = logging.StreamHandler(stream if stream is not None else sys.stderr)
+    handler.setFormatter(JsonFormatter() if settings.LOG_FORMAT == 'json' else KeyValueFormatter())
+    records: queue.SimpleQueue = queue.SimpleQueue()
+    _listener = QueueListener(records, handler)
+    _queue_handler = QueueHandler(records)
+
+    root = logging.getLogger()
+    root.setLevel(settings.LOG_LEVEL.upper())
+    for name, level in settings.LOG_LEVELS.items():
+        logging.getLogger(name).setLevel(level.upper())
+    root.addHandler(_queue_handler)
+    _listener.start()
+
+
+def shutdown_logging() -> None:
+    """
+    Отключает обработчик и дописывает оставшиеся в очереди записи.
+    """
+    global _queue_handler, _listener
+    if _queue_handler is not None:
+        logging.getLogger().removeHandler(_queue_handler)
+        _queue_handler = None
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
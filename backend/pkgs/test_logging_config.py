@@ -0,0 +1,42 @@
+import io
+import json
+import logging
+import unittest
+
+from backend.pkgs.config import SettingsLogging
+from backend.pkgs.logging_config import setup_logging, shutdown_logging
+
+
+class TestLoggingSetup(unittest.TestCase):
+    def tearDown(self):
+        shutdown_logging()
+        logging.getLogger('test.logging').setLevel(logging.NOTSET)
+        logging.getLogger().setLevel(logging.WARNING)
+
+    def test_json_records_with_module_levels(self):
+        stream = io.StringIO()
+        settings = SettingsLogging(LOG_LEVEL='WARNING', LOG_LEVELS={'test.logging': 'debug'}, LOG_FORMAT='json')
+        setup_logging(settings, stream)
+        logging.getLogger('test.logging').debug("move %s", 'e2e4', extra={'game': 'abc'})
+        logging.getLogger('test.other').info("hidden")
+        shutdown_logging()
+
+        (line,) = stream.getvalue().splitlines()
+        record = json.loads(line)
+        self.assertEqual((record['level'], record['logger'], record['message'], record['game']),
+                         ('DEBUG', 'test.logging', 'move e2e4', 'abc'))
+
+    def test_text_records(self):
+        stream = io.StringIO()
+        setup_logging(SettingsLogging(LOG_LEVEL='INFO'), stream)
+        logging.getLogger('test.logging').info("joined", extra={'user_id': 7})
+        shutdown_logging()
+        self.assertTrue(stream.getvalue().rstrip().endswith('INFO test.logging: joined user_id=7'))
+
+    def test_unknown_format(self):
+        with self.assertRaises(ValueError):
+            setup_logging(SettingsLogging(LOG_FORMAT='xml'))
+
+
+if __name__ == '__main__':
+    unittest.main()
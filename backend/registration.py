@@ -8,11 +8,13 @@ from dbpackage.DBHelper import db_helper_user, db_helper_game
 from dbpackage.Base import Base
 from api_v1 import router as router_v1
 from game import router as game_router
+from pkgs.logging_config import setup_logging, shutdown_logging
 import uvicorn
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    setup_logging()
     async with db_helper_user.engine.begin() as conn:
         # await conn.run_sync(User.metadata.drop_all)
         await conn.run_sync(User.metadata.create_all)
@@ -23,6 +25,8 @@ async def lifespan(app: FastAPI):
 
     yield
 
+    shutdown_logging()
+
 
 
 app = FastAPI(lifespan=lifespan)
@@ -1,4 +1,4 @@
-import React, { useEffect, useState } from "react";
+import React, { useEffect, useRef, useState } from "react";
 import axios from "axios";
 import { useParams } from "react-router-dom";
 import './Game.css';
@@ -30,6 +30,30 @@ const pieceMapping = {
   '♚': blackking,
 };
 
+// Буквы FEN -> глифы фигур, как в ответах сервера
+const fenGlyphs = {
+  P: '♙', N: '♘', B: '♗', R: '♖', Q: '♕', K: '♔',
+  p: '♟', n: '♞', b: '♝', r: '♜', q: '♛', k: '♚',
+};
+const EMPTY = "\u00A0";
+
+const boardFromFen = (fen) =>
+  fen.split(" ")[0].split("/").map((rank) =>
+    rank.split("").flatMap((symbol) =>
+      /\d/.test(symbol) ? Array(Number(symbol)).fill(EMPTY) : [fenGlyphs[symbol]]
+    )
+  );
+
+const applyChanges = (board, changes) => {
+  const next = board.map((row) => [...row]);
+  for (const [square, piece] of changes) {
+    const col = square.charCodeAt(0) - 97;
+    const row = 8 - Number(square[1]);
+    next[row][col] = piece || EMPTY;
+  }
+  return next;
+};
+
 const Game = () => {
   const { uuid } = useParams();
   const [board, setBoard] = useState([]);
@@ -42,6 +66,10 @@ const Game = () => {
   const [whitePlayer, setWhitePlayer] = useState(null);
   const [blackPlayer, setBlackPlayer] = useState(null);
   const [theme, setTheme] = useState("light"); // Default theme
+  const socketRef = useRef(null);
+  const playersRef = useRef({ white: undefined, black: undefined });
+  // Версия позиции, которую показывает доска: сервер присылает обновления относительно неё
+  const versionRef = useRef(null);
   
   // const API_BASE = "http://127.0.0.1:8000";
   const API_BASE = "http://5.35.5.18/api";
@@ -53,14 +81,60 @@ const Game = () => {
 
   const fetchGameState = async () => {
     try {
-      const response = await axios.get(`${API_BASE}/chess/${uuid}/`);
-      setBoard(prepareBoard(response.data.board));
-      setCurrentTurn(response.data.current_turn);
+      const since = versionRef.current;
+      const response = await axios.get(`${API_BASE}/chess/${uuid}/`, {
+        params: since === null ? {} : { since },
+      });
+      applyUpdate(response.data);
     } catch (error) {
       console.error("Error fetching game state:", error);
     }
   };
 
+  const longPoll = async (active) => {
+    while (active.current && active.polling) {
+      try {
+        const since = versionRef.current;
+        const response = await axios.get(`${API_BASE}/chess/${uuid}/`, {
+          params: since === null ? {} : { since, wait: 25 },
+        });
+        applyUpdate(response.data);
+      } catch (error) {
+        console.error("Error polling game state:", error);
+        await new Promise((resolve) => setTimeout(resolve, 2000));
+      }
+    }
+  };
+
+  const applyMeta = (update) => {
+    versionRef.current = update.version;
+    setCurrentTurn(update.current_turn);
+    setGameResult(update.result);
+    if (update.white !== playersRef.current.white || update.black !== playersRef.current.black) {
+      playersRef.current = { white: update.white, black: update.black };
+      fetchPlayers();
+    }
+  };
+
+  // state — вся доска, snapshot — позиция в FEN, delta — изменённые клетки, unchanged — только метаданные
+  const applyUpdate = (update) => {
+    if (update.type === "state") {
+      setBoard(prepareBoard(update.board));
+    } else if (update.type === "snapshot") {
+      setBoard(boardFromFen(update.fen));
+    } else if (update.type === "delta") {
+      if (update.from !== versionRef.current) {
+        // Пропустили обновление: просим всё, что изменилось с нашей версии
+        fetchGameState();
+        return;
+      }
+      setBoard((current) => applyChanges(current, update.changes));
+    } else if (update.type !== "unchanged") {
+      return;
+    }
+    applyMeta(update);
+  };
+
   const fetchPlayers = async () => {
     try {
       const whiteResponse = await axios.get(`${API_BASE}/chess/${uuid}/white-player`);
@@ -87,11 +161,65 @@ const Game = () => {
 
 
   useEffect(() => {
-    fetchGameState();
-    fetchPlayers(); 
     document.body.className = theme;
   }, [theme]);
 
+  // Сервер сам присылает состояние партии после каждого хода. Сокет может закрыть
+  // и сервер (1013 — клиент не успевал читать), и прокси по простою: тогда
+  // переподключаемся с растущей задержкой, а пока сокета нет, ждём долгим опросом.
+  useEffect(() => {
+    const active = { current: true, polling: false, pollLoop: null };
+    let retries = 0;
+    let reconnectTimer = null;
+
+    const connect = () => {
+      const token = localStorage.getItem("authToken");
+      const params = new URLSearchParams();
+      if (token) params.set("token", token);
+      // После переподключения сервер пришлёт только то, что изменилось с нашей версии
+      if (versionRef.current !== null) params.set("since", versionRef.current);
+      const query = params.toString() ? `?${params}` : "";
+      const socket = new WebSocket(`${API_BASE.replace(/^http/, "ws")}/chess/${uuid}/ws${query}`);
+      socketRef.current = socket;
+      socket.onopen = () => {
+        retries = 0;
+        active.polling = false;
+      };
+      socket.onmessage = (event) => {
+        const message = JSON.parse(event.data);
+        if (message.type === "error") {
+          console.error("Move rejected:", message.message);
+        } else {
+          applyUpdate(message);
+        }
+      };
+      socket.onclose = () => {
+        if (!active.current) return;
+        socketRef.current = null;
+        active.polling = true;
+        // Прежний цикл опроса мог ещё не выйти после открытия сокета: тогда он продолжит работу
+        if (!active.pollLoop) {
+          active.pollLoop = longPoll(active).finally(() => {
+            active.pollLoop = null;
+          });
+        }
+        const delay = Math.min(1000 * 2 ** retries, 30000);
+        retries += 1;
+        reconnectTimer = setTimeout(connect, delay);
+      };
+    };
+
+    connect();
+    return () => {
+      active.current = false;
+      clearTimeout(reconnectTimer);
+      if (socketRef.current) {
+        socketRef.current.close();
+        socketRef.current = null;
+      }
+    };
+  }, [uuid]);
+
   const makeMove = async (start, end) => {
     try {
       const token = localStorage.getItem("authToken");
@@ -101,14 +229,20 @@ const Game = () => {
 
       const headers = { Authorization: `Bearer ${token}` };
       if (start && end) {
+        const socket = socketRef.current;
+        if (socket && socket.readyState === WebSocket.OPEN) {
+          socket.send(JSON.stringify({ type: "move", start, end }));
+          setStartSquare("");
+          setEndSquare("");
+          setSelectedSquare(null);
+          return;
+        }
         const response = await axios.post(
           `${API_BASE}/chess/${uuid}/move`,
-          { start, end },
+          { start, end, version: versionRef.current },
           { headers }
         );
-        setBoard(prepareBoard(response.data.board));
-        setCurrentTurn(response.data.current_turn);
-        setGameResult(response.data.result);
+        applyUpdate(response.data);
         setStartSquare("");
         setEndSquare("");
         setSelectedSquare(null);
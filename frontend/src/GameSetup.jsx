@@ -7,6 +7,8 @@ const GameSetup = () => {
   const [increment, setIncrement] = useState(5); // Default increment in seconds
   const [error, setError] = useState(""); // Для отображения ошибок
   const [playerSide, setPlayerSide] = useState("white"); // Выбранная сторона: "white" или "black"
+  const [vsComputer, setVsComputer] = useState(false); // Играть против компьютера
+  const [engineTime, setEngineTime] = useState(1); // Время на ход компьютера в секундах
   const navigate = useNavigate();
 
   const API_BASE = "http://5.35.5.18/api/chess";
@@ -15,7 +17,7 @@ const GameSetup = () => {
   const setupGame = async () => {
     setError(""); // Сброс предыдущей ошибки
     console.log("Настройка игры начата:");
-    console.log("Параметры игры:", { gameTime, increment, playerSide });
+    console.log("Параметры игры:", { gameTime, increment, playerSide, vsComputer, engineTime });
 
     try {
       const token = localStorage.getItem("authToken"); // Токен аутентификации из localStorage
@@ -33,6 +35,9 @@ const GameSetup = () => {
           increment: increment,
           white: playerSide === "white", // Отправляем, за кого хочет играть пользователь
           black: playerSide === "black",
+          // Компьютер играет за противоположную сторону
+          engine: vsComputer ? (playerSide === "white" ? "black" : "white") : null,
+          engine_time: engineTime,
         },
         { headers }
       );
@@ -84,6 +89,27 @@ const GameSetup = () => {
           <option value="black">Черные</option>
         </select>
       </label>
+      <label>
+        Играть против компьютера:
+        <input
+          type="checkbox"
+          checked={vsComputer}
+          onChange={(e) => setVsComputer(e.target.checked)}
+        />
+      </label>
+      {vsComputer && (
+        <label>
+          Время на ход компьютера (секунды):
+          <input
+            type="number"
+            value={engineTime}
+            onChange={(e) => setEngineTime(parseFloat(e.target.value))}
+            min="0.1"
+            max="5"
+            step="0.1"
+          />
+        </label>
+      )}
       <button onClick={setupGame}>Начать игру</button>
     </div>
   );